@@ -0,0 +1,37 @@
+"""add bookings updated_at
+
+Revision ID: 1a9d4e6c7b20
+Revises: f3b87c2d9a05
+Create Date: 2026-02-17 14:05:11.730498
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1a9d4e6c7b20'
+down_revision: Union[str, Sequence[str], None] = 'f3b87c2d9a05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'bookings',
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    )
+    op.execute("UPDATE bookings SET updated_at = created_at")
+    # max(updated_at) per feed owner is a single index probe (calendar ETags)
+    op.create_index('ix_bookings_resource_updated', 'bookings', ['resource_id', 'updated_at'], unique=False)
+    op.create_index('ix_bookings_user_updated', 'bookings', ['user_id', 'updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bookings_user_updated', table_name='bookings')
+    op.drop_index('ix_bookings_resource_updated', table_name='bookings')
+    op.drop_column('bookings', 'updated_at')
@@ -0,0 +1,90 @@
+"""add hot query index pack
+
+Revision ID: 3b6f0e8c1d47
+Revises: 7c3e5b9a2f61
+Create Date: 2026-03-03 09:48:16.204377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b6f0e8c1d47'
+down_revision: Union[str, Sequence[str], None] = '7c3e5b9a2f61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Trigram operator classes let a GIN index serve "site ILIKE :pattern"
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Built without blocking writes on live tables, so outside the migration transaction
+    with op.get_context().autocommit_block():
+        # Conflict checks, availability and suggestions only look at active rows
+        op.create_index(
+            'ix_bookings_active_resource_start',
+            'bookings',
+            ['resource_id', 'start_at'],
+            unique=False,
+            postgresql_include=['end_at'],
+            postgresql_where=sa.text("status IN ('pending', 'confirmed')"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_resources_features_gin',
+            'resources',
+            ['features'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_where=sa.text("is_deleted = false"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_users_allowed_resource_types_gin',
+            'users',
+            ['allowed_resource_types'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_resources_site_trgm',
+            'resources',
+            ['site'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'site': 'gin_trgm_ops'},
+            postgresql_where=sa.text("is_deleted = false"),
+            postgresql_concurrently=True,
+        )
+        # Suggestions filter on exact type and site
+        op.create_index(
+            'ix_resources_type_site',
+            'resources',
+            ['type', 'site'],
+            unique=False,
+            postgresql_where=sa.text("is_deleted = false"),
+            postgresql_concurrently=True,
+        )
+        # Superseded by the two site indexes above; ix_resources_id duplicates the primary key
+        op.drop_index('ix_resources_site', table_name='resources', postgresql_concurrently=True)
+        op.drop_index('ix_resources_id', table_name='resources', postgresql_concurrently=True)
+        op.drop_index('ix_users_id', table_name='users', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_id', 'users', ['id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_resources_id', 'resources', ['id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_resources_site', 'resources', ['site'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_resources_type_site', table_name='resources', postgresql_concurrently=True)
+        op.drop_index('ix_resources_site_trgm', table_name='resources', postgresql_concurrently=True)
+        op.drop_index('ix_users_allowed_resource_types_gin', table_name='users', postgresql_concurrently=True)
+        op.drop_index('ix_resources_features_gin', table_name='resources', postgresql_concurrently=True)
+        op.drop_index('ix_bookings_active_resource_start', table_name='bookings', postgresql_concurrently=True)
@@ -0,0 +1,62 @@
+"""create booking series table
+
+Revision ID: 4f7a1c9e2d58
+Revises: 9c4e2b7d1a36
+Create Date: 2026-01-14 16:40:22.905113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '4f7a1c9e2d58'
+down_revision: Union[str, Sequence[str], None] = '9c4e2b7d1a36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('booking_series',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('resource_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('start_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('end_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('frequency', sa.Enum('daily', 'weekly', name='series_frequency'), nullable=False),
+    sa.Column('interval', sa.Integer(), nullable=False),
+    sa.Column('until', sa.Date(), nullable=True),
+    sa.Column('count', sa.Integer(), nullable=True),
+    sa.Column('exceptions', postgresql.ARRAY(sa.Date()), nullable=False),
+    sa.Column('status', postgresql.ENUM(name='booking_status', create_type=False), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('participants', sa.Integer(), nullable=False),
+    sa.Column('notes', sa.String(length=1000), nullable=False),
+    sa.Column('is_cancelled', sa.Boolean(), nullable=False),
+    sa.Column('materialized_until', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.CheckConstraint('until IS NOT NULL OR count IS NOT NULL', name='ck_booking_series_bounded'),
+    sa.ForeignKeyConstraint(['resource_id'], ['resources.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_booking_series_resource_id'), 'booking_series', ['resource_id'], unique=False)
+    op.create_index(op.f('ix_booking_series_user_id'), 'booking_series', ['user_id'], unique=False)
+
+    op.add_column('bookings', sa.Column('series_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('bookings_series_id_fkey', 'bookings', 'booking_series', ['series_id'], ['id'])
+    op.create_index(op.f('ix_bookings_series_id'), 'bookings', ['series_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_bookings_series_id'), table_name='bookings')
+    op.drop_constraint('bookings_series_id_fkey', 'bookings', type_='foreignkey')
+    op.drop_column('bookings', 'series_id')
+    op.drop_index(op.f('ix_booking_series_user_id'), table_name='booking_series')
+    op.drop_index(op.f('ix_booking_series_resource_id'), table_name='booking_series')
+    op.drop_table('booking_series')
+    sa.Enum(name='series_frequency').drop(op.get_bind(), checkfirst=True)
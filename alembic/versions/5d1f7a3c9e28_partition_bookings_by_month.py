@@ -0,0 +1,273 @@
+"""partition bookings by month
+
+Revision ID: 5d1f7a3c9e28
+Revises: 9e2a6d4f8b13
+Create Date: 2026-03-17 10:05:41.772913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1f7a3c9e28'
+down_revision: Union[str, Sequence[str], None] = '9e2a6d4f8b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Months created ahead by the migration; the lifecycle scheduler keeps the window rolling afterwards
+MONTHS_AHEAD = 3
+
+COLUMNS = (
+    "id, resource_id, user_id, series_id, start_at, end_at, status, title, participants, notes, "
+    "created_at, updated_at"
+)
+
+ACTIVE = sa.text("status IN ('pending', 'confirmed')")
+
+
+def _create_indexes() -> None:
+    # Same set as before partitioning; on the partitioned table each one is built per partition
+    op.create_index('ix_bookings_id', 'bookings', ['id'], unique=False)
+    op.create_index('ix_bookings_resource_id', 'bookings', ['resource_id'], unique=False)
+    op.create_index('ix_bookings_user_id', 'bookings', ['user_id'], unique=False)
+    op.create_index('ix_bookings_series_id', 'bookings', ['series_id'], unique=False)
+    op.create_index('ix_bookings_start_at', 'bookings', ['start_at'], unique=False)
+    op.create_index('ix_bookings_end_at', 'bookings', ['end_at'], unique=False)
+    op.create_index('ix_bookings_resource_start_id', 'bookings', ['resource_id', 'start_at', 'id'], unique=False)
+    op.create_index('ix_bookings_start_id', 'bookings', ['start_at', 'id'], unique=False)
+    op.create_index(
+        'ix_bookings_user_start_id',
+        'bookings',
+        ['user_id', sa.text('start_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+    op.create_index('ix_bookings_resource_updated', 'bookings', ['resource_id', 'updated_at'], unique=False)
+    op.create_index('ix_bookings_user_updated', 'bookings', ['user_id', 'updated_at'], unique=False)
+    op.create_index(
+        'ix_bookings_active_resource_start',
+        'bookings',
+        ['resource_id', 'start_at'],
+        unique=False,
+        postgresql_include=['end_at'],
+        postgresql_where=ACTIVE,
+    )
+    op.create_index('ix_bookings_active_start', 'bookings', ['start_at'], unique=False, postgresql_where=ACTIVE)
+    op.create_index(
+        'ix_bookings_pending_created',
+        'bookings',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def _create_notify_trigger() -> None:
+    # notify_booking_change() itself is unchanged (b81d5e3f60c2)
+    op.execute(
+        """
+        CREATE TRIGGER trg_bookings_notify
+        AFTER INSERT OR UPDATE OR DELETE ON bookings
+        FOR EACH ROW EXECUTE FUNCTION notify_booking_change()
+        """
+    )
+
+
+def _exclusion(table: str, name: str) -> str:
+    return f"""
+        ALTER TABLE {table} ADD CONSTRAINT {name}
+        EXCLUDE USING gist (resource_id WITH =, tstzrange(start_at, end_at, '[)') WITH &&)
+        WHERE (status IN ('pending', 'confirmed'))
+        """
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Blocking: bookings is locked while its rows are copied, run it in a maintenance window.
+    # Keep the old table and its sequence out of the way of the new names
+    op.execute("LOCK TABLE bookings IN ACCESS EXCLUSIVE MODE")
+    op.execute("ALTER TABLE bookings RENAME TO bookings_unpartitioned")
+    op.execute("ALTER INDEX bookings_pkey RENAME TO bookings_unpartitioned_pkey")
+    op.execute("DROP TRIGGER trg_bookings_notify ON bookings_unpartitioned")
+    op.execute("ALTER SEQUENCE bookings_id_seq OWNED BY NONE")
+
+    # Unique keys of a partitioned table must include the partition key, hence (id, start_at);
+    # ids still come from the one sequence, so id alone stays unique
+    op.execute(
+        """
+        CREATE TABLE bookings (
+            id integer NOT NULL DEFAULT nextval('bookings_id_seq'),
+            resource_id integer NOT NULL,
+            user_id integer NOT NULL,
+            series_id integer,
+            start_at timestamptz NOT NULL,
+            end_at timestamptz NOT NULL,
+            status booking_status NOT NULL,
+            title varchar(200) NOT NULL,
+            participants integer NOT NULL,
+            notes varchar(1000) NOT NULL,
+            created_at timestamptz NOT NULL,
+            updated_at timestamptz NOT NULL DEFAULT now(),
+            CONSTRAINT bookings_pkey PRIMARY KEY (id, start_at),
+            CONSTRAINT ck_bookings_time_order CHECK (end_at > start_at),
+            -- MAX_BOOKING_SPAN, relied on by the month boundary guard and the partition pruning bounds
+            CONSTRAINT ck_bookings_max_span CHECK (end_at - start_at <= interval '8 hours'),
+            CONSTRAINT bookings_resource_id_fkey FOREIGN KEY (resource_id) REFERENCES resources (id),
+            CONSTRAINT bookings_user_id_fkey FOREIGN KEY (user_id) REFERENCES users (id),
+            CONSTRAINT bookings_series_id_fkey FOREIGN KEY (series_id) REFERENCES booking_series (id)
+        ) PARTITION BY RANGE (start_at)
+        """
+    )
+    op.execute("ALTER SEQUENCE bookings_id_seq OWNED BY bookings.id")
+
+    # Rows past the last monthly partition; ensure_booking_partition moves them out later
+    op.execute("CREATE TABLE bookings_default PARTITION OF bookings DEFAULT")
+    op.execute(_exclusion("bookings_default", "ex_bookings_no_overlap_default"))
+
+    # Month bounds are UTC. Created as a standalone table and attached, so rows parked in the
+    # default partition can be moved in first (ATTACH refuses while they are there)
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION ensure_booking_partition(month date) RETURNS boolean AS $$
+        DECLARE
+            part text := 'bookings_p' || to_char(month, 'YYYYMM');
+            lo timestamptz := date_trunc('month', month::timestamp) AT TIME ZONE 'UTC';
+            hi timestamptz := (date_trunc('month', month::timestamp) + interval '1 month') AT TIME ZONE 'UTC';
+        BEGIN
+            IF to_regclass(part) IS NOT NULL THEN
+                RETURN false;
+            END IF;
+            EXECUTE format('CREATE TABLE %I (LIKE bookings INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', part);
+            -- Same as the partition bound, so ATTACH skips its validation scan
+            EXECUTE format(
+                'ALTER TABLE %I ADD CONSTRAINT %I CHECK (start_at >= %L AND start_at < %L)',
+                part, part || '_bounds', lo, hi
+            );
+            EXECUTE format(
+                'ALTER TABLE %I ADD CONSTRAINT %I EXCLUDE USING gist '
+                '(resource_id WITH =, tstzrange(start_at, end_at, ''[)'') WITH &&) '
+                'WHERE (status IN (''pending'', ''confirmed''))',
+                part, 'ex_bookings_no_overlap_' || to_char(month, 'YYYYMM')
+            );
+            EXECUTE format(
+                'WITH moved AS (DELETE FROM bookings_default WHERE start_at >= %L AND start_at < %L RETURNING *) '
+                'INSERT INTO %I SELECT * FROM moved',
+                lo, hi, part
+            );
+            EXECUTE format('ALTER TABLE bookings ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)', part, lo, hi);
+            EXECUTE format('ALTER TABLE %I DROP CONSTRAINT %I', part, part || '_bounds');
+            RETURN true;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        f"""
+        SELECT ensure_booking_partition(m::date)
+        FROM generate_series(
+            date_trunc('month', coalesce((SELECT min(start_at) FROM bookings_unpartitioned), now()) AT TIME ZONE 'UTC'),
+            date_trunc('month', now() AT TIME ZONE 'UTC') + interval '{MONTHS_AHEAD} months',
+            interval '1 month'
+        ) AS m
+        """
+    )
+
+    # Existing data, routed to the monthly partitions (each one enforces its own exclusion constraint)
+    op.execute(f"INSERT INTO bookings ({COLUMNS}) SELECT {COLUMNS} FROM bookings_unpartitioned")
+    op.execute("DROP TABLE bookings_unpartitioned")
+
+    _create_indexes()
+    _create_notify_trigger()
+
+    # Exclusion constraints are per partition: an active slot crossing a month boundary is checked
+    # here against the neighbouring month. 8 hours is MAX_BOOKING_SPAN (ck_bookings_max_span): a row
+    # of the previous month can only reach into this one if it starts less than that before it
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION guard_booking_month_boundary() RETURNS trigger AS $$
+        DECLARE
+            month_start timestamptz := date_trunc('month', NEW.start_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC';
+            next_month timestamptz := (date_trunc('month', NEW.start_at AT TIME ZONE 'UTC') + interval '1 month')
+                                      AT TIME ZONE 'UTC';
+        BEGIN
+            IF NEW.status NOT IN ('pending', 'confirmed') THEN
+                RETURN NEW;
+            END IF;
+            IF NEW.end_at <= next_month AND NEW.start_at >= month_start + interval '8 hours' THEN
+                RETURN NEW;
+            END IF;
+            -- Serializes boundary writes of the resource until commit, then sees the other's row
+            PERFORM pg_advisory_xact_lock(23, NEW.resource_id);
+            IF EXISTS (
+                SELECT 1 FROM bookings b
+                WHERE b.resource_id = NEW.resource_id
+                  AND b.status IN ('pending', 'confirmed')
+                  AND b.id <> NEW.id
+                  AND (
+                      (b.start_at >= next_month AND b.start_at < NEW.end_at)
+                      OR (b.start_at >= month_start - interval '8 hours' AND b.start_at < month_start
+                          AND b.end_at > NEW.start_at)
+                  )
+            ) THEN
+                RAISE EXCEPTION 'conflicting key value violates exclusion constraint "ex_bookings_no_overlap"'
+                    USING ERRCODE = 'exclusion_violation', CONSTRAINT = 'ex_bookings_no_overlap', TABLE = 'bookings';
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_bookings_month_boundary
+        BEFORE INSERT OR UPDATE OF resource_id, start_at, end_at, status ON bookings
+        FOR EACH ROW EXECUTE FUNCTION guard_booking_month_boundary()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Partitions already moved to the archive schema are not merged back
+    op.execute("LOCK TABLE bookings IN ACCESS EXCLUSIVE MODE")
+    op.execute("ALTER TABLE bookings RENAME TO bookings_partitioned")
+    op.execute("ALTER INDEX bookings_pkey RENAME TO bookings_partitioned_pkey")
+    op.execute("DROP TRIGGER trg_bookings_month_boundary ON bookings_partitioned")
+    op.execute("DROP TRIGGER trg_bookings_notify ON bookings_partitioned")
+    op.execute("ALTER SEQUENCE bookings_id_seq OWNED BY NONE")
+
+    op.execute(
+        """
+        CREATE TABLE bookings (
+            id integer NOT NULL DEFAULT nextval('bookings_id_seq'),
+            resource_id integer NOT NULL,
+            user_id integer NOT NULL,
+            series_id integer,
+            start_at timestamptz NOT NULL,
+            end_at timestamptz NOT NULL,
+            status booking_status NOT NULL,
+            title varchar(200) NOT NULL,
+            participants integer NOT NULL,
+            notes varchar(1000) NOT NULL,
+            created_at timestamptz NOT NULL,
+            updated_at timestamptz NOT NULL DEFAULT now(),
+            CONSTRAINT bookings_pkey PRIMARY KEY (id),
+            CONSTRAINT ck_bookings_time_order CHECK (end_at > start_at),
+            CONSTRAINT bookings_resource_id_fkey FOREIGN KEY (resource_id) REFERENCES resources (id),
+            CONSTRAINT bookings_user_id_fkey FOREIGN KEY (user_id) REFERENCES users (id),
+            CONSTRAINT bookings_series_id_fkey FOREIGN KEY (series_id) REFERENCES booking_series (id)
+        )
+        """
+    )
+    op.execute("ALTER SEQUENCE bookings_id_seq OWNED BY bookings.id")
+    op.execute(f"INSERT INTO bookings ({COLUMNS}) SELECT {COLUMNS} FROM bookings_partitioned")
+    # Drops every attached partition with it
+    op.execute("DROP TABLE bookings_partitioned")
+    op.execute(_exclusion("bookings", "ex_bookings_no_overlap"))
+
+    _create_indexes()
+    _create_notify_trigger()
+    op.execute("DROP FUNCTION IF EXISTS guard_booking_month_boundary()")
+    op.execute("DROP FUNCTION IF EXISTS ensure_booking_partition(date)")
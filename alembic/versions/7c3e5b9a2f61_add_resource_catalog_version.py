@@ -0,0 +1,59 @@
+"""add resource catalog version
+
+Revision ID: 7c3e5b9a2f61
+Revises: 1a9d4e6c7b20
+Create Date: 2026-02-24 11:27:43.086214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e5b9a2f61'
+down_revision: Union[str, Sequence[str], None] = '1a9d4e6c7b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('resource_catalog_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.CheckConstraint('id = 1', name='ck_resource_catalog_version_single_row'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("INSERT INTO resource_catalog_version (id, version) VALUES (1, 1)")
+
+    # Any statement touching resources bumps the version (transactionally) and tells the workers
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_resource_catalog_version() RETURNS trigger AS $$
+        DECLARE
+            new_version bigint;
+        BEGIN
+            UPDATE resource_catalog_version SET version = version + 1 WHERE id = 1
+            RETURNING version INTO new_version;
+            PERFORM pg_notify('resource_catalog', new_version::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_resources_catalog_version
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON resources
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_resource_catalog_version()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS trg_resources_catalog_version ON resources")
+    op.execute("DROP FUNCTION IF EXISTS bump_resource_catalog_version()")
+    op.drop_table('resource_catalog_version')
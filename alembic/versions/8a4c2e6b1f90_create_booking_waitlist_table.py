@@ -0,0 +1,63 @@
+"""create booking waitlist table
+
+Revision ID: 8a4c2e6b1f90
+Revises: 5d1f7a3c9e28
+Create Date: 2026-03-24 16:40:12.093518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a4c2e6b1f90'
+down_revision: Union[str, Sequence[str], None] = '5d1f7a3c9e28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('booking_waitlist',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('resource_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('start_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('end_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('participants', sa.Integer(), nullable=False),
+    sa.Column('notes', sa.String(length=1000), nullable=False),
+    sa.Column('status', sa.Enum('waiting', 'promoted', 'cancelled', 'expired', name='waitlist_status'), nullable=False),
+    sa.Column('booking_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('promoted_at', sa.DateTime(timezone=True), nullable=True),
+    sa.CheckConstraint('end_at > start_at', name='ck_booking_waitlist_time_order'),
+    sa.ForeignKeyConstraint(['resource_id'], ['resources.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_booking_waitlist_user_id'), 'booking_waitlist', ['user_id'], unique=False)
+    waiting = sa.text("status = 'waiting'")
+    # Promotion looks up the waiters of a resource around a freed slot
+    op.create_index(
+        'ix_booking_waitlist_waiting', 'booking_waitlist', ['resource_id', 'start_at'], unique=False, postgresql_where=waiting
+    )
+    # A user waits at most once for the same slot
+    op.create_index(
+        'uq_booking_waitlist_waiting_slot',
+        'booking_waitlist',
+        ['user_id', 'resource_id', 'start_at', 'end_at'],
+        unique=True,
+        postgresql_where=waiting,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_booking_waitlist_waiting_slot', table_name='booking_waitlist')
+    op.drop_index('ix_booking_waitlist_waiting', table_name='booking_waitlist')
+    op.drop_index(op.f('ix_booking_waitlist_user_id'), table_name='booking_waitlist')
+    op.drop_table('booking_waitlist')
+    sa.Enum(name='waitlist_status').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,71 @@
+"""create bookings table with overlap guard
+
+Revision ID: 9c4e2b7d1a36
+Revises: ed045e7db5b5
+Create Date: 2026-01-08 10:12:05.418220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4e2b7d1a36'
+down_revision: Union[str, Sequence[str], None] = 'ed045e7db5b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # btree_gist lets a GiST index mix "resource_id =" with "tstzrange &&"
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+
+    op.create_table('bookings',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('resource_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('start_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('end_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('status', sa.Enum('pending', 'confirmed', 'cancelled', 'completed', 'no_show', name='booking_status'), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('participants', sa.Integer(), nullable=False),
+    sa.Column('notes', sa.String(length=1000), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.CheckConstraint('end_at > start_at', name='ck_bookings_time_order'),
+    sa.ForeignKeyConstraint(['resource_id'], ['resources.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_bookings_id'), 'bookings', ['id'], unique=False)
+    op.create_index(op.f('ix_bookings_resource_id'), 'bookings', ['resource_id'], unique=False)
+    op.create_index(op.f('ix_bookings_user_id'), 'bookings', ['user_id'], unique=False)
+    op.create_index(op.f('ix_bookings_start_at'), 'bookings', ['start_at'], unique=False)
+    op.create_index(op.f('ix_bookings_end_at'), 'bookings', ['end_at'], unique=False)
+
+    # No two active (pending/confirmed) bookings may overlap on the same resource
+    op.execute(
+        """
+        ALTER TABLE bookings
+        ADD CONSTRAINT ex_bookings_no_overlap
+        EXCLUDE USING gist (
+            resource_id WITH =,
+            tstzrange(start_at, end_at, '[)') WITH &&
+        )
+        WHERE (status IN ('pending', 'confirmed'))
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE bookings DROP CONSTRAINT IF EXISTS ex_bookings_no_overlap")
+    op.drop_index(op.f('ix_bookings_end_at'), table_name='bookings')
+    op.drop_index(op.f('ix_bookings_start_at'), table_name='bookings')
+    op.drop_index(op.f('ix_bookings_user_id'), table_name='bookings')
+    op.drop_index(op.f('ix_bookings_resource_id'), table_name='bookings')
+    op.drop_index(op.f('ix_bookings_id'), table_name='bookings')
+    op.drop_table('bookings')
+    sa.Enum(name='booking_status').drop(op.get_bind(), checkfirst=True)
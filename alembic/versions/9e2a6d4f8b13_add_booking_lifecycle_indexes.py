@@ -0,0 +1,49 @@
+"""add booking lifecycle indexes
+
+Revision ID: 9e2a6d4f8b13
+Revises: 3b6f0e8c1d47
+Create Date: 2026-03-10 14:22:09.318540
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e2a6d4f8b13'
+down_revision: Union[str, Sequence[str], None] = '3b6f0e8c1d47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The lifecycle scheduler only scans rows that still have to move, rows leave these indexes once moved
+    with op.get_context().autocommit_block():
+        # Completions (ended confirmed bookings) and no-shows (started pending bookings)
+        op.create_index(
+            'ix_bookings_active_start',
+            'bookings',
+            ['start_at'],
+            unique=False,
+            postgresql_where=sa.text("status IN ('pending', 'confirmed')"),
+            postgresql_concurrently=True,
+        )
+        # Expiry of unapproved bookings
+        op.create_index(
+            'ix_bookings_pending_created',
+            'bookings',
+            ['created_at'],
+            unique=False,
+            postgresql_where=sa.text("status = 'pending'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_bookings_pending_created', table_name='bookings', postgresql_concurrently=True)
+        op.drop_index('ix_bookings_active_start', table_name='bookings', postgresql_concurrently=True)
@@ -0,0 +1,59 @@
+"""notify booking changes
+
+Revision ID: b81d5e3f60c2
+Revises: 4f7a1c9e2d58
+Create Date: 2026-01-21 09:03:47.551902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81d5e3f60c2'
+down_revision: Union[str, Sequence[str], None] = '4f7a1c9e2d58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Every row change is published so worker-local interval indexes stay coherent
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_booking_change() RETURNS trigger AS $$
+        DECLARE
+            rec bookings%ROWTYPE;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                rec := OLD;
+            ELSE
+                rec := NEW;
+            END IF;
+            PERFORM pg_notify('booking_changes', json_build_object(
+                'id', rec.id,
+                'resource_id', rec.resource_id,
+                'start_at', rec.start_at,
+                'end_at', rec.end_at,
+                'status', CASE WHEN TG_OP = 'DELETE' THEN 'deleted' ELSE rec.status::text END
+            )::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_bookings_notify
+        AFTER INSERT OR UPDATE OR DELETE ON bookings
+        FOR EACH ROW EXECUTE FUNCTION notify_booking_change()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS trg_bookings_notify ON bookings")
+    op.execute("DROP FUNCTION IF EXISTS notify_booking_change()")
@@ -0,0 +1,39 @@
+"""add approval queue indexes
+
+Revision ID: c7e1a4d9b352
+Revises: 8a4c2e6b1f90
+Create Date: 2026-03-31 09:48:27.530164
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e1a4d9b352'
+down_revision: Union[str, Sequence[str], None] = '8a4c2e6b1f90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Approval queue, soonest first; bookings is partitioned, so no CONCURRENTLY (built per partition)
+    op.create_index(
+        'ix_bookings_pending_start_id',
+        'bookings',
+        ['start_at', 'id'],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_department', 'users', ['department'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_department', table_name='users', postgresql_concurrently=True)
+    op.drop_index('ix_bookings_pending_start_id', table_name='bookings')
@@ -0,0 +1,36 @@
+"""add bookable resources index
+
+Revision ID: d2a6f8b41e97
+Revises: b81d5e3f60c2
+Create Date: 2026-01-27 11:26:13.208734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a6f8b41e97'
+down_revision: Union[str, Sequence[str], None] = 'b81d5e3f60c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Best-fit order of GET /resources/available; the NOT EXISTS probe uses the
+    # GiST index behind ex_bookings_no_overlap
+    op.create_index(
+        'ix_resources_bookable_capacity',
+        'resources',
+        ['capacity_max', 'id'],
+        unique=False,
+        postgresql_where=sa.text("is_deleted = false AND status = 'active'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_resources_bookable_capacity', table_name='resources')
@@ -0,0 +1,47 @@
+"""add keyset pagination indexes
+
+Revision ID: e5c09a7b3f14
+Revises: d2a6f8b41e97
+Create Date: 2026-02-03 15:48:30.662517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5c09a7b3f14'
+down_revision: Union[str, Sequence[str], None] = 'd2a6f8b41e97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # One index per (sort key, id) so any page is an index range scan
+    not_deleted = sa.text("is_deleted = false")
+    op.create_index('ix_resources_name_id', 'resources', ['name', 'id'], unique=False, postgresql_where=not_deleted)
+    op.create_index('ix_resources_type_id', 'resources', ['type', 'id'], unique=False, postgresql_where=not_deleted)
+    op.create_index(
+        'ix_resources_capacity_id',
+        'resources',
+        [sa.text('coalesce(capacity_max, 2147483647)'), 'id'],
+        unique=False,
+        postgresql_where=not_deleted,
+    )
+    op.create_index(
+        'ix_bookings_user_start_id',
+        'bookings',
+        ['user_id', sa.text('start_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bookings_user_start_id', table_name='bookings')
+    op.drop_index('ix_resources_capacity_id', table_name='resources')
+    op.drop_index('ix_resources_type_id', table_name='resources')
+    op.drop_index('ix_resources_name_id', table_name='resources')
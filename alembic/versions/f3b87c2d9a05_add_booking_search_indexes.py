@@ -0,0 +1,34 @@
+"""add booking search indexes
+
+Revision ID: f3b87c2d9a05
+Revises: e5c09a7b3f14
+Create Date: 2026-02-10 10:31:56.114082
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b87c2d9a05'
+down_revision: Union[str, Sequence[str], None] = 'e5c09a7b3f14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # GET /bookings orders by (start_at, id); every filter leads with an equality column
+    # so "site X this week" is one (resource_id, start_at) range scan per resource of the site
+    op.create_index('ix_bookings_resource_start_id', 'bookings', ['resource_id', 'start_at', 'id'], unique=False)
+    op.create_index('ix_bookings_start_id', 'bookings', ['start_at', 'id'], unique=False)
+    op.create_index('ix_resources_site', 'resources', ['site'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_resources_site', table_name='resources')
+    op.drop_index('ix_bookings_start_id', table_name='bookings')
+    op.drop_index('ix_bookings_resource_start_id', table_name='bookings')
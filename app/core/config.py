@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 """Application configuration settings."""
@@ -14,4 +16,70 @@ class Settings(BaseSettings):
     db_user: str = "postgres"
     db_password: str = "Itsbiggerthan1+"
 
+    # Connection pool (per worker)
+    db_echo: bool = False
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    # "always" pings on every checkout, "never" relies on pool_recycle and disconnect detection
+    db_pre_ping: Literal["always", "never"] = "never"
+    # asyncpg prepared statement cache per connection (0 disables it, e.g. behind pgbouncer)
+    db_statement_cache_size: int = 100
+    # Connections opened at startup so the first requests skip connection setup
+    db_pool_warmup: int = 5
+
+    # Background DB health sampling used by /health and /health/ready
+    health_interval_seconds: float = 10.0
+    health_timeout_seconds: float = 2.0
+    # Readiness reports "degraded" above this average pool checkout wait
+    health_pool_wait_degraded_ms: float = 200.0
+
+    # Per-request profiling: off means the middleware is not installed at all
+    profiling_enabled: bool = False
+    # Fraction of all requests profiled; admins can also send "X-Profile: 1"
+    profiling_sample_rate: float = 0.0
+    profiling_dir: str = "profiles"
+    profiling_keep: int = 50
+
+    # Per-route SQL statement budgets: "off", "warn" (log) or "raise" (test runs)
+    query_budget_mode: Literal["off", "warn", "raise"] = "off"
+
+    # Read replica for GET routes (unset = primary only), same name and credentials as the primary
+    db_read_host: str | None = None
+    db_read_port: int | None = None
+    # After a write the client reads from the primary for this long (replica lag budget)
+    read_your_writes_seconds: int = 5
+
+    # Series created before full reservation are materialized into bookings up to this many days ahead
+    series_horizon_days: int = 60
+
+    # Booking lifecycle scheduler (one leader across workers, via a Postgres advisory lock)
+    lifecycle_enabled: bool = True
+    lifecycle_interval_seconds: float = 60.0
+    # Rows per UPDATE, and UPDATEs per transition per run (the rest waits for the next run)
+    lifecycle_batch_size: int = 1000
+    lifecycle_max_batches: int = 20
+    # Unapproved pending bookings are cancelled after this long
+    pending_ttl_minutes: int = 1440
+    # A booking still pending this long after its start becomes a no-show
+    no_show_grace_minutes: int = 15
+
+    # Monthly bookings partitions, maintained by the lifecycle leader: created this many months ahead,
+    # detached into the archive schema once older than the retention (0 keeps every partition attached)
+    booking_partitions_ahead_months: int = 3
+    booking_partition_retention_months: int = 24
+    booking_archive_schema: str = "booking_archive"
+
+    # Per-worker cache of user/resource rows on the booking path, invalidated via NOTIFY
+    reference_cache_enabled: bool = True
+    reference_cache_ttl_seconds: int = 30
+    reference_cache_max_entries: int = 10000
+
+    # Per-worker interval index used by booking conflict checks
+    booking_index_enabled: bool = False
+    booking_index_horizon_days: int = 14
+    booking_index_ttl_seconds: int = 300
+    booking_index_max_resources: int = 2000
+
 settings = Settings()
@@ -1,26 +1,129 @@
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
 from urllib.parse import quote_plus
+from sqlalchemy import exc
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.metrics import POOL_CONNECT_SECONDS, POOL_TIMEOUTS_TOTAL, POOL_WAIT_SECONDS, Gauge, registry
+from app.core.query_stats import instrument_engine
 
 """Database connection and utilities."""
 
-def build_db_url() -> str:
+logger = logging.getLogger(__name__)
+
+def build_db_url(host: str | None = None, port: int | None = None) -> str:
     pwd = quote_plus(settings.db_password)  # encode le + etc.
     return (
         f"postgresql+asyncpg://{settings.db_user}:{pwd}"
-        f"@{settings.db_host}:{settings.db_port}/{settings.db_name}"
+        f"@{host or settings.db_host}:{port or settings.db_port}/{settings.db_name}"
     )
 
-engine: AsyncEngine = create_async_engine(
-    build_db_url(),
-    echo=(settings.env == "dev"),
-    pool_pre_ping=True,
+"""Plain asyncpg DSN, for connections living outside the pool (LISTEN)."""
+def build_asyncpg_dsn() -> str:
+    return build_db_url().replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+@dataclass
+class PoolWaitStats:
+    checkouts: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    last_wait: float = 0.0
+    timeouts: int = 0
+    # Checkouts that opened a new (overflow) connection, and how long connecting took
+    connects: int = 0
+    total_connect: float = 0.0
+    max_connect: float = 0.0
+
+    def record(self, elapsed: float) -> None:
+        self.checkouts += 1
+        self.total_wait += elapsed
+        self.last_wait = elapsed
+        self.max_wait = max(self.max_wait, elapsed)
+
+    def record_connect(self, elapsed: float) -> None:
+        self.connects += 1
+        self.total_connect += elapsed
+        self.max_connect = max(self.max_connect, elapsed)
+
+
+pool_wait_stats = PoolWaitStats()
+
+# Connect time of the checkout running in this task, so it is not counted as queue wait
+_connect_time: ContextVar[float] = ContextVar("pool_connect_time", default=0.0)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that measures how long each checkout waited for a connection, apart from connecting."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        token = _connect_time.set(0.0)
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            # Only pool exhaustion, a failing connect is not a timeout
+            pool_wait_stats.timeouts += 1
+            POOL_TIMEOUTS_TOTAL.inc()
+            raise
+        finally:
+            connecting = _connect_time.get()
+            _connect_time.reset(token)
+            elapsed = time.perf_counter() - started - connecting
+            pool_wait_stats.record(elapsed)
+            POOL_WAIT_SECONDS.observe(elapsed)
+
+    def _create_connection(self):
+        started = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            elapsed = time.perf_counter() - started
+            _connect_time.set(_connect_time.get() + elapsed)
+            pool_wait_stats.record_connect(elapsed)
+            POOL_CONNECT_SECONDS.observe(elapsed)
+
+
+def _create_engine(url: str, poolclass=AsyncAdaptedQueuePool) -> AsyncEngine:
+    created = create_async_engine(
+        f"{url}?prepared_statement_cache_size={settings.db_statement_cache_size}",
+        echo=settings.db_echo,
+        poolclass=poolclass,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pre_ping == "always",
+    )
+    # Count statements and DB time per request (X-DB-Statements header)
+    instrument_engine(created)
+    return created
+
+
+engine: AsyncEngine = _create_engine(build_db_url(), poolclass=InstrumentedPool)
+
+# Optional replica for read-only routes, None when every query goes to the primary
+read_engine: AsyncEngine | None = (
+    _create_engine(build_db_url(settings.db_read_host, settings.db_read_port))
+    if settings.db_read_host
+    else None
 )
 
+registry.register(Gauge("db_pool_checked_out", "Connections currently checked out.", lambda: {(): engine.pool.checkedout()}))
+registry.register(Gauge("db_pool_size", "Configured pool size.", lambda: {(): engine.pool.size()}))
+
 """Asynchronous session maker for database interactions"""
 
 AsyncSessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 
+"""Session maker for read-only routes, falls back to the primary without a replica"""
+
+ReadSessionLocal = async_sessionmaker(bind=read_engine or engine, class_=AsyncSession, expire_on_commit=False)
+
 """Ping the database to check connectivity."""
 async def db_ping() -> bool:
     try:
@@ -29,3 +132,36 @@ async def db_ping() -> bool:
         return True
     except Exception:
         return False
+
+"""Open pool connections up front (called from the app lifespan)."""
+async def warm_up_pool(count: int = settings.db_pool_warmup) -> int:
+    count = min(count, settings.db_pool_size)
+    if count <= 0:
+        return 0
+    # Hold them all at once, otherwise the pool would hand back the same connection
+    results = await asyncio.gather(*(engine.connect().start() for _ in range(count)), return_exceptions=True)
+    opened = [conn for conn in results if not isinstance(conn, BaseException)]
+    await asyncio.gather(*(conn.close() for conn in opened))
+    if len(opened) < count:
+        logger.warning("Pool warm-up opened %s of %s connections", len(opened), count)
+    return len(opened)
+
+"""Live pool numbers for monitoring."""
+def pool_status() -> dict:
+    pool = engine.pool
+    stats = pool_wait_stats
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": settings.db_max_overflow,
+        "checkouts": stats.checkouts,
+        "timeouts": stats.timeouts,
+        "wait_avg_ms": round(stats.total_wait / stats.checkouts * 1000, 3) if stats.checkouts else 0.0,
+        "wait_max_ms": round(stats.max_wait * 1000, 3),
+        "wait_last_ms": round(stats.last_wait * 1000, 3),
+        "connects": stats.connects,
+        "connect_avg_ms": round(stats.total_connect / stats.connects * 1000, 3) if stats.connects else 0.0,
+        "connect_max_ms": round(stats.max_connect * 1000, 3),
+    }
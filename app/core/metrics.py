@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from collections.abc import Callable
+
+from app.core.query_stats import current_stats
+
+"""In-process metrics with a Prometheus text exposition (per worker, no external dependency)."""
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+# Unmatched paths share one label so scanners cannot blow up the series count
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Counter:
+    def __init__(self, name: str, help_: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name, self.help, self.labelnames = name, help_, labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {value:g}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self, name: str, help_: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS
+    ) -> None:
+        self.name, self.help, self.labelnames, self.buckets = name, help_, labelnames, buckets
+        # Per label set: non-cumulative bucket counts (last slot is +Inf), sum
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1][0] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                le = bound if bound == "+Inf" else f"{bound:g}"
+                bucket_labels = _labels(self.labelnames, labels, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {total[0]:g}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """Read at scrape time from a callback returning {label values: value}."""
+
+    def __init__(
+        self, name: str, help_: str, read: Callable[[], dict[tuple[str, ...], float]], labelnames: tuple[str, ...] = ()
+    ) -> None:
+        self.name, self.help, self.labelnames, self.read = name, help_, labelnames, read
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        for labels, value in sorted(self.read().items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {value:g}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: list[Counter | Histogram | Gauge] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUEST_SECONDS = registry.register(
+    Histogram("http_request_duration_seconds", "Request latency by route template.", ("method", "route"))
+)
+REQUESTS_TOTAL = registry.register(
+    Counter("http_requests_total", "Requests by route template and status.", ("method", "route", "status"))
+)
+REQUEST_STATEMENTS = registry.register(
+    Histogram(
+        "db_statements_per_request", "SQL statements per request.", ("method", "route"), buckets=STATEMENT_BUCKETS
+    )
+)
+REQUEST_DB_SECONDS = registry.register(
+    Histogram("db_time_per_request_seconds", "Time spent in SQL per request.", ("method", "route"))
+)
+POOL_WAIT_SECONDS = registry.register(
+    Histogram("db_pool_wait_seconds", "Time spent waiting for a pool connection.")
+)
+POOL_CONNECT_SECONDS = registry.register(
+    Histogram("db_pool_connect_seconds", "Time spent opening a new pool connection during a checkout.")
+)
+POOL_TIMEOUTS_TOTAL = registry.register(Counter("db_pool_timeouts_total", "Pool checkouts that timed out."))
+ERRORS_TOTAL = registry.register(Counter("app_errors_total", "Error responses by error code.", ("error_code",)))
+
+
+def record_error(detail, status_code: int) -> None:
+    # HTTPException details are {"error_code": ..., "message": ...} across the modules
+    code = detail.get("error_code") if isinstance(detail, dict) else None
+    ERRORS_TOTAL.inc(code or f"HTTP_{status_code}")
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware; must sit inside QueryStatsMiddleware to see the per-request SQL totals."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # FastAPI puts the matched route in the scope, its path is the template (/bookings/{booking_id})
+            route = scope.get("route")
+            labels = (scope["method"], getattr(route, "path", UNMATCHED_ROUTE))
+            REQUEST_SECONDS.observe(time.perf_counter() - started, *labels)
+            REQUESTS_TOTAL.inc(*labels, str(status))
+            stats = current_stats()
+            if stats is not None:
+                REQUEST_STATEMENTS.observe(stats.statements, *labels)
+                REQUEST_DB_SECONDS.observe(stats.db_time, *labels)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+
+import asyncpg
+
+from app.core.db import build_asyncpg_dsn
+
+"""Postgres LISTEN/NOTIFY fan-out used to keep per-worker caches coherent."""
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[str], None]
+ResetHandler = Callable[[], None]
+
+RECONNECT_DELAY_SECONDS = 2.0
+
+
+class NotificationListener:
+    """One dedicated connection per worker, dispatching payloads to in-process handlers."""
+
+    def __init__(self) -> None:
+        self._handlers: dict[str, list[Handler]] = {}
+        self._reset_handlers: list[ResetHandler] = []
+        self._task: asyncio.Task | None = None
+        self._conn: asyncpg.Connection | None = None
+        self.reconnects = 0
+        # True while LISTEN is active, i.e. in-process state fed by notifications can be trusted
+        self.listening = False
+
+    def subscribe(self, channel: str, handler: Handler, on_reset: ResetHandler | None = None) -> None:
+        # on_reset is called whenever notifications may have been missed (connect / reconnect)
+        self._handlers.setdefault(channel, []).append(handler)
+        if on_reset is not None:
+            self._reset_handlers.append(on_reset)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if self._handlers and not self.running:
+            self._task = asyncio.create_task(self._run(), name="pg-notification-listener")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            closed = asyncio.Event()
+            try:
+                self._conn = await asyncpg.connect(build_asyncpg_dsn())
+                self._conn.add_termination_listener(lambda _conn: closed.set())
+                for channel in self._handlers:
+                    await self._conn.add_listener(channel, self._dispatch)
+                self.listening = True
+                self._reset_all()
+                await closed.wait()
+            except asyncio.CancelledError:
+                self.listening = False
+                if self._conn is not None:
+                    await self._conn.close()
+                raise
+            except Exception:
+                logger.exception("Notification listener failed, reconnecting")
+            self.listening = False
+            self.reconnects += 1
+            self._reset_all()
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+    def _dispatch(self, _conn: asyncpg.Connection, _pid: int, channel: str, payload: str) -> None:
+        for handler in self._handlers.get(channel, []):
+            try:
+                handler(payload)
+            except Exception:
+                logger.exception("Notification handler failed on %s", channel)
+
+    def _reset_all(self) -> None:
+        for reset in self._reset_handlers:
+            reset()
+
+
+listener = NotificationListener()
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from collections.abc import Callable, Sequence
+from typing import Any, TypeVar
+
+from fastapi import HTTPException, status
+
+"""Opaque keyset cursors: the sort key of the last row of a page, plus the sort it belongs to."""
+
+T = TypeVar("T")
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail={"error_code": "INVALID_CURSOR", "message": "Invalid or expired pagination cursor."},
+    )
+
+
+def encode_cursor(sort: str, key: Sequence[Any]) -> str:
+    raw = json.dumps({"s": sort, "k": list(key)}, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, types: Sequence[Callable[[Any], Any]]) -> list[Any]:
+    """Decode a cursor and convert each key part with `types` (e.g. (str, int))."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise _invalid_cursor()
+    # A cursor is only valid for the sort order that produced it
+    if not isinstance(data, dict) or data.get("s") != sort or not isinstance(data.get("k"), list):
+        raise _invalid_cursor()
+    if len(data["k"]) != len(types):
+        raise _invalid_cursor()
+    try:
+        return [convert(value) for convert, value in zip(types, data["k"])]
+    except (TypeError, ValueError):
+        raise _invalid_cursor()
+
+
+def keyset_page(
+    rows: Sequence[T], limit: int, sort: str, key: Callable[[T], Sequence[Any]]
+) -> tuple[list[T], str | None]:
+    """Repositories fetch limit + 1 rows; the extra one only tells whether a next page exists."""
+    page = list(rows[:limit])
+    if len(rows) > limit and page:
+        return page, encode_cursor(sort, key(page[-1]))
+    return page, None
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import io
+import logging
+import pstats
+import random
+import re
+import time
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.query_stats import current_stats
+
+"""Opt-in per-request profiling, installed only when PROFILING_ENABLED is set."""
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+TOP_FUNCTIONS = 40
+
+
+def _header(scope, name: bytes) -> str:
+    for key, value in scope.get("headers", []):
+        if key == name:
+            return value.decode("latin-1").strip().lower()
+    return ""
+
+
+def _wants_profile(scope) -> bool:
+    # Explicit requests are admin-only, sampling is operator-controlled and covers any caller
+    if _header(scope, PROFILE_HEADER) in ("1", "true") and _header(scope, b"x-role") == "admin":
+        return True
+    return settings.profiling_sample_rate > 0 and random.random() < settings.profiling_sample_rate
+
+
+def _write_profile(
+    directory: Path, profile_id: str, request_line: str, elapsed: float, profiler: cProfile.Profile, sql: list
+) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(directory / f"{profile_id}.prof")
+
+    report = io.StringIO()
+    report.write(f"{request_line}\ntotal: {elapsed * 1000:.2f} ms\n\n")
+    report.write(f"SQL statements: {len(sql)}, {sum(t for _, t in sql) * 1000:.2f} ms\n")
+    for statement, elapsed_sql in sql:
+        report.write(f"\n-- {elapsed_sql * 1000:.2f} ms\n{statement.strip()}\n")
+    report.write("\n")
+    pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+    (directory / f"{profile_id}.txt").write_text(report.getvalue())
+
+    # Rotation: keep the most recent profiles only
+    profiles = sorted(directory.glob("*.prof"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in profiles[settings.profiling_keep:]:
+        old.unlink(missing_ok=True)
+        old.with_suffix(".txt").unlink(missing_ok=True)
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware; must sit inside QueryStatsMiddleware to capture the SQL text."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self.directory = Path(settings.profiling_dir)
+        # cProfile hooks the whole thread, so one profile at a time (others run unprofiled)
+        self._active = False
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or self._active or not _wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        stats = current_stats()
+        if stats is not None:
+            stats.captured = []
+        path = re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_") or "root"
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{scope['method'].lower()}-{path}-{random.getrandbits(24):06x}"
+
+        async def send_with_id(message) -> None:
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (PROFILE_ID_HEADER, profile_id.encode())]}
+            await send(message)
+
+        # Deterministic profiler: concurrent requests interleaving on the loop show up too
+        profiler = cProfile.Profile()
+        self._active = True
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profiler.disable()
+            self._active = False
+            elapsed = time.perf_counter() - started
+            request_line = f"{scope['method']} {scope['path']}?{scope.get('query_string', b'').decode('latin-1')}"
+            sql = list(stats.captured or []) if stats is not None else []
+            try:
+                await asyncio.to_thread(
+                    _write_profile, self.directory, profile_id, request_line, elapsed, profiler, sql
+                )
+            except OSError:
+                logger.exception("Could not write profile %s", profile_id)
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TypeVar
+
+from app.core.config import settings
+from app.core.query_stats import QueryStats, current_stats, reset_stats, start_stats
+
+"""SQL statement budgets, per block (tests) or per route (declared on the handler, checked by a middleware)."""
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable)
+
+BUDGET_ATTRIBUTE = "__query_budget__"
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@dataclass(frozen=True)
+class QueryBudget:
+    max_statements: int | None = None
+    exact: int | None = None
+
+    def violated_by(self, count: int) -> bool:
+        if self.exact is not None:
+            return count != self.exact
+        return self.max_statements is not None and count > self.max_statements
+
+    def describe(self) -> str:
+        return f"exactly {self.exact}" if self.exact is not None else f"at most {self.max_statements}"
+
+
+def format_violation(label: str, budget: QueryBudget, stats: QueryStats) -> str:
+    lines = [f"{label}: expected {budget.describe()} SQL statements, got {stats.statements}"]
+    for i, (statement, elapsed) in enumerate(stats.captured or [], start=1):
+        lines.append(f"  {i}. [{elapsed * 1000:.2f} ms] {' '.join(statement.split())}")
+    return "\n".join(lines)
+
+
+@contextmanager
+def query_budget(
+    *, max_statements: int | None = None, exact: int | None = None, label: str = "block"
+) -> Iterator[QueryStats]:
+    """Counts the statements run inside the block and raises QueryBudgetExceeded with their text."""
+    budget = QueryBudget(max_statements=max_statements, exact=exact)
+    token, stats = start_stats(capture=True)
+    try:
+        yield stats
+    finally:
+        reset_stats(token)
+    if budget.violated_by(stats.statements):
+        raise QueryBudgetExceeded(format_violation(label, budget, stats))
+
+
+def route_budget(*, max_statements: int | None = None, exact: int | None = None) -> Callable[[F], F]:
+    """Declares the budget of a route handler; the handler itself is returned unchanged."""
+
+    def decorate(handler: F) -> F:
+        setattr(handler, BUDGET_ATTRIBUTE, QueryBudget(max_statements=max_statements, exact=exact))
+        return handler
+
+    return decorate
+
+
+class QueryBudgetMiddleware:
+    """Pure ASGI middleware inside QueryStatsMiddleware; installed only when QUERY_BUDGET_MODE is not "off"."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self.raise_on_violation = settings.query_budget_mode == "raise"
+
+    async def __call__(self, scope, receive, send) -> None:
+        stats = current_stats() if scope["type"] == "http" else None
+        if stats is None:
+            await self.app(scope, receive, send)
+            return
+
+        if stats.captured is None:
+            stats.captured = []
+        await self.app(scope, receive, send)
+
+        route = scope.get("route")
+        budget = getattr(getattr(route, "endpoint", None), BUDGET_ATTRIBUTE, None)
+        if budget is None or not budget.violated_by(stats.statements):
+            return
+        message = format_violation(f"{scope['method']} {route.path}", budget, stats)
+        if self.raise_on_violation:
+            # Response is already sent; the error surfaces in the server log / test client
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+"""Per-request SQL round-trip accounting, fed by engine events."""
+
+STATEMENTS_HEADER = b"x-db-statements"
+DB_TIME_HEADER = b"x-db-time-ms"
+
+
+@dataclass
+class QueryStats:
+    statements: int = 0
+    db_time: float = 0.0
+    # Set by callers that want the SQL text too (profiling, query budgets)
+    captured: list[tuple[str, float]] | None = field(default=None)
+    # Enclosing scope, it sees the statements of nested ones (a test's budget around a request)
+    parent: QueryStats | None = field(default=None, repr=False)
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def current_stats() -> QueryStats | None:
+    return _current.get()
+
+
+def start_stats(capture: bool = False) -> tuple[Token[QueryStats | None], QueryStats]:
+    """Start a new accounting scope; returns the token for reset_stats and the scope itself."""
+    stats = QueryStats(captured=[] if capture else None, parent=_current.get())
+    return _current.set(stats), stats
+
+
+def reset_stats(token: Token[QueryStats | None]) -> None:
+    _current.reset(token)
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    # On the execution context, not the connection: a failing statement never reaches after_cursor_execute
+    context._query_start = time.perf_counter()
+
+
+def _record(statement: str, started: float | None) -> None:
+    elapsed = time.perf_counter() - started if started is not None else 0.0
+    stats = _current.get()
+    while stats is not None:
+        stats.statements += 1
+        stats.db_time += elapsed
+        if stats.captured is not None:
+            stats.captured.append((statement, elapsed))
+        stats = stats.parent
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    _record(statement, context._query_start)
+    # A later failure on this context (fetching rows) must not count it twice
+    context._query_start = None
+
+
+def _handle_error(exception_context) -> None:
+    # Statements rejected by the server (e.g. an exclusion violation) still cost a round trip
+    context = exception_context.execution_context
+    started = getattr(context, "_query_start", None)
+    if started is None or exception_context.statement is None:
+        return
+    _record(exception_context.statement, started)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+
+class QueryStatsMiddleware:
+    """Pure ASGI middleware: one accounting scope per request, totals sent as response headers."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token, stats = start_stats()
+
+        async def send_with_stats(message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((STATEMENTS_HEADER, str(stats.statements).encode()))
+                headers.append((DB_TIME_HEADER, f"{stats.db_time * 1000:.2f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            reset_stats(token)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import time
+from http.cookies import SimpleCookie
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal, ReadSessionLocal, read_engine
+
+"""Read/write split: read-only routes use the replica unless the client just wrote."""
+
+# Set after a successful write, holds the epoch second until which reads stay on the primary
+PRIMARY_PIN_COOKIE = "db_primary_until"
+# Clients that cannot keep cookies can ask for the primary explicitly
+READ_PRIMARY_HEADER = "x-read-primary"
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def reads_from_primary(request: Request) -> bool:
+    if read_engine is None:
+        return True
+    if request.headers.get(READ_PRIMARY_HEADER, "").lower() in ("1", "true"):
+        return True
+    try:
+        return float(request.cookies.get(PRIMARY_PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def read_session_maker(request: Request) -> async_sessionmaker:
+    """Session factory for this request's reads; also for work that outlives the request session."""
+    return AsyncSessionLocal if reads_from_primary(request) else ReadSessionLocal
+
+
+async def get_read_session(request: Request):
+    async with read_session_maker(request)() as session:
+        yield session
+
+
+class ReadYourWritesMiddleware:
+    """Pure ASGI middleware: successful writes pin the client's next reads to the primary."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or read_engine is None or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_pin(message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                cookie = SimpleCookie()
+                cookie[PRIMARY_PIN_COOKIE] = str(int(time.time()) + settings.read_your_writes_seconds)
+                cookie[PRIMARY_PIN_COOKIE]["max-age"] = settings.read_your_writes_seconds
+                cookie[PRIMARY_PIN_COOKIE]["path"] = "/"
+                cookie[PRIMARY_PIN_COOKIE]["httponly"] = True
+                header = cookie.output(header="").strip().encode()
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", header)]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_pin)
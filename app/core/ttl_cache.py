@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+"""Small async-safe LRU + TTL cache for rarely changing reference rows."""
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    loads: int = 0
+    invalidations: int = 0
+    evictions: int = 0
+    resets: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return round(self.hits / total, 4) if total else 0.0
+
+
+class TTLCache:
+    """Entries expire after ttl_seconds; concurrent misses on one key share a single load."""
+
+    def __init__(self, name: str, *, enabled: bool, ttl_seconds: float, max_entries: int) -> None:
+        self.name = name
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        # Bumped on every invalidation so a load started before it is not stored
+        self._version = 0
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        if not self.enabled:
+            return await loader()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if time.monotonic() - entry[0] <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return entry[1]
+            del self._entries[key]
+            self.stats.expired += 1
+        self.stats.misses += 1
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # The leader was cancelled, not us: load on our own
+                if not pending.cancelled():
+                    raise
+                return await loader()
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        version = self._version
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Waiters get the error, nobody else needs to retrieve it
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        future.set_result(value)
+        self.stats.loads += 1
+        # Misses (None) are not cached, the row may be created any time
+        if value is not None and version == self._version:
+            self._store(key, value)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        self._version += 1
+        self.stats.invalidations += 1
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._version += 1
+        self.stats.resets += 1
+        self._entries.clear()
+
+    def snapshot(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "hit_rate": self.stats.hit_rate,
+            **vars(self.stats),
+        }
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
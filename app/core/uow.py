@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from typing import Any, TypeVar
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+"""Unit of work: one statement per write, no commit-then-refresh."""
+
+T = TypeVar("T")
+
+
+class UnitOfWork:
+    """Sessions use expire_on_commit=False, so rows written with RETURNING stay loaded after commit."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+        self._notifications: list[tuple[str, str]] = []
+
+    def notify(self, channel: str, payload: str) -> None:
+        """Queue a NOTIFY sent inside the next commit's transaction (so only if that write commits)."""
+        self._notifications.append((channel, payload))
+
+    async def add(self, obj: T) -> T:
+        # INSERT ... RETURNING id (the ORM does this on Postgres), then COMMIT
+        self.session.add(obj)
+        await self.commit()
+        return obj
+
+    async def update_returning(self, model: type[T], *criteria: Any, **values: Any) -> T | None:
+        """UPDATE model SET values WHERE criteria RETURNING *; None when no row matched."""
+        stmt = (
+            update(model)
+            .where(*criteria)
+            .values(**values)
+            .returning(model)
+            .execution_options(populate_existing=True, synchronize_session=False)
+        )
+        try:
+            res = await self.session.execute(stmt)
+            obj = res.scalar_one_or_none()
+        except IntegrityError:
+            self._notifications.clear()
+            await self.session.rollback()
+            raise
+        await self.commit()
+        return obj
+
+    async def commit(self) -> None:
+        notifications, self._notifications = self._notifications, []
+        try:
+            if notifications:
+                # One SELECT for all of them, delivered by Postgres when the transaction commits
+                await self.session.execute(select(*(func.pg_notify(c, p) for c, p in notifications)))
+            await self.session.commit()
+        except IntegrityError:
+            await self.session.rollback()
+            raise
@@ -1,5 +1,25 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.exception_handlers import http_exception_handler, request_validation_exception_handler
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import PlainTextResponse
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from app.core.config import settings
+from app.core.db import engine, read_engine, warm_up_pool
+from app.core.metrics import MetricsMiddleware, record_error, registry
+from app.core.notifications import listener
+from app.core.profiling import ProfilingMiddleware
+from app.core.query_budget import QueryBudgetMiddleware
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.read_routing import ReadYourWritesMiddleware
+from app.modules.bookings.cache import register_booking_index
+from app.modules.bookings.lifecycle import lifecycle_scheduler
+from app.modules.bookings.waitlist import waitlist_worker
+from app.modules.resources.cache import register_resource_cache
+from app.modules.resources.catalog import register_catalog_cache
+from app.modules.users.cache import register_user_cache
+from app.modules.health.monitor import health_monitor
 from app.modules.health.routes import router as health_router
 from app.modules.users.routes import router as users_router
 from app.modules.resources.routes import router as resources_router
@@ -8,7 +28,43 @@ from app.modules.bookings.routes import router as bookings_router
 
 """Main application entry point"""
 
-app = FastAPI(title=settings.app_name)
+"""Startup / shutdown of per-worker background machinery"""
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await warm_up_pool()
+    register_booking_index(listener)
+    register_user_cache(listener)
+    register_resource_cache(listener)
+    register_catalog_cache(listener)
+    await listener.start()
+    await health_monitor.start()
+    await waitlist_worker.start()
+    if settings.lifecycle_enabled:
+        await lifecycle_scheduler.start()
+    yield
+    await lifecycle_scheduler.stop()
+    await waitlist_worker.stop()
+    await health_monitor.stop()
+    await listener.stop()
+    await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
+
+# Added first so it runs inside QueryStatsMiddleware and sees the request's SQL totals
+app.add_middleware(MetricsMiddleware)
+
+# Installed only when enabled, so disabled profiling costs nothing per request
+if settings.profiling_enabled:
+    app.add_middleware(ProfilingMiddleware)
+
+if settings.query_budget_mode != "off":
+    app.add_middleware(QueryBudgetMiddleware)
+
+app.add_middleware(QueryStatsMiddleware)
+
+app.add_middleware(ReadYourWritesMiddleware)
 
 app.include_router(users_router)
 
@@ -18,6 +74,22 @@ app.include_router(resources_router)
 
 app.include_router(bookings_router)
 
+"""Error counters by error_code, then the default FastAPI responses"""
+@app.exception_handler(StarletteHTTPException)
+async def count_http_exception(request: Request, exc: StarletteHTTPException):
+    record_error(exc.detail, exc.status_code)
+    return await http_exception_handler(request, exc)
+
+@app.exception_handler(RequestValidationError)
+async def count_validation_error(request: Request, exc: RequestValidationError):
+    record_error({"error_code": "VALIDATION_ERROR"}, 422)
+    return await request_validation_exception_handler(request, exc)
+
+"""Prometheus text exposition of this worker's metrics"""
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
 """Root endpoint"""
 @app.get("/")
 async def root():
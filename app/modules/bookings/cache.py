@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import json
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.core.notifications import NotificationListener
+from app.modules.bookings.models import ACTIVE_STATUSES, Booking
+from app.utils.time_slots import now_utc, to_utc
+
+"""Per-worker interval index of active bookings, the database stays the source of truth."""
+
+# Channel fed by the trg_bookings_notify trigger
+BOOKING_CHANNEL = "booking_changes"
+
+ACTIVE_VALUES = {s.value for s in ACTIVE_STATUSES} | {s.name for s in ACTIVE_STATUSES}
+
+
+@dataclass
+class _Entry:
+    loaded_at: float
+    covered_from: datetime
+    covered_to: datetime
+    # Active intervals never overlap (exclusion constraint), so starts and ends are both sorted
+    starts: list[datetime] = field(default_factory=list)
+    ends: list[datetime] = field(default_factory=list)
+    ids: list[int] = field(default_factory=list)
+
+    def remove(self, booking_id: int) -> None:
+        if booking_id in self.ids:
+            i = self.ids.index(booking_id)
+            del self.starts[i], self.ends[i], self.ids[i]
+
+    def add(self, booking_id: int, start_at: datetime, end_at: datetime) -> None:
+        i = bisect_right(self.starts, start_at)
+        self.starts.insert(i, start_at)
+        self.ends.insert(i, end_at)
+        self.ids.insert(i, booking_id)
+
+
+@dataclass
+class IndexStats:
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0
+    loads: int = 0
+    notifications: int = 0
+    resets: int = 0
+    evictions: int = 0
+    # Loads dropped because the resource changed while its rows were being read
+    discarded: int = 0
+
+
+class BookingIntervalIndex:
+    def __init__(self, *, enabled: bool, horizon: timedelta, ttl_seconds: float, max_resources: int) -> None:
+        self.enabled = enabled
+        self.horizon = horizon
+        self.ttl_seconds = ttl_seconds
+        self.max_resources = max_resources
+        self.stats = IndexStats()
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        # Bumped on every change seen for a resource (entry or not) and on every reset, see load_token
+        self._generations: dict[int, int] = {}
+        self._epoch = 0
+
+    def window(self) -> tuple[datetime, datetime]:
+        # Rolling window a fresh load covers
+        now = now_utc()
+        return now, now + self.horizon
+
+    def covers(self, start_at: datetime, end_at: datetime) -> bool:
+        lo, hi = self.window()
+        return to_utc(start_at) >= lo and to_utc(end_at) <= hi
+
+    def lookup(
+        self, resource_id: int, start_at: datetime, end_at: datetime, exclude_id: int | None = None
+    ) -> bool | None:
+        """True/False when the index can answer, None on a miss. Only False is authoritative: a stale entry can
+        hold a cancelled interval, so callers confirm True against the database."""
+        entry = self._fresh_entry(resource_id)
+        start_at, end_at = to_utc(start_at), to_utc(end_at)
+        if entry is None or start_at < entry.covered_from or end_at > entry.covered_to:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        # First interval ending after start_at is the only candidate (plus the next one if excluded)
+        i = bisect_right(entry.ends, start_at)
+        while i < len(entry.ids) and entry.starts[i] < end_at:
+            if entry.ids[i] != exclude_id:
+                return True
+            i += 1
+        return False
+
+    def load_token(self, resource_id: int) -> tuple[int, int]:
+        """Taken before the SELECT that feeds load(); a change seen in between makes load() drop the rows."""
+        return self._epoch, self._generations.get(resource_id, 0)
+
+    def load(
+        self,
+        resource_id: int,
+        rows: list[tuple[int, datetime, datetime]],
+        covered: tuple[datetime, datetime],
+        token: tuple[int, int],
+    ) -> None:
+        if token != self.load_token(resource_id):
+            # The snapshot may predate that change (a cancel notified mid-query), the next lookup reloads
+            self.stats.discarded += 1
+            return
+        entry = _Entry(loaded_at=time.monotonic(), covered_from=covered[0], covered_to=covered[1])
+        for booking_id, start_at, end_at in sorted(rows, key=lambda r: r[1]):
+            entry.starts.append(to_utc(start_at))
+            entry.ends.append(to_utc(end_at))
+            entry.ids.append(booking_id)
+        self._entries[resource_id] = entry
+        self._entries.move_to_end(resource_id)
+        self.stats.loads += 1
+        while len(self._entries) > self.max_resources:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def apply(self, booking_id: int, resource_id: int, start_at: datetime, end_at: datetime, status: str) -> None:
+        # Write-through: same path for local commits and remote notifications
+        self._changed(resource_id)
+        entry = self._entries.get(resource_id)
+        if entry is None:
+            return
+        entry.remove(booking_id)
+        if status in ACTIVE_VALUES:
+            entry.add(booking_id, to_utc(start_at), to_utc(end_at))
+
+    def apply_booking(self, booking: Booking) -> None:
+        self.apply(booking.id, booking.resource_id, booking.start_at, booking.end_at, booking.status.value)
+
+    def invalidate(self, resource_id: int) -> None:
+        self._changed(resource_id)
+        self._entries.pop(resource_id, None)
+
+    def clear(self) -> None:
+        # Notifications may have been lost (listener reconnect): loads in flight are dropped too
+        self._epoch += 1
+        self._generations.clear()
+        self._entries.clear()
+        self.stats.resets += 1
+
+    def _changed(self, resource_id: int) -> None:
+        self._generations[resource_id] = self._generations.get(resource_id, 0) + 1
+
+    def snapshot(self) -> dict:
+        return {"enabled": self.enabled, "resources": len(self._entries), **vars(self.stats)}
+
+    def _fresh_entry(self, resource_id: int) -> _Entry | None:
+        entry = self._entries.get(resource_id)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.loaded_at > self.ttl_seconds:
+            # Safety net in case a notification was lost
+            del self._entries[resource_id]
+            self.stats.stale += 1
+            return None
+        self._entries.move_to_end(resource_id)
+        return entry
+
+    def on_notification(self, payload: str) -> None:
+        data = json.loads(payload)
+        self.stats.notifications += 1
+        self.apply(
+            data["id"],
+            data["resource_id"],
+            datetime.fromisoformat(data["start_at"]),
+            datetime.fromisoformat(data["end_at"]),
+            data["status"],
+        )
+
+
+booking_index = BookingIntervalIndex(
+    enabled=settings.booking_index_enabled,
+    horizon=timedelta(days=settings.booking_index_horizon_days),
+    ttl_seconds=settings.booking_index_ttl_seconds,
+    max_resources=settings.booking_index_max_resources,
+)
+
+
+def register_booking_index(listener: NotificationListener) -> None:
+    if booking_index.enabled:
+        listener.subscribe(BOOKING_CHANNEL, booking_index.on_notification, on_reset=booking_index.clear)
+
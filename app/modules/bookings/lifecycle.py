@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, time as dtime, timedelta, timezone
+
+import asyncpg
+
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal, build_asyncpg_dsn
+from app.core.metrics import Counter, Gauge, Histogram, registry
+from app.modules.bookings.models import Booking, BookingStatus
+from app.modules.bookings.partitions import maintain_partitions
+from app.modules.bookings.repository import BookingConflictError, BookingRepository
+from app.modules.bookings.service import BookingService
+from app.modules.bookings.waitlist import waitlist_worker
+from app.utils.time_slots import now_utc
+
+"""Background booking status transitions and partition upkeep, run by one leader (Postgres advisory lock)."""
+
+logger = logging.getLogger(__name__)
+
+# Session-level advisory lock key shared by every worker; only its holder runs the transitions
+LEADER_LOCK_KEY = 7_301_022_001
+
+TRANSITIONS_TOTAL = registry.register(
+    Counter("booking_lifecycle_transitions_total", "Bookings moved by the lifecycle scheduler.", ("transition",))
+)
+RUN_SECONDS = registry.register(Histogram("booking_lifecycle_run_seconds", "Duration of lifecycle runs."))
+
+
+@dataclass(frozen=True)
+class Transition:
+    name: str
+    from_status: BookingStatus
+    to_status: BookingStatus
+
+
+# Order matters: a pending booking whose slot has started is a no-show, not an expiry
+TRANSITIONS = (
+    Transition("completed", BookingStatus.confirmed, BookingStatus.completed),
+    Transition("no_show", BookingStatus.pending, BookingStatus.no_show),
+    Transition("expired", BookingStatus.pending, BookingStatus.cancelled),
+)
+
+
+def _criteria(name: str, now: datetime) -> tuple:
+    if name == "completed":
+        # start_at < now is implied by end_at, it lets the partial start_at index drive the scan
+        return (Booking.end_at <= now, Booking.start_at < now)
+    if name == "no_show":
+        return (Booking.start_at <= now - timedelta(minutes=settings.no_show_grace_minutes),)
+    return (Booking.created_at <= now - timedelta(minutes=settings.pending_ttl_minutes),)
+
+
+def series_horizon(now: datetime) -> datetime:
+    # Whole days, so each series is extended once a day rather than on every run
+    day = now.date() + timedelta(days=settings.series_horizon_days + 1)
+    return datetime.combine(day, dtime.min, tzinfo=timezone.utc)
+
+
+@dataclass
+class RunStats:
+    started_at: datetime
+    duration_ms: float = 0.0
+    batches: int = 0
+    # Rows moved per transition
+    moved: dict[str, int] = field(default_factory=dict)
+    # Transitions that hit lifecycle_max_batches and left rows for the next run
+    truncated: list[str] = field(default_factory=list)
+    # Free waitlisted slots handed to the waitlist worker
+    waitlist_slots: int = 0
+    # Recurring series occurrences turned into booking rows
+    series_materialized: int = 0
+
+
+class LifecycleScheduler:
+    def __init__(self, *, interval_seconds: float, batch_size: int, max_batches: int) -> None:
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.runs = 0
+        self.failures = 0
+        self.last_run: RunStats | None = None
+        self.last_maintenance: dict[str, list[str]] | None = None
+        self._task: asyncio.Task | None = None
+        # Dedicated connection holding the advisory lock while this worker is the leader
+        self._lock_conn: asyncpg.Connection | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def is_leader(self) -> bool:
+        return self._lock_conn is not None and not self._lock_conn.is_closed()
+
+    async def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="booking-lifecycle")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._release()
+
+    async def run_once(self) -> RunStats:
+        """One pass over every transition, in batches; each batch is its own short transaction."""
+        stats = RunStats(started_at=now_utc())
+        started = time.perf_counter()
+        now = stats.started_at
+        async with AsyncSessionLocal() as session:
+            repo = BookingRepository(session)
+            for transition in TRANSITIONS:
+                moved = 0
+                for _ in range(self.max_batches):
+                    count = await repo.transition_batch(
+                        transition.from_status,
+                        transition.to_status,
+                        *_criteria(transition.name, now),
+                        limit=self.batch_size,
+                    )
+                    stats.batches += 1
+                    moved += count
+                    if count < self.batch_size:
+                        break
+                else:
+                    stats.truncated.append(transition.name)
+                stats.moved[transition.name] = moved
+                if moved:
+                    TRANSITIONS_TOTAL.inc(transition.name, amount=moved)
+
+            stats.moved["waitlist_expired"] = await repo.expire_waitlist(now)
+            # Slots freed by expiries above, or by changes whose promotion was missed
+            slots = await repo.promotable_waitlist_slots(now, self.batch_size)
+            for slot in slots:
+                waitlist_worker.slot_freed(*slot)
+            stats.waitlist_slots = len(slots)
+
+            # Keeps every open series booked up to the rolling horizon
+            try:
+                stats.series_materialized = await BookingService(session).materialize_due_series(series_horizon(now))
+            except BookingConflictError:
+                # A slot was booked between the check and the insert, nothing was written: retried next run
+                logger.warning("Series materialization raced a booking, retrying on the next run")
+
+        elapsed = time.perf_counter() - started
+        stats.duration_ms = round(elapsed * 1000, 3)
+        RUN_SECONDS.observe(elapsed)
+        self.runs += 1
+        self.last_run = stats
+        if any(stats.moved.values()) or stats.series_materialized:
+            logger.info(
+                "Booking lifecycle run: %s in %s batches, %s series occurrences (%.1f ms)",
+                stats.moved,
+                stats.batches,
+                stats.series_materialized,
+                stats.duration_ms,
+            )
+        return stats
+
+    async def maintain_partitions(self) -> dict[str, list[str]]:
+        # DDL runs on the lock connection: outside any request transaction, and only on the leader
+        result = await maintain_partitions(self._lock_conn, now_utc().date())
+        self.last_maintenance = result
+        if result["created"] or result["archived"]:
+            logger.info("Bookings partitions created: %s, archived: %s", result["created"], result["archived"])
+        return result
+
+    def snapshot(self) -> dict:
+        return {
+            "enabled": settings.lifecycle_enabled,
+            "running": self.running,
+            "leader": self.is_leader,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_run": asdict(self.last_run) if self.last_run else None,
+            "last_partition_maintenance": self.last_maintenance,
+        }
+
+    async def _acquire(self) -> bool:
+        # Non-leaders do not keep a connection open, they retry on the next tick
+        if self.is_leader:
+            try:
+                await self._lock_conn.fetchval("SELECT 1")
+                return True
+            except Exception:
+                logger.warning("Lost the lifecycle leader connection")
+                await self._release()
+                return False
+        conn = await asyncpg.connect(build_asyncpg_dsn())
+        try:
+            acquired = await conn.fetchval("SELECT pg_try_advisory_lock($1)", LEADER_LOCK_KEY)
+        except Exception:
+            await conn.close()
+            raise
+        if not acquired:
+            await conn.close()
+            return False
+        self._lock_conn = conn
+        logger.info("This worker is now the booking lifecycle leader")
+        return True
+
+    async def _release(self) -> None:
+        conn, self._lock_conn = self._lock_conn, None
+        if conn is not None and not conn.is_closed():
+            # Closing the session releases the advisory lock
+            await conn.close()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if await self._acquire():
+                    await self.maintain_partitions()
+                    await self.run_once()
+            except Exception:
+                self.failures += 1
+                logger.exception("Booking lifecycle run failed")
+            await asyncio.sleep(self.interval_seconds)
+
+
+lifecycle_scheduler = LifecycleScheduler(
+    interval_seconds=settings.lifecycle_interval_seconds,
+    batch_size=settings.lifecycle_batch_size,
+    max_batches=settings.lifecycle_max_batches,
+)
+
+registry.register(
+    Gauge(
+        "booking_lifecycle_leader",
+        "1 when this worker holds the lifecycle leader lock.",
+        lambda: {(): float(lifecycle_scheduler.is_leader)},
+    )
+)
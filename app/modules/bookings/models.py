@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime, timedelta, timezone
 from enum import Enum
 
-from sqlalchemy import DateTime, Enum as SAEnum, ForeignKey, Integer, String
+from sqlalchemy import Boolean, CheckConstraint, Date, DateTime, Enum as SAEnum, ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.base import Base
@@ -17,15 +18,48 @@ class BookingStatus(str, Enum):
     no_show = "no-show"
 
 
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class SeriesFrequency(str, Enum):
+    daily = "daily"
+    weekly = "weekly"
+
+
+# Statuses that hold a slot (used by conflict checks and the exclusion constraint)
+ACTIVE_STATUSES = (BookingStatus.pending, BookingStatus.confirmed)
+
+# Prefix of the per-partition exclusion constraints, also reported by the month boundary guard
+OVERLAP_CONSTRAINT = "ex_bookings_no_overlap"
+
+# Longest allowed booking. A slot can only overlap rows starting less than this before it, which
+# gives time-window queries a lower bound on start_at so Postgres prunes the monthly partitions
+MAX_BOOKING_SPAN = timedelta(hours=8)
+
+
 class Booking(Base):
+    """Range-partitioned by start_at month, partitions are managed by bookings/partitions.py."""
+
     __tablename__ = "bookings"
+    __table_args__ = (
+        CheckConstraint("end_at > start_at", name="ck_bookings_time_order"),
+        # MAX_BOOKING_SPAN, enforced so the start_at lower bounds and the month boundary guard hold for every row
+        CheckConstraint("end_at - start_at <= interval '8 hours'", name="ck_bookings_max_span"),
+        # Overlapping active slots: an exclusion constraint per partition (needs btree_gist), plus
+        # the guard_booking_month_boundary trigger for slots next to a month boundary
+        {"postgresql_partition_by": "RANGE (start_at)"},
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
 
     resource_id: Mapped[int] = mapped_column(ForeignKey("resources.id"), nullable=False, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
+    # Set when the booking is a materialized occurrence of a recurring series
+    series_id: Mapped[int | None] = mapped_column(ForeignKey("booking_series.id"), nullable=True, index=True)
 
-    start_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    # Part of the primary key: a partitioned table's unique keys must include the partition key
+    start_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, index=True)
     end_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
 
     status: Mapped[BookingStatus] = mapped_column(
@@ -39,7 +73,82 @@ class Booking(Base):
     notes: Mapped[str] = mapped_column(String(1000), nullable=False, default="")
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # Bumped on every write, drives the calendar feed ETags
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=_utcnow, onupdate=_utcnow
+    )
 
     # Relationships are optional for the TP, but handy later
     resource = relationship("Resource")
     user = relationship("User")
+
+
+class BookingSeries(Base):
+    """Recurrence rule; occurrences are expanded lazily and materialized up to a rolling horizon."""
+
+    __tablename__ = "booking_series"
+    __table_args__ = (
+        CheckConstraint("until IS NOT NULL OR count IS NOT NULL", name="ck_booking_series_bounded"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    resource_id: Mapped[int] = mapped_column(ForeignKey("resources.id"), nullable=False, index=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
+
+    # First occurrence, later ones keep the same duration
+    start_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    end_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    frequency: Mapped[SeriesFrequency] = mapped_column(SAEnum(SeriesFrequency, name="series_frequency"), nullable=False)
+    interval: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    until: Mapped[date | None] = mapped_column(Date, nullable=True)
+    count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Occurrence dates (UTC) that are skipped
+    exceptions: Mapped[list[date]] = mapped_column(ARRAY(Date), nullable=False, default=list)
+
+    status: Mapped[BookingStatus] = mapped_column(SAEnum(BookingStatus, name="booking_status"), nullable=False)
+    title: Mapped[str] = mapped_column(String(200), nullable=False)
+    participants: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    notes: Mapped[str] = mapped_column(String(1000), nullable=False, default="")
+
+    is_cancelled: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    # Occurrences starting before this instant exist as rows in bookings
+    materialized_until: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class WaitlistStatus(str, Enum):
+    waiting = "waiting"
+    promoted = "promoted"
+    cancelled = "cancelled"
+    expired = "expired"
+
+
+class WaitlistEntry(Base):
+    """Request for a taken slot, turned into a booking when the slot frees up."""
+
+    __tablename__ = "booking_waitlist"
+    __table_args__ = (CheckConstraint("end_at > start_at", name="ck_booking_waitlist_time_order"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    resource_id: Mapped[int] = mapped_column(ForeignKey("resources.id"), nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
+
+    start_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    end_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    title: Mapped[str] = mapped_column(String(200), nullable=False)
+    participants: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    notes: Mapped[str] = mapped_column(String(1000), nullable=False, default="")
+
+    status: Mapped[WaitlistStatus] = mapped_column(
+        SAEnum(WaitlistStatus, name="waitlist_status"), nullable=False, default=WaitlistStatus.waiting
+    )
+    # Booking created by the promotion (bookings has a composite key, so no foreign key)
+    booking_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=_utcnow)
+    promoted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
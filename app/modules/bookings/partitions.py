@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import logging
+from datetime import date
+
+import asyncpg
+
+from app.core.config import settings
+
+"""Monthly partitions of bookings: created ahead of time, detached into an archive schema once old."""
+
+logger = logging.getLogger(__name__)
+
+# bookings_pYYYYMM, so names sort chronologically; rows past the last month land in bookings_default
+PARTITION_PATTERN = r"^bookings_p[0-9]{6}$"
+# DETACH takes an ACCESS EXCLUSIVE lock on bookings: give up fast and retry on the next run
+DETACH_LOCK_TIMEOUT = "2s"
+
+
+def partition_name(month: date) -> str:
+    return f"bookings_p{month:%Y%m}"
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+async def ensure_partitions(conn: asyncpg.Connection, first: date, last: date) -> list[str]:
+    """Creates the missing monthly partitions from first to last (inclusive); returns the new ones."""
+    # ensure_booking_partition (SQL, see the partitioning migration) also moves matching rows out of the default partition
+    rows = await conn.fetch(
+        """
+        SELECT m::date AS month, ensure_booking_partition(m::date) AS created
+        FROM generate_series($1::date::timestamp, $2::date::timestamp, interval '1 month') AS m
+        """,
+        first.replace(day=1),
+        last.replace(day=1),
+    )
+    return [partition_name(row["month"]) for row in rows if row["created"]]
+
+
+async def archive_partitions(conn: asyncpg.Connection, before: date, schema: str) -> list[str]:
+    """Detaches the partitions of months before `before` and moves them to `schema`; they stay queryable there."""
+    rows = await conn.fetch(
+        """
+        SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'bookings'::regclass AND c.relname ~ $1 AND c.relname < $2
+        ORDER BY c.relname
+        """,
+        PARTITION_PATTERN,
+        partition_name(before),
+    )
+    archived: list[str] = []
+    for row in rows:
+        name = row["relname"]
+        try:
+            async with conn.transaction():
+                await conn.execute(f"SET LOCAL lock_timeout = '{DETACH_LOCK_TIMEOUT}'")
+                await conn.execute(f"CREATE SCHEMA IF NOT EXISTS {_ident(schema)}")
+                await conn.execute(f"ALTER TABLE bookings DETACH PARTITION {_ident(name)}")
+                await conn.execute(f"ALTER TABLE {_ident(name)} SET SCHEMA {_ident(schema)}")
+        except asyncpg.LockNotAvailableError:
+            logger.warning("Could not lock bookings to detach %s, retrying on the next run", name)
+            break
+        archived.append(f"{schema}.{name}")
+    return archived
+
+
+async def maintain_partitions(conn: asyncpg.Connection, today: date) -> dict[str, list[str]]:
+    current = today.replace(day=1)
+    created = await ensure_partitions(conn, current, add_months(current, settings.booking_partitions_ahead_months))
+    archived: list[str] = []
+    if settings.booking_partition_retention_months > 0:
+        before = add_months(current, -settings.booking_partition_retention_months)
+        archived = await archive_partitions(conn, before, settings.booking_archive_schema)
+    return {"created": created, "archived": archived}
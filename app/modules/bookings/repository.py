@@ -1,32 +1,223 @@
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
 from datetime import datetime
 
-from sqlalchemy import and_, select
+from sqlalchemy import (
+    Date,
+    DateTime,
+    Integer,
+    Row,
+    String,
+    and_,
+    any_,
+    bindparam,
+    case,
+    cast,
+    column,
+    exists,
+    false,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
-from app.modules.bookings.models import Booking, BookingStatus
+from app.core.uow import UnitOfWork
+from app.modules.bookings.cache import booking_index
+from app.modules.bookings.models import (
+    ACTIVE_STATUSES,
+    MAX_BOOKING_SPAN,
+    OVERLAP_CONSTRAINT,
+    Booking,
+    BookingSeries,
+    BookingStatus,
+    SeriesFrequency,
+    WaitlistEntry,
+    WaitlistStatus,
+)
+from app.modules.resources.models import Resource, ResourceStatus
+from app.modules.users.models import User, UserPriority, UserRole
+
+# Rows fetched per round trip when streaming calendar feeds
+FEED_BATCH_SIZE = 500
+
+# SQLSTATE raised by Postgres for an EXCLUDE constraint violation
+EXCLUSION_VIOLATION = "23P01"
+
+
+class BookingConflictError(Exception):
+    """Raised when Postgres rejects an overlapping active booking."""
+
+
+class WaitlistDuplicateError(Exception):
+    """Raised when the user already waits for the same slot."""
+
+
+def _overlapping(start_at, end_at, booking=Booking) -> tuple:
+    """Rows overlapping [start_at, end_at); the redundant lower bound on start_at lets Postgres prune partitions."""
+    return (
+        booking.start_at < end_at,
+        booking.start_at > start_at - MAX_BOOKING_SPAN,
+        booking.end_at > start_at,
+    )
+
+
+def _id_in(ids: list[int]):
+    # id = ANY(:ids): one array parameter, whatever the batch size
+    return Booking.id == any_(bindparam("ids", ids, type_=ARRAY(Integer)))
+
+
+def _pending_of(ids: list[int], now: datetime, department: str | None) -> tuple:
+    """Upcoming pending bookings among ids, owned by a user of department (any department when None)."""
+    criteria = [
+        _id_in(ids),
+        Booking.status == BookingStatus.pending,
+        # Started ones are the lifecycle's (no-show); the bound also prunes past partitions
+        Booking.start_at > now,
+        User.id == Booking.user_id,
+    ]
+    if department is not None:
+        criteria.append(User.department == department)
+    return tuple(criteria)
+
+
+def _eligible_waiter() -> tuple:
+    """A waiter who could still book the entry's resource directly (with User and Resource joined)."""
+    return (
+        User.is_active.is_(True),
+        Resource.status == ResourceStatus.active,
+        Resource.is_deleted == false(),
+        # Same permission rule as a direct booking, admins book any type
+        or_(User.role == UserRole.admin, cast(Resource.type, String) == any_(User.allowed_resource_types)),
+    )
+
+
+def _is_overlap_violation(exc: IntegrityError) -> bool:
+    orig = exc.orig
+    if getattr(orig, "sqlstate", None) == EXCLUSION_VIOLATION:
+        return True
+    return OVERLAP_CONSTRAINT in str(orig)
 
 
 class BookingRepository:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
+        self.uow = UnitOfWork(session)
 
     async def get_by_id(self, booking_id: int) -> Booking | None:
         res = await self.session.execute(select(Booking).where(Booking.id == booking_id))
         return res.scalar_one_or_none()
 
-    async def list_for_user(self, user_id: int, limit: int, offset: int) -> list[Booking]:
+    async def list_for_user(
+        self, user_id: int, limit: int, offset: int, after: tuple[datetime, int] | None = None
+    ) -> list[Booking]:
+        # Newest first, id as tiebreaker; returns up to limit + 1 rows
         q = (
             select(Booking)
             .where(Booking.user_id == user_id)
-            .order_by(Booking.start_at.desc())
-            .limit(limit)
-            .offset(offset)
+            .order_by(Booking.start_at.desc(), Booking.id.desc())
+            .limit(limit + 1)
         )
+        if after is not None:
+            q = q.where(tuple_(Booking.start_at, Booking.id) < after)
+        else:
+            q = q.offset(offset)
         res = await self.session.execute(q)
         return list(res.scalars().all())
 
+    async def list_active_intervals(
+        self, *, resource_id: int, start_at: datetime, end_at: datetime
+    ) -> list[tuple[datetime, datetime]]:
+        # One range query for every active slot touching the window, sorted by start
+        q = (
+            select(Booking.start_at, Booking.end_at)
+            .where(
+                and_(
+                    Booking.resource_id == resource_id,
+                    Booking.status.in_(ACTIVE_STATUSES),
+                    *_overlapping(start_at, end_at),
+                )
+            )
+            .order_by(Booking.start_at)
+        )
+        res = await self.session.execute(q)
+        return [(row.start_at, row.end_at) for row in res]
+
+    async def search(
+        self,
+        *,
+        limit: int,
+        resource_id: int | None = None,
+        user_id: int | None = None,
+        site: str | None = None,
+        status: BookingStatus | None = None,
+        start_at: datetime | None = None,
+        end_at: datetime | None = None,
+        after: tuple[datetime, int] | None = None,
+    ) -> list[Booking]:
+        # Chronological, id as tiebreaker; returns up to limit + 1 rows
+        q = select(Booking).order_by(Booking.start_at, Booking.id).limit(limit + 1)
+        if resource_id is not None:
+            q = q.where(Booking.resource_id == resource_id)
+        if user_id is not None:
+            q = q.where(Booking.user_id == user_id)
+        if site is not None:
+            # Semi-join: resolve the site's resources, then range-scan (resource_id, start_at)
+            site_resources = select(Resource.id).where(Resource.site.ilike(site))
+            q = q.where(Booking.resource_id.in_(site_resources))
+        if status is not None:
+            q = q.where(Booking.status == status)
+        if start_at is not None:
+            q = q.where(Booking.end_at > start_at, Booking.start_at > start_at - MAX_BOOKING_SPAN)
+        if end_at is not None:
+            q = q.where(Booking.start_at < end_at)
+        if after is not None:
+            q = q.where(tuple_(Booking.start_at, Booking.id) > after)
+        res = await self.session.execute(q)
+        return list(res.scalars().all())
+
+    async def feed_owner(self, *, resource_id: int | None = None, user_id: int | None = None) -> Row | None:
+        """(name, last_change) of a resource or user feed in one query, None if the owner does not exist."""
+        if resource_id is not None:
+            last_change = select(func.max(Booking.updated_at)).where(Booking.resource_id == Resource.id)
+            q = select(Resource.name, last_change.scalar_subquery()).where(
+                and_(Resource.id == resource_id, Resource.is_deleted == false())
+            )
+        else:
+            last_change = select(func.max(Booking.updated_at)).where(Booking.user_id == User.id)
+            q = select(User.full_name, last_change.scalar_subquery()).where(User.id == user_id)
+        res = await self.session.execute(q)
+        return res.first()
+
+    async def stream_feed(self, *, resource_id: int | None = None, user_id: int | None = None) -> AsyncIterator[Row]:
+        # Server-side cursor over plain rows (no identity map), memory stays flat
+        q = select(
+            Booking.id,
+            Booking.resource_id,
+            Booking.start_at,
+            Booking.end_at,
+            Booking.status,
+            Booking.title,
+            Booking.notes,
+            Booking.updated_at,
+        ).order_by(Booking.start_at, Booking.id)
+        if resource_id is not None:
+            q = q.where(Booking.resource_id == resource_id)
+        if user_id is not None:
+            q = q.where(Booking.user_id == user_id)
+        result = await self.session.stream(q.execution_options(yield_per=FEED_BATCH_SIZE))
+        async for row in result:
+            yield row
+
     async def has_conflict(
         self,
         *,
@@ -35,13 +226,21 @@ class BookingRepository:
         end_at: datetime,
         exclude_booking_id: int | None = None,
     ) -> bool:
+        if booking_index.enabled and booking_index.covers(start_at, end_at):
+            cached = booking_index.lookup(resource_id, start_at, end_at, exclude_booking_id)
+            if cached is None:
+                await self._load_index(resource_id)
+                cached = booking_index.lookup(resource_id, start_at, end_at, exclude_booking_id)
+            # Only "free" is trusted, a conflict may be a stale interval: the query below confirms it
+            if cached is False:
+                return False
+
         # Overlap rule: start < existing_end AND end > existing_start
         q = select(Booking.id).where(
             and_(
                 Booking.resource_id == resource_id,
-                Booking.status.in_([BookingStatus.pending, BookingStatus.confirmed]),
-                Booking.start_at < end_at,
-                Booking.end_at > start_at,
+                Booking.status.in_(ACTIVE_STATUSES),
+                *_overlapping(start_at, end_at),
             )
         )
         if exclude_booking_id is not None:
@@ -50,13 +249,380 @@ class BookingRepository:
         res = await self.session.execute(q)
         return res.first() is not None
 
+    async def _load_index(self, resource_id: int) -> None:
+        # One range query fills the resource's entry for the whole rolling horizon
+        covered = booking_index.window()
+        token = booking_index.load_token(resource_id)
+        q = select(Booking.id, Booking.start_at, Booking.end_at).where(
+            and_(
+                Booking.resource_id == resource_id,
+                Booking.status.in_(ACTIVE_STATUSES),
+                *_overlapping(covered[0], covered[1]),
+            )
+        )
+        res = await self.session.execute(q)
+        booking_index.load(resource_id, [tuple(row) for row in res], covered, token)
+
+    async def find_conflicting_slots(self, slots: list[tuple[int, int, datetime, datetime]]) -> set[int]:
+        """Keys of the (key, resource_id, start_at, end_at) slots overlapping an active booking."""
+        if not slots:
+            return set()
+        # One query: join the candidate slots (VALUES list) against active bookings
+        candidates = values(
+            column("key", Integer),
+            column("resource_id", Integer),
+            column("start_at", DateTime(timezone=True)),
+            column("end_at", DateTime(timezone=True)),
+            name="candidates",
+        ).data(slots)
+        q = select(candidates.c.key).where(
+            exists().where(
+                and_(
+                    Booking.resource_id == candidates.c.resource_id,
+                    Booking.status.in_(ACTIVE_STATUSES),
+                    # Pruned at run time, per candidate
+                    *_overlapping(candidates.c.start_at, candidates.c.end_at),
+                )
+            )
+        )
+        res = await self.session.execute(q)
+        return set(res.scalars().all())
+
+    async def create_many(self, rows: list[dict]) -> list[Booking]:
+        bookings = await self._insert_rows(rows)
+        await self._commit()
+        self._write_through(*bookings)
+        return bookings
+
+    async def _insert_rows(self, rows: list[dict]) -> list[Booking]:
+        # Multi-row INSERT ... RETURNING, rows come back in parameter order
+        if not rows:
+            return []
+        stmt = insert(Booking).returning(Booking, sort_by_parameter_order=True)
+        try:
+            res = await self.session.scalars(stmt, rows)
+            return list(res.all())
+        except IntegrityError as exc:
+            await self.session.rollback()
+            if _is_overlap_violation(exc):
+                raise BookingConflictError() from exc
+            raise
+
+    async def get_series(self, series_id: int) -> BookingSeries | None:
+        res = await self.session.execute(select(BookingSeries).where(BookingSeries.id == series_id))
+        return res.scalar_one_or_none()
+
+    async def create_series(self, series: BookingSeries, rows: list[dict]) -> list[Booking]:
+        # Series row and its first materialized occurrences in one transaction
+        self.session.add(series)
+        await self.session.flush()
+        bookings = await self._insert_rows([{**row, "series_id": series.id} for row in rows])
+        await self._commit()
+        self._write_through(*bookings)
+        return bookings
+
+    async def save_series(self, series: BookingSeries) -> BookingSeries:
+        await self._commit()
+        # Occurrences were cancelled with a bulk UPDATE, drop the resource entry
+        booking_index.invalidate(series.resource_id)
+        return series
+
+    async def list_series_to_materialize(self, horizon_end: datetime) -> list[BookingSeries]:
+        # Skips series with no occurrence left at or after materialized_until (every series is bounded)
+        step_days = BookingSeries.interval * case((BookingSeries.frequency == SeriesFrequency.weekly, 7), else_=1)
+        last_start = BookingSeries.start_at + func.make_interval(0, 0, 0, (BookingSeries.count - 1) * step_days)
+        q = select(BookingSeries).where(
+            and_(
+                BookingSeries.is_cancelled.is_(False),
+                BookingSeries.materialized_until < horizon_end,
+                or_(
+                    BookingSeries.until.is_(None),
+                    BookingSeries.until >= cast(func.timezone("UTC", BookingSeries.materialized_until), Date),
+                ),
+                or_(BookingSeries.count.is_(None), last_start >= BookingSeries.materialized_until),
+            )
+        )
+        res = await self.session.execute(q)
+        return list(res.scalars().all())
+
+    async def list_series_bookings(self, series_id: int, start_at: datetime, end_at: datetime) -> list[Booking]:
+        q = (
+            select(Booking)
+            .where(and_(Booking.series_id == series_id, Booking.start_at < end_at, Booking.end_at > start_at))
+            .order_by(Booking.start_at)
+        )
+        res = await self.session.execute(q)
+        return list(res.scalars().all())
+
+    async def cancel_series_bookings(self, series_id: int, start_at: datetime, end_at: datetime | None = None) -> int:
+        # Cancel the active occurrences starting in [start_at, end_at) with one UPDATE
+        q = update(Booking).where(
+            Booking.series_id == series_id,
+            Booking.status.in_(ACTIVE_STATUSES),
+            Booking.start_at >= start_at,
+        )
+        if end_at is not None:
+            q = q.where(Booking.start_at < end_at)
+        res = await self.session.execute(
+            q.values(status=BookingStatus.cancelled).execution_options(synchronize_session=False)
+        )
+        return res.rowcount
+
+    async def transition_batch(
+        self, from_status: BookingStatus, to_status: BookingStatus, *criteria, limit: int
+    ) -> int:
+        """Move at most `limit` matching bookings to to_status in one UPDATE and commit; returns the row count."""
+        # SKIP LOCKED: rows a request is editing right now are picked up by a later batch
+        candidates = (
+            select(Booking.id)
+            .where(Booking.status == from_status, *criteria)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        res = await self.session.execute(
+            update(Booking)
+            .where(Booking.id.in_(candidates))
+            .values(status=to_status)
+            .execution_options(synchronize_session=False)
+        )
+        await self._commit()
+        return res.rowcount
+
     async def create(self, booking: Booking) -> Booking:
+        # Single INSERT: the exclusion constraint does the conflict check
         self.session.add(booking)
-        await self.session.commit()
-        await self.session.refresh(booking)
+        await self._commit()
+        self._write_through(booking)
         return booking
 
     async def save(self, booking: Booking) -> Booking:
-        await self.session.commit()
-        await self.session.refresh(booking)
+        await self._commit()
+        self._write_through(booking)
         return booking
+
+    async def cancel(self, booking_id: int, *, user_id: int, is_admin: bool) -> Booking | None:
+        # Ownership is part of the WHERE clause: one UPDATE ... RETURNING, None if not allowed or missing
+        booking = await self.uow.update_returning(
+            Booking,
+            Booking.id == booking_id,
+            or_(Booking.user_id == user_id, literal(is_admin)),
+            status=BookingStatus.cancelled,
+        )
+        if booking is not None:
+            self._write_through(booking)
+        return booking
+
+    async def list_pending_approvals(
+        self,
+        *,
+        now: datetime,
+        department: str | None,
+        limit: int,
+        after: tuple[datetime, int] | None = None,
+    ) -> list[Booking]:
+        # Soonest first, id as tiebreaker; returns up to limit + 1 rows
+        q = (
+            select(Booking)
+            .where(Booking.status == BookingStatus.pending, Booking.start_at > now)
+            .order_by(Booking.start_at, Booking.id)
+            .limit(limit + 1)
+        )
+        if department is not None:
+            # Semi-join, as for the site filter of search
+            q = q.where(Booking.user_id.in_(select(User.id).where(User.department == department)))
+        if after is not None:
+            q = q.where(tuple_(Booking.start_at, Booking.id) > after)
+        res = await self.session.execute(q)
+        return list(res.scalars().all())
+
+    async def approve_pending(self, ids: list[int], *, now: datetime, department: str | None) -> list[Booking]:
+        """Confirms the listed pending bookings that are still valid, in one UPDATE ... FROM ... RETURNING."""
+        # The whole batch is re-validated inside the statement: owner still active, resource still
+        # bookable, and no other active booking on the slot
+        other = aliased(Booking)
+        taken = exists().where(
+            other.resource_id == Booking.resource_id,
+            other.id != Booking.id,
+            other.status.in_(ACTIVE_STATUSES),
+            *_overlapping(Booking.start_at, Booking.end_at, other),
+        )
+        return await self._decide(
+            BookingStatus.confirmed,
+            *_pending_of(ids, now, department),
+            User.is_active.is_(True),
+            Resource.id == Booking.resource_id,
+            Resource.status == ResourceStatus.active,
+            Resource.is_deleted == false(),
+            ~taken,
+        )
+
+    async def reject_pending(self, ids: list[int], *, now: datetime, department: str | None) -> list[Booking]:
+        return await self._decide(BookingStatus.cancelled, *_pending_of(ids, now, department))
+
+    async def _decide(self, to_status: BookingStatus, *criteria) -> list[Booking]:
+        stmt = (
+            update(Booking)
+            .where(*criteria)
+            .values(status=to_status)
+            .returning(Booking)
+            .execution_options(populate_existing=True, synchronize_session=False)
+        )
+        res = await self.session.execute(stmt)
+        bookings = list(res.scalars().all())
+        await self._commit()
+        self._write_through(*bookings)
+        return bookings
+
+    async def list_decision_states(self, ids: list[int]) -> list[Row]:
+        """What approve_pending checks, per booking; only read to explain the bookings it left alone."""
+        q = (
+            select(
+                Booking.id,
+                Booking.status,
+                Booking.start_at,
+                User.department,
+                User.is_active.label("user_active"),
+                Resource.status.label("resource_status"),
+                Resource.is_deleted.label("resource_deleted"),
+            )
+            .join(User, User.id == Booking.user_id)
+            .join(Resource, Resource.id == Booking.resource_id)
+            .where(_id_in(ids))
+        )
+        res = await self.session.execute(q)
+        return list(res.all())
+
+    async def add_waitlist_entry(self, entry: WaitlistEntry) -> WaitlistEntry:
+        try:
+            return await self.uow.add(entry)
+        except IntegrityError as exc:
+            raise WaitlistDuplicateError() from exc
+
+    async def get_waitlist_entry(self, entry_id: int) -> WaitlistEntry | None:
+        res = await self.session.execute(select(WaitlistEntry).where(WaitlistEntry.id == entry_id))
+        return res.scalar_one_or_none()
+
+    async def list_waitlist_for_user(self, user_id: int) -> list[WaitlistEntry]:
+        q = (
+            select(WaitlistEntry)
+            .where(WaitlistEntry.user_id == user_id, WaitlistEntry.status == WaitlistStatus.waiting)
+            .order_by(WaitlistEntry.start_at, WaitlistEntry.id)
+        )
+        res = await self.session.execute(q)
+        return list(res.scalars().all())
+
+    async def leave_waitlist(self, entry_id: int, *, user_id: int, is_admin: bool) -> WaitlistEntry | None:
+        # Same shape as cancel: ownership and state in the WHERE clause
+        return await self.uow.update_returning(
+            WaitlistEntry,
+            WaitlistEntry.id == entry_id,
+            WaitlistEntry.status == WaitlistStatus.waiting,
+            or_(WaitlistEntry.user_id == user_id, literal(is_admin)),
+            status=WaitlistStatus.cancelled,
+        )
+
+    async def promotable_waitlist_slots(self, now: datetime, limit: int) -> list[tuple[int, datetime, datetime]]:
+        """(resource_id, start_at, end_at) of upcoming waiting entries whose slot is free right now."""
+        taken = exists().where(
+            and_(
+                Booking.resource_id == WaitlistEntry.resource_id,
+                Booking.status.in_(ACTIVE_STATUSES),
+                *_overlapping(WaitlistEntry.start_at, WaitlistEntry.end_at),
+            )
+        )
+        q = (
+            select(WaitlistEntry.resource_id, WaitlistEntry.start_at, WaitlistEntry.end_at)
+            .join(User, User.id == WaitlistEntry.user_id)
+            .join(Resource, Resource.id == WaitlistEntry.resource_id)
+            .where(
+                WaitlistEntry.status == WaitlistStatus.waiting,
+                WaitlistEntry.start_at > now,
+                *_eligible_waiter(),
+                ~taken,
+            )
+            .order_by(WaitlistEntry.start_at)
+            .limit(limit)
+        )
+        res = await self.session.execute(q)
+        return [tuple(row) for row in res]
+
+    async def promote_waitlist(
+        self, resource_id: int, start_at: datetime, end_at: datetime, *, now: datetime, limit: int
+    ) -> list[Booking]:
+        """Books the freed slot for its waiters, priority users first, then by request time; one transaction."""
+        # SKIP LOCKED: a concurrent promotion of the same slot moves on to other waiters
+        q = (
+            select(WaitlistEntry, User.role)
+            .join(User, User.id == WaitlistEntry.user_id)
+            .join(Resource, Resource.id == WaitlistEntry.resource_id)
+            .where(
+                WaitlistEntry.resource_id == resource_id,
+                WaitlistEntry.status == WaitlistStatus.waiting,
+                WaitlistEntry.start_at < end_at,
+                WaitlistEntry.end_at > start_at,
+                WaitlistEntry.start_at > now,
+                *_eligible_waiter(),
+            )
+            .order_by(
+                case((User.priority == UserPriority.priority, 0), else_=1),
+                WaitlistEntry.created_at,
+                WaitlistEntry.id,
+            )
+            .limit(limit)
+            .with_for_update(of=WaitlistEntry, skip_locked=True)
+        )
+        candidates = (await self.session.execute(q)).all()
+
+        promoted: list[Booking] = []
+        for entry, role in candidates:
+            booking = Booking(
+                resource_id=entry.resource_id,
+                user_id=entry.user_id,
+                start_at=entry.start_at,
+                end_at=entry.end_at,
+                # Same rule as a direct booking by this user
+                status=BookingStatus.confirmed if role.value in {"admin", "manager"} else BookingStatus.pending,
+                title=entry.title,
+                participants=entry.participants,
+                notes=entry.notes,
+                created_at=now,
+            )
+            try:
+                # A waiter whose slot is still partly taken (or was just given to a previous waiter) is skipped
+                async with self.session.begin_nested():
+                    self.session.add(booking)
+            except IntegrityError as exc:
+                if not _is_overlap_violation(exc):
+                    raise
+                continue
+            entry.status = WaitlistStatus.promoted
+            entry.booking_id = booking.id
+            entry.promoted_at = now
+            promoted.append(booking)
+        await self._commit()
+        self._write_through(*promoted)
+        return promoted
+
+    async def expire_waitlist(self, now: datetime) -> int:
+        res = await self.session.execute(
+            update(WaitlistEntry)
+            .where(WaitlistEntry.status == WaitlistStatus.waiting, WaitlistEntry.start_at <= now)
+            .values(status=WaitlistStatus.expired)
+            .execution_options(synchronize_session=False)
+        )
+        await self._commit()
+        return res.rowcount
+
+    def _write_through(self, *bookings: Booking) -> None:
+        if booking_index.enabled:
+            for booking in bookings:
+                booking_index.apply_booking(booking)
+
+    async def _commit(self) -> None:
+        try:
+            await self.uow.commit()
+        except IntegrityError as exc:
+            if _is_overlap_violation(exc):
+                raise BookingConflictError() from exc
+            raise
@@ -1,8 +1,27 @@
-from fastapi import APIRouter, Depends, Query
+from datetime import date, datetime
+
+from fastapi import APIRouter, Depends, Query, Response
 
 from app.core.db import AsyncSessionLocal
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.query_budget import route_budget
+from app.core.read_routing import get_read_session
 from app.core.security import CurrentUser, get_current_user
-from app.modules.bookings.schemas import BookingCreate, BookingResponse, BookingUpdate
+from app.modules.bookings.schemas import (
+    BookingBulkCreate,
+    BookingBulkResponse,
+    BookingCreate,
+    BookingDecisionRequest,
+    BookingDecisionResponse,
+    BookingResponse,
+    BookingSeriesCreate,
+    BookingSeriesResponse,
+    BookingStatus,
+    BookingUpdate,
+    OccurrenceResponse,
+    WaitlistCreate,
+    WaitlistResponse,
+)
 from app.modules.bookings.service import BookingService
 
 router = APIRouter(prefix="/bookings", tags=["Bookings"])
@@ -13,7 +32,39 @@ async def get_session():
         yield session
 
 
+@router.get("", response_model=list[BookingResponse])
+@route_budget(max_statements=1)
+async def search_bookings(
+    response: Response,
+    current: CurrentUser = Depends(get_current_user),
+    session=Depends(get_read_session),
+    resource_id: int | None = Query(default=None, ge=1),
+    user_id: int | None = Query(default=None, ge=1),
+    site: str | None = Query(default=None),
+    status: BookingStatus | None = Query(default=None),
+    from_at: datetime | None = Query(default=None, alias="from"),
+    to_at: datetime | None = Query(default=None, alias="to"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(default=None),
+):
+    bookings, next_cursor = await BookingService(session).search_bookings(
+        current,
+        limit=limit,
+        cursor=cursor,
+        user_id=user_id,
+        from_at=from_at,
+        to_at=to_at,
+        resource_id=resource_id,
+        site=site,
+        status_=status.value if status else None,
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return bookings
+
+
 @router.post("", response_model=BookingResponse, status_code=201)
+@route_budget(max_statements=7)
 async def create_booking(
     payload: BookingCreate,
     current: CurrentUser = Depends(get_current_user),
@@ -22,7 +73,129 @@ async def create_booking(
     return await BookingService(session).create_booking(current, payload)
 
 
+@router.post("/bulk", response_model=BookingBulkResponse)
+@route_budget(max_statements=4)
+async def create_bookings_bulk(
+    payload: BookingBulkCreate,
+    current: CurrentUser = Depends(get_current_user),
+    session=Depends(get_session),
+):
+    return await BookingService(session).create_bookings_bulk(current, payload)
+
+
+@router.post("/series", response_model=BookingSeriesResponse, status_code=201)
+@route_budget(max_statements=5)
+async def create_series(
+    payload: BookingSeriesCreate,
+    current: CurrentUser = Depends(get_current_user),
+    session=Depends(get_session),
+):
+    return await BookingService(session).create_series(current, payload)
+
+
+@router.get("/series/{series_id}/occurrences", response_model=list[OccurrenceResponse])
+@route_budget(max_statements=2)
+async def list_occurrences(
+    series_id: int,
+    from_at: datetime = Query(..., alias="from"),
+    to_at: datetime = Query(..., alias="to"),
+    current: CurrentUser = Depends(get_current_user),
+    session=Depends(get_read_session),
+):
+    return await BookingService(session).list_occurrences(current, series_id, from_at, to_at)
+
+
+@router.post("/series/{series_id}/occurrences/{occurrence_date}/cancel", response_model=BookingSeriesResponse)
+@route_budget(max_statements=3)
+async def cancel_occurrence(
+    series_id: int,
+    occurrence_date: date,
+    current: CurrentUser = Depends(get_current_user),
+    session=Depends(get_session),
+):
+    return await BookingService(session).cancel_occurrence(current, series_id, occurrence_date)
+
+
+@router.post("/series/{series_id}/cancel", response_model=BookingSeriesResponse)
+@route_budget(max_statements=3)
+async def cancel_series(
+    series_id: int,
+    current: CurrentUser = Depends(get_current_user),
+    session=Depends(get_session),
+):
+    return await BookingService(session).cancel_series(current, series_id)
+
+
+@router.post("/waitlist", response_model=WaitlistResponse, status_code=201)
+@route_budget(max_statements=4)
+async def join_waitlist(
+    payload: WaitlistCreate,
+    current: CurrentUser = Depends(get_current_user),
+    session=Depends(get_session),
+):
+    return await BookingService(session).join_waitlist(current, payload)
+
+
+@router.get("/waitlist", response_model=list[WaitlistResponse])
+@route_budget(max_statements=1)
+async def list_waitlist(
+    user_id: int | None = Query(default=None, ge=1),
+    current: CurrentUser = Depends(get_current_user),
+    session=Depends(get_read_session),
+):
+    return await BookingService(session).list_waitlist(current, user_id)
+
+
+@router.post("/waitlist/{entry_id}/cancel", response_model=WaitlistResponse)
+@route_budget(max_statements=2)
+async def leave_waitlist(
+    entry_id: int,
+    current: CurrentUser = Depends(get_current_user),
+    session=Depends(get_session),
+):
+    return await BookingService(session).leave_waitlist(current, entry_id)
+
+
+@router.get("/approvals", response_model=list[BookingResponse])
+@route_budget(max_statements=2)
+async def list_approvals(
+    response: Response,
+    department: str | None = Query(default=None),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(default=None),
+    current: CurrentUser = Depends(get_current_user),
+    session=Depends(get_read_session),
+):
+    bookings, next_cursor = await BookingService(session).list_approvals(
+        current, department=department, limit=limit, cursor=cursor
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return bookings
+
+
+@router.post("/approve", response_model=BookingDecisionResponse)
+@route_budget(max_statements=3)
+async def approve_bookings(
+    payload: BookingDecisionRequest,
+    current: CurrentUser = Depends(get_current_user),
+    session=Depends(get_session),
+):
+    return await BookingService(session).approve_bookings(current, payload)
+
+
+@router.post("/reject", response_model=BookingDecisionResponse)
+@route_budget(max_statements=3)
+async def reject_bookings(
+    payload: BookingDecisionRequest,
+    current: CurrentUser = Depends(get_current_user),
+    session=Depends(get_session),
+):
+    return await BookingService(session).reject_bookings(current, payload)
+
+
 @router.patch("/{booking_id}", response_model=BookingResponse)
+@route_budget(max_statements=2)
 async def update_booking(
     booking_id: int,
     payload: BookingUpdate,
@@ -33,6 +206,7 @@ async def update_booking(
 
 
 @router.post("/{booking_id}/cancel", response_model=BookingResponse)
+@route_budget(max_statements=2)
 async def cancel_booking(
     booking_id: int,
     current: CurrentUser = Depends(get_current_user),
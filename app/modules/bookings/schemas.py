@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from enum import Enum
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class BookingStatus(str, Enum):
+    pending = "pending"
+    confirmed = "confirmed"
+    cancelled = "cancelled"
+    completed = "completed"
+    no_show = "no-show"
+
+
+class BookingCreate(BaseModel):
+    resource_id: int = Field(ge=1)
+    user_id: int = Field(ge=1)
+    start_at: datetime
+    end_at: datetime
+
+    title: str = Field(min_length=2, max_length=200)
+    participants: int = Field(ge=1, le=500)
+    notes: str = Field(default="", max_length=1000)
+
+
+class BookingUpdate(BaseModel):
+    start_at: datetime | None = None
+    end_at: datetime | None = None
+    title: str | None = Field(default=None, min_length=2, max_length=200)
+    participants: int | None = Field(default=None, ge=1, le=500)
+    notes: str | None = Field(default=None, max_length=1000)
+
+
+class BookingResponse(BaseModel):
+    id: int
+    resource_id: int
+    user_id: int
+    start_at: datetime
+    end_at: datetime
+    status: BookingStatus
+    title: str
+    participants: int
+    notes: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class FreeSlot(BaseModel):
+    start_at: datetime
+    end_at: datetime
+
+
+class AvailabilityResponse(BaseModel):
+    resource_id: int
+    from_at: datetime
+    to_at: datetime
+    step_minutes: int
+    free_slots: list[FreeSlot]
+
+
+class BulkMode(str, Enum):
+    atomic = "atomic"
+    partial = "partial"
+
+
+class BookingBulkCreate(BaseModel):
+    items: list[BookingCreate] = Field(min_length=1, max_length=500)
+    # atomic: nothing is created if one item fails, partial: valid items are created
+    mode: BulkMode = BulkMode.atomic
+
+
+class BookingBulkItemResult(BaseModel):
+    index: int
+    status: str  # "created", "failed" or "skipped"
+    booking: BookingResponse | None = None
+    error_code: str | None = None
+    message: str | None = None
+
+
+class BookingBulkResponse(BaseModel):
+    mode: BulkMode
+    created: int
+    failed: int
+    results: list[BookingBulkItemResult]
+
+
+class SeriesFrequency(str, Enum):
+    daily = "daily"
+    weekly = "weekly"
+
+
+class BookingSeriesCreate(BookingCreate):
+    # start_at / end_at describe the first occurrence
+    frequency: SeriesFrequency
+    interval: int = Field(default=1, ge=1, le=52)
+    until: date | None = None
+    count: int | None = Field(default=None, ge=1, le=366)
+    exceptions: list[date] = Field(default_factory=list)
+
+    @model_validator(mode="after")
+    def require_bound(self) -> "BookingSeriesCreate":
+        if self.until is None and self.count is None:
+            raise ValueError("A series needs an until date or a count.")
+        return self
+
+
+class BookingSeriesResponse(BaseModel):
+    id: int
+    resource_id: int
+    user_id: int
+    start_at: datetime
+    end_at: datetime
+    frequency: SeriesFrequency
+    interval: int
+    until: date | None
+    count: int | None
+    exceptions: list[date]
+    status: BookingStatus
+    title: str
+    participants: int
+    notes: str
+    is_cancelled: bool
+    materialized_until: datetime
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class OccurrenceResponse(BaseModel):
+    series_id: int
+    start_at: datetime
+    end_at: datetime
+    # Set once the occurrence is materialized as a booking row
+    booking_id: int | None = None
+    status: BookingStatus | None = None
+
+
+class WaitlistStatus(str, Enum):
+    waiting = "waiting"
+    promoted = "promoted"
+    cancelled = "cancelled"
+    expired = "expired"
+
+
+class WaitlistCreate(BookingCreate):
+    # Same request as a booking, for a slot that is currently taken
+    pass
+
+
+class WaitlistResponse(BaseModel):
+    id: int
+    resource_id: int
+    user_id: int
+    start_at: datetime
+    end_at: datetime
+    status: WaitlistStatus
+    title: str
+    participants: int
+    notes: str
+    # Set once promoted
+    booking_id: int | None
+    created_at: datetime
+    promoted_at: datetime | None
+
+    class Config:
+        from_attributes = True
+
+
+class BookingDecisionRequest(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=500)
+
+
+class BookingDecisionFailure(BaseModel):
+    booking_id: int
+    error_code: str
+    message: str
+
+
+class BookingDecisionResponse(BaseModel):
+    updated: int
+    failed: int
+    # Bookings approved or rejected by this request, the other ids are in failures
+    bookings: list[BookingResponse]
+    failures: list[BookingDecisionFailure]
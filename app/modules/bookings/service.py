@@ -1,21 +1,73 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from itertools import islice
 
 from fastapi import HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.core.pagination import decode_cursor, keyset_page
 from app.core.security import CurrentUser
-from app.modules.bookings.models import Booking, BookingStatus
-from app.modules.bookings.repository import BookingRepository
-from app.modules.bookings.schemas import BookingCreate, BookingUpdate
-from app.modules.resources.models import ResourceStatus
+from app.modules.bookings.models import (
+    MAX_BOOKING_SPAN,
+    Booking,
+    BookingSeries,
+    BookingStatus,
+    SeriesFrequency,
+    WaitlistEntry,
+)
+from app.modules.bookings.repository import BookingConflictError, BookingRepository, WaitlistDuplicateError
+from app.modules.bookings.schemas import (
+    AvailabilityResponse,
+    BookingBulkCreate,
+    BookingBulkItemResult,
+    BookingBulkResponse,
+    BookingCreate,
+    BookingDecisionFailure,
+    BookingDecisionRequest,
+    BookingDecisionResponse,
+    BookingResponse,
+    BookingSeriesCreate,
+    BookingUpdate,
+    BulkMode,
+    FreeSlot,
+    OccurrenceResponse,
+    WaitlistCreate,
+)
+from app.modules.bookings.waitlist import waitlist_worker
+from app.modules.resources.models import Resource, ResourceStatus, ResourceType
+from app.modules.resources.cache import cached_resource
 from app.modules.resources.repository import ResourceRepository
+from app.modules.users.models import User
+from app.modules.users.cache import cached_user
 from app.modules.users.repository import UserRepository
-from app.utils.time_slots import minutes_between, now_utc, round_to_step, to_utc
-
-
-def _not_found(kind: str, id_: int) -> HTTPException:
+from app.utils.ical import calendar_footer, calendar_header, vevent
+from app.utils.recurrence import iter_occurrences, recurrence_step
+from app.utils.time_slots import (
+    free_intervals,
+    minutes_between,
+    nearest_slots,
+    now_utc,
+    round_to_step,
+    to_utc,
+)
+
+# Availability is meant for a day or a week view
+MAX_AVAILABILITY_WINDOW = timedelta(days=14)
+
+# Alternatives returned with a BOOKING_CONFLICT
+SUGGESTION_LIMIT = 3
+SUGGESTION_SEARCH_WINDOW = timedelta(days=1)
+# Gaps shorter than the minimum duration cannot be booked by anyone
+MIN_GAP = timedelta(minutes=30)
+
+MAX_SERIES_OCCURRENCES = 366
+MAX_OCCURRENCES_WINDOW = timedelta(days=366)
+
+
+def _not_found(kind: str, id_: int | date) -> HTTPException:
     return HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
         detail={"error_code": f"{kind.upper()}_NOT_FOUND", "message": f"{kind} {id_} not found."},
@@ -33,13 +85,171 @@ def _bad_request(code: str, msg: str) -> HTTPException:
     return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail={"error_code": code, "message": msg})
 
 
-def _conflict(msg: str) -> HTTPException:
+def _conflict(msg: str, **extra: object) -> HTTPException:
+    # extra keys (suggestions, conflicting dates...) are added to the error body
     return HTTPException(
         status_code=status.HTTP_409_CONFLICT,
-        detail={"error_code": "BOOKING_CONFLICT", "message": msg},
+        detail={"error_code": "BOOKING_CONFLICT", "message": msg, **extra},
+    )
+
+
+def _slot_dict(resource_id: int, start_at: datetime, end_at: datetime) -> dict:
+    return {"resource_id": resource_id, "start_at": start_at.isoformat(), "end_at": end_at.isoformat()}
+
+
+def _validate_slot(current: CurrentUser, start: datetime, end: datetime) -> tuple[datetime, datetime]:
+    start_at = round_to_step(start, 15)
+    end_at = round_to_step(end, 15)
+
+    if end_at <= start_at:
+        raise _bad_request("INVALID_TIME_SLOT", "end_at must be after start_at.")
+
+    minutes = minutes_between(start_at, end_at)
+    if minutes < 30:
+        raise _bad_request("DURATION_TOO_SHORT", "Minimum duration is 30 minutes.")
+    if end_at - start_at > MAX_BOOKING_SPAN:
+        raise _bad_request("DURATION_TOO_LONG", "Maximum duration is 8 hours.")
+
+    # No booking in the past (except admin)
+    if current.role != "admin" and start_at < now_utc():
+        raise _bad_request("PAST_BOOKING_NOT_ALLOWED", "Booking in the past is not allowed.")
+    return start_at, end_at
+
+
+def _validate_new_booking(
+    current: CurrentUser, payload: BookingCreate, user: User | None, resource: Resource | None
+) -> tuple[datetime, datetime]:
+    # Business rules for a new booking, returns the rounded slot
+    if not user:
+        raise _not_found("user", payload.user_id)
+    if not user.is_active:
+        raise _bad_request("USER_DISABLED", "This user account is disabled.")
+
+    # Employee can only create for self (simple rule)
+    if current.role == "employee" and current.user_id != payload.user_id:
+        raise _forbidden()
+
+    if not resource:
+        raise _not_found("resource", payload.resource_id)
+    if resource.status in {ResourceStatus.maintenance, ResourceStatus.out_of_service}:
+        raise _bad_request("RESOURCE_NOT_BOOKABLE", "Resource is not available for booking.")
+
+    start_at, end_at = _validate_slot(current, payload.start_at, payload.end_at)
+
+    # Check user permission for resource type
+    if resource.type.value not in user.allowed_resource_types and current.role != "admin":
+        raise _forbidden()
+
+    # Capacity rule for rooms
+    if resource.type.value == "room" and resource.capacity_max is not None:
+        if payload.participants > resource.capacity_max:
+            raise _bad_request("CAPACITY_EXCEEDED", "Participants exceed room capacity.")
+    return start_at, end_at
+
+
+def _bulk_failure(index: int, code: str, msg: str) -> BookingBulkItemResult:
+    return BookingBulkItemResult(index=index, status="failed", error_code=code, message=msg)
+
+
+def _booking_row(
+    booking_like: BookingCreate | BookingSeries,
+    start_at: datetime, end_at: datetime,
+    status_: BookingStatus,
+    created_at: datetime,
+) -> dict:
+    # Column values for a multi-row INSERT, from a payload or a series
+    return {
+        "resource_id": booking_like.resource_id,
+        "user_id": booking_like.user_id,
+        "start_at": to_utc(start_at),
+        "end_at": to_utc(end_at),
+        "status": status_,
+        "title": booking_like.title,
+        "participants": booking_like.participants,
+        "notes": booking_like.notes,
+        "created_at": created_at,
+    }
+
+
+def _series_occurrences(series: BookingSeries, **window: datetime | None):
+    return iter_occurrences(
+        series.start_at,
+        series.end_at,
+        step=recurrence_step(series.frequency.value, series.interval),
+        until=series.until,
+        count=series.count,
+        exceptions=set(series.exceptions),
+        **window,
     )
 
 
+def _day_bounds(day: date) -> tuple[datetime, datetime]:
+    start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+    return start, start + timedelta(days=1)
+
+
+def _decision_failure(
+    booking_id: int, state, *, department: str | None, now: datetime, approving: bool
+) -> BookingDecisionFailure:
+    # Why approve_pending / reject_pending left a booking alone, checked in the same order as their WHERE clause
+    if state is None:
+        code, msg = "BOOKING_NOT_FOUND", f"booking {booking_id} not found."
+    elif department is not None and state.department != department:
+        code, msg = "INSUFFICIENT_PERMISSIONS", "Forbidden."
+    elif state.status != BookingStatus.pending:
+        code, msg = "BOOKING_NOT_PENDING", f"This booking is already {state.status.value}."
+    elif state.start_at <= now:
+        code, msg = "BOOKING_STARTED", "This booking has already started."
+    elif approving and not state.user_active:
+        code, msg = "USER_DISABLED", "This user account is disabled."
+    elif approving and (state.resource_deleted or state.resource_status != ResourceStatus.active):
+        code, msg = "RESOURCE_NOT_BOOKABLE", "Resource is not available for booking."
+    elif approving:
+        code, msg = "BOOKING_CONFLICT", "This resource is already booked for this time slot."
+    else:
+        code, msg = "BOOKING_CHANGED", "This booking changed during the request, please retry."
+    return BookingDecisionFailure(booking_id=booking_id, error_code=code, message=msg)
+
+
+def _initial_status(current: CurrentUser) -> BookingStatus:
+    return BookingStatus.confirmed if current.role in {"admin", "manager"} else BookingStatus.pending
+
+
+@dataclass(frozen=True)
+class CalendarFeed:
+    name: str
+    etag: str
+    last_modified: datetime | None
+    resource_id: int | None = None
+    user_id: int | None = None
+
+
+def _feed(name: str, last_change: datetime | None, kind: str, owner_id: int, **owner: int) -> CalendarFeed:
+    # The latest booking change identifies the feed content
+    version = int(last_change.timestamp() * 1_000_000) if last_change else 0
+    return CalendarFeed(name=name, etag=f'"{kind}{owner_id}-{version}"', last_modified=last_change, **owner)
+
+
+async def stream_calendar(feed: CalendarFeed, session_maker: async_sessionmaker) -> AsyncIterator[str]:
+    """iCalendar body, one VEVENT per booking, read through a server-side cursor."""
+    yield calendar_header(feed.name)
+    # The request session may be closed before streaming ends, so the body gets its own session, from the
+    # same database as the ETag (see read_session_maker): a replica body must not carry a primary ETag
+    async with session_maker() as session:
+        rows = BookingRepository(session).stream_feed(resource_id=feed.resource_id, user_id=feed.user_id)
+        async for row in rows:
+            yield vevent(
+                uid=f"booking-{row.id}@project-reservation",
+                start_at=row.start_at,
+                end_at=row.end_at,
+                summary=row.title,
+                description=row.notes,
+                status=row.status.value,
+                last_modified=row.updated_at,
+            )
+    yield calendar_footer()
+
+
 class BookingService:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
@@ -48,65 +258,380 @@ class BookingService:
         self.users = UserRepository(session)
 
     async def create_booking(self, current: CurrentUser, payload: BookingCreate) -> Booking:
-        user = await self.users.get_by_id(payload.user_id)
-        if not user:
-            raise _not_found("user", payload.user_id)
-        if not user.is_active:
-            raise _bad_request("USER_DISABLED", "This user account is disabled.")
-
-        # Employee can only create for self (simple rule)
-        if current.role == "employee" and current.user_id != payload.user_id:
-            raise _forbidden()
-
-        resource = await self.resources.get_by_id(payload.resource_id)
-        if not resource:
-            raise _not_found("resource", payload.resource_id)
-        if resource.status in {ResourceStatus.maintenance, ResourceStatus.out_of_service}:
-            raise _bad_request("RESOURCE_NOT_BOOKABLE", "Resource is not available for booking.")
-
-        start_at = round_to_step(payload.start_at, 15)
-        end_at = round_to_step(payload.end_at, 15)
-
-        if end_at <= start_at:
-            raise _bad_request("INVALID_TIME_SLOT", "end_at must be after start_at.")
-
-        minutes = minutes_between(start_at, end_at)
-        if minutes < 30:
-            raise _bad_request("DURATION_TOO_SHORT", "Minimum duration is 30 minutes.")
-        if minutes > 8 * 60:
-            raise _bad_request("DURATION_TOO_LONG", "Maximum duration is 8 hours.")
-
-        # No booking in the past (except admin)
-        if current.role != "admin" and start_at < now_utc():
-            raise _bad_request("PAST_BOOKING_NOT_ALLOWED", "Booking in the past is not allowed.")
+        user = await cached_user(self.users, payload.user_id)
+        resource = await cached_resource(self.resources, payload.resource_id)
+        start_at, end_at = _validate_new_booking(current, payload, user, resource)
 
-        # Check user permission for resource type
-        if resource.type.value not in user.allowed_resource_types and current.role != "admin":
+        booking = Booking(
+            resource_id=resource.id,
+            user_id=user.id,
+            start_at=to_utc(start_at),
+            end_at=to_utc(end_at),
+            status=_initial_status(current),
+            title=payload.title,
+            participants=payload.participants,
+            notes=payload.notes,
+            created_at=datetime.now(timezone.utc),
+        )
+        # Rollback expires ORM objects, keep what the suggestions need
+        reference = {
+            "resource_id": resource.id,
+            "type_": resource.type,
+            "site": resource.site,
+            "features": list(resource.features),
+            "open_time": resource.open_time,
+            "close_time": resource.close_time,
+        }
+        # Conflict detection is enforced by the ex_bookings_no_overlap constraint: no pre-check, the
+        # interval index could only answer "free", which the INSERT finds out just as fast
+        try:
+            return await self.bookings.create(booking)
+        except BookingConflictError:
+            suggestions = await self._suggest_alternatives(
+                **reference,
+                start_at=start_at,
+                end_at=end_at,
+                participants=payload.participants,
+                allow_past=current.role == "admin",
+            )
+            raise _conflict("This resource is already booked for this time slot.", suggestions=suggestions)
+
+    async def resource_calendar(self, current: CurrentUser, resource_id: int) -> CalendarFeed:
+        owner = await self.bookings.feed_owner(resource_id=resource_id)
+        if owner is None:
+            raise _not_found("resource", resource_id)
+        return _feed(owner[0], owner[1], "r", resource_id, resource_id=resource_id)
+
+    async def user_calendar(self, current: CurrentUser, user_id: int) -> CalendarFeed:
+        if current.role == "employee" and current.user_id != user_id:
             raise _forbidden()
+        owner = await self.bookings.feed_owner(user_id=user_id)
+        if owner is None:
+            raise _not_found("user", user_id)
+        return _feed(owner[0], owner[1], "u", user_id, user_id=user_id)
+
+    async def search_bookings(
+        self,
+        current: CurrentUser,
+        *,
+        limit: int,
+        cursor: str | None,
+        user_id: int | None,
+        from_at: datetime | None,
+        to_at: datetime | None,
+        status_: str | None = None,
+        **filters,
+    ) -> tuple[list[Booking], str | None]:
+        # Employees only ever see their own bookings
+        if current.role == "employee":
+            if user_id is not None and user_id != current.user_id:
+                raise _forbidden()
+            user_id = current.user_id
+        if from_at is not None and to_at is not None and to_at <= from_at:
+            raise _bad_request("INVALID_TIME_WINDOW", "to must be after from.")
+
+        after = None
+        if cursor:
+            start_at, booking_id = decode_cursor(cursor, "start", (datetime.fromisoformat, int))
+            after = (start_at, booking_id)
+        rows = await self.bookings.search(
+            limit=limit,
+            user_id=user_id,
+            start_at=to_utc(from_at) if from_at else None,
+            end_at=to_utc(to_at) if to_at else None,
+            status=BookingStatus(status_) if status_ else None,
+            after=after,
+            **filters,
+        )
+        return keyset_page(rows, limit, "start", lambda b: [b.start_at.isoformat(), b.id])
+
+    async def create_bookings_bulk(self, current: CurrentUser, payload: BookingBulkCreate) -> BookingBulkResponse:
+        items = payload.items
+        # One query per referenced table instead of one per item
+        users = await self.users.get_many({i.user_id for i in items})
+        resources = await self.resources.get_many({i.resource_id for i in items})
+
+        results: dict[int, BookingBulkItemResult] = {}
+        slots: dict[int, tuple[int, datetime, datetime]] = {}
+        for index, item in enumerate(items):
+            try:
+                start_at, end_at = _validate_new_booking(
+                    current, item, users.get(item.user_id), resources.get(item.resource_id)
+                )
+            except HTTPException as exc:
+                results[index] = _bulk_failure(index, exc.detail["error_code"], exc.detail["message"])
+                continue
+            slots[index] = (item.resource_id, start_at, end_at)
+
+        # Overlaps inside the batch: sort by (resource, start) and sweep once
+        last_end: dict[int, datetime] = {}
+        for index, (resource_id, start_at, end_at) in sorted(slots.items(), key=lambda kv: (kv[1][0], kv[1][1])):
+            if resource_id in last_end and start_at < last_end[resource_id]:
+                results[index] = _bulk_failure(index, "BOOKING_CONFLICT", "Overlaps another item of this batch.")
+                continue
+            last_end[resource_id] = end_at
+        slots = {i: slot for i, slot in slots.items() if i not in results}
+
+        # Overlaps with existing bookings: one query for the whole batch
+        taken = await self.bookings.find_conflicting_slots([(i, *slot) for i, slot in slots.items()])
+        for index in taken:
+            results[index] = _bulk_failure(
+                index, "BOOKING_CONFLICT", "This resource is already booked for this time slot."
+            )
+            del slots[index]
+
+        if payload.mode == BulkMode.atomic and results:
+            for index in slots:
+                results[index] = BookingBulkItemResult(index=index, status="skipped")
+            slots = {}
+
+        created_at = datetime.now(timezone.utc)
+        status_init = _initial_status(current)
+        rows = [
+            _booking_row(items[index], start_at, end_at, status_init, created_at)
+            for index, (_, start_at, end_at) in slots.items()
+        ]
+        try:
+            created = await self.bookings.create_many(rows)
+        except BookingConflictError:
+            # A concurrent booking won the race between the check and the insert
+            raise _conflict("A slot of this batch was booked concurrently, please retry.")
+
+        for index, booking in zip(slots, created):
+            results[index] = BookingBulkItemResult(
+                index=index, status="created", booking=BookingResponse.model_validate(booking)
+            )
+
+        ordered = [results[i] for i in range(len(items))]
+        return BookingBulkResponse(
+            mode=payload.mode,
+            created=len(created),
+            failed=sum(1 for r in ordered if r.status == "failed"),
+            results=ordered,
+        )
 
-        # Capacity rule for rooms
-        if resource.type.value == "room" and resource.capacity_max is not None:
-            if payload.participants > resource.capacity_max:
-                raise _bad_request("CAPACITY_EXCEEDED", "Participants exceed room capacity.")
-
-        # Conflict detection
-        if await self.bookings.has_conflict(resource_id=resource.id, start_at=start_at, end_at=end_at):
-            raise _conflict("This resource is already booked for this time slot.")
-
-        status_init = BookingStatus.confirmed if current.role in {"admin", "manager"} else BookingStatus.pending
-
-        booking = Booking(
+    async def create_series(self, current: CurrentUser, payload: BookingSeriesCreate) -> BookingSeries:
+        user = await cached_user(self.users, payload.user_id)
+        resource = await cached_resource(self.resources, payload.resource_id)
+        start_at, end_at = _validate_new_booking(current, payload, user, resource)
+
+        step = recurrence_step(payload.frequency.value, payload.interval)
+        occurrences = list(
+            islice(
+                iter_occurrences(
+                    start_at,
+                    end_at,
+                    step=step,
+                    until=payload.until,
+                    count=payload.count,
+                    exceptions=set(payload.exceptions),
+                ),
+                MAX_SERIES_OCCURRENCES + 1,
+            )
+        )
+        if not occurrences:
+            raise _bad_request("EMPTY_SERIES", "This series has no occurrence.")
+        if len(occurrences) > MAX_SERIES_OCCURRENCES:
+            raise _bad_request("SERIES_TOO_LONG", f"A series is limited to {MAX_SERIES_OCCURRENCES} occurrences.")
+
+        # The whole occurrence set is checked with one query
+        taken = await self.bookings.find_conflicting_slots(
+            [(k, resource.id, s, e) for k, (s, e) in enumerate(occurrences)]
+        )
+        if taken:
+            raise _conflict(
+                "Some occurrences overlap existing bookings.",
+                conflicting_dates=sorted(occurrences[k][0].date().isoformat() for k in taken),
+            )
+
+        created_at = datetime.now(timezone.utc)
+        status_init = _initial_status(current)
+        series = BookingSeries(
             resource_id=resource.id,
             user_id=user.id,
             start_at=to_utc(start_at),
             end_at=to_utc(end_at),
+            frequency=SeriesFrequency(payload.frequency.value),
+            interval=payload.interval,
+            until=payload.until,
+            count=payload.count,
+            exceptions=sorted(set(payload.exceptions)),
             status=status_init,
             title=payload.title,
             participants=payload.participants,
             notes=payload.notes,
-            created_at=datetime.now(timezone.utc),
+            # Every occurrence is reserved now, the slots were only checked free for this request
+            materialized_until=occurrences[-1][1],
+            created_at=created_at,
+        )
+        rows = [_booking_row(payload, s, e, status_init, created_at) for s, e in occurrences]
+        try:
+            await self.bookings.create_series(series, rows)
+        except BookingConflictError:
+            raise _conflict("An occurrence of this series was booked concurrently, please retry.")
+        return series
+
+    async def list_occurrences(
+        self, current: CurrentUser, series_id: int, from_at: datetime, to_at: datetime
+    ) -> list[OccurrenceResponse]:
+        series = await self._get_own_series(current, series_id)
+        from_at, to_at = to_utc(from_at), to_utc(to_at)
+        if to_at <= from_at or to_at - from_at > MAX_OCCURRENCES_WINDOW:
+            raise _bad_request("INVALID_TIME_WINDOW", "Window must be positive and at most one year.")
+
+        materialized = {
+            b.start_at: b for b in await self.bookings.list_series_bookings(series.id, from_at, to_at)
+        }
+        result: list[OccurrenceResponse] = []
+        for start_at, end_at in _series_occurrences(series, window_start=from_at, window_end=to_at):
+            booking = materialized.get(start_at)
+            result.append(
+                OccurrenceResponse(
+                    series_id=series.id,
+                    start_at=booking.start_at if booking else start_at,
+                    end_at=booking.end_at if booking else end_at,
+                    booking_id=booking.id if booking else None,
+                    status=booking.status if booking else (None if series.is_cancelled else series.status),
+                )
+            )
+        return result
+
+    async def cancel_occurrence(self, current: CurrentUser, series_id: int, occurrence_date: date) -> BookingSeries:
+        # Only this occurrence: add an exception and cancel its booking row if materialized
+        series = await self._get_own_series(current, series_id)
+        day_start, day_end = _day_bounds(occurrence_date)
+        # Already cancelled occurrences still count, so cancelling twice is a no-op rather than a 404
+        scheduled = iter_occurrences(
+            series.start_at,
+            series.end_at,
+            step=recurrence_step(series.frequency.value, series.interval),
+            until=series.until,
+            count=series.count,
+            window_start=day_start,
+            window_end=day_end,
+        )
+        if not any(start_at.date() == occurrence_date for start_at, _ in scheduled):
+            raise _not_found("occurrence", occurrence_date)
+        if occurrence_date not in series.exceptions:
+            series.exceptions = sorted([*series.exceptions, occurrence_date])
+        await self.bookings.cancel_series_bookings(series.id, day_start, day_end)
+        return await self.bookings.save_series(series)
+
+    async def cancel_series(self, current: CurrentUser, series_id: int) -> BookingSeries:
+        # Past occurrences are kept, future ones are released
+        series = await self._get_own_series(current, series_id)
+        series.is_cancelled = True
+        await self.bookings.cancel_series_bookings(series.id, now_utc())
+        return await self.bookings.save_series(series)
+
+    async def materialize_due_series(self, horizon_end: datetime) -> int:
+        """Extend open series created before they were reserved in full; returns the number of rows created."""
+        due = await self.bookings.list_series_to_materialize(horizon_end)
+        slots: list[tuple[int, int, datetime, datetime]] = []
+        owners: list[BookingSeries] = []
+        for series in due:
+            for start_at, end_at in _series_occurrences(
+                series, window_start=series.materialized_until, window_end=horizon_end
+            ):
+                # Occurrences straddling the previous horizon were already materialized
+                if start_at >= series.materialized_until:
+                    slots.append((len(slots), series.resource_id, start_at, end_at))
+                    owners.append(series)
+
+        # Slots taken since the series was created become exceptions
+        taken = await self.bookings.find_conflicting_slots(slots)
+        rows = []
+        for key, _, start_at, end_at in slots:
+            series = owners[key]
+            if key in taken:
+                series.exceptions = sorted({*series.exceptions, start_at.date()})
+                continue
+            row = _booking_row(series, start_at, end_at, series.status, datetime.now(timezone.utc))
+            rows.append({**row, "series_id": series.id})
+        for series in due:
+            series.materialized_until = horizon_end
+        created = await self.bookings.create_many(rows)
+        return len(created)
+
+    async def _get_own_series(self, current: CurrentUser, series_id: int) -> BookingSeries:
+        series = await self.bookings.get_series(series_id)
+        if not series:
+            raise _not_found("series", series_id)
+        if current.role != "admin" and current.user_id != series.user_id:
+            raise _forbidden()
+        return series
+
+    async def _suggest_alternatives(
+        self,
+        *,
+        resource_id: int,
+        type_: ResourceType,
+        site: str,
+        features: list[str],
+        open_time: time | None,
+        close_time: time | None,
+        start_at: datetime,
+        end_at: datetime,
+        participants: int,
+        allow_past: bool,
+    ) -> dict:
+        # Two set-based queries: busy intervals around the slot, then free look-alike resources
+        duration = end_at - start_at
+        window_start = start_at - SUGGESTION_SEARCH_WINDOW
+        if not allow_past:
+            window_start = max(window_start, round_to_step(now_utc(), 15) + timedelta(minutes=15))
+        window_end = end_at + SUGGESTION_SEARCH_WINDOW
+
+        busy = await self.bookings.list_active_intervals(
+            resource_id=resource_id, start_at=window_start, end_at=window_end
+        )
+        free = free_intervals(window_start, window_end, busy, open_time=open_time, close_time=close_time)
+        same_resource = nearest_slots(free, duration, start_at, limit=SUGGESTION_LIMIT, min_gap=MIN_GAP)
+
+        others: list[Resource] = await self.resources.list_free_alternatives(
+            exclude_id=resource_id,
+            type_=type_,
+            site=site,
+            features=features,
+            start_at=start_at,
+            end_at=end_at,
+            participants=participants,
+            limit=SUGGESTION_LIMIT,
+        )
+        return {
+            "same_resource": [_slot_dict(resource_id, s, e) for s, e in same_resource],
+            "other_resources": [_slot_dict(r.id, start_at, end_at) for r in others],
+        }
+
+    async def get_availability(
+        self, current: CurrentUser, resource_id: int, from_at: datetime, to_at: datetime, step_minutes: int
+    ) -> AvailabilityResponse:
+        resource = await cached_resource(self.resources, resource_id)
+        if not resource:
+            raise _not_found("resource", resource_id)
+
+        from_at, to_at = to_utc(from_at), to_utc(to_at)
+        if to_at <= from_at:
+            raise _bad_request("INVALID_TIME_WINDOW", "to must be after from.")
+        if to_at - from_at > MAX_AVAILABILITY_WINDOW:
+            raise _bad_request("INVALID_TIME_WINDOW", "Availability window is limited to 14 days.")
+
+        busy = await self.bookings.list_active_intervals(resource_id=resource.id, start_at=from_at, end_at=to_at)
+        free = free_intervals(
+            from_at,
+            to_at,
+            busy,
+            open_time=resource.open_time,
+            close_time=resource.close_time,
+            step_minutes=step_minutes,
+        )
+        return AvailabilityResponse(
+            resource_id=resource.id,
+            from_at=from_at,
+            to_at=to_at,
+            step_minutes=step_minutes,
+            free_slots=[FreeSlot(start_at=s, end_at=e) for s, e in free],
         )
-        return await self.bookings.create(booking)
 
     async def update_booking(self, current: CurrentUser, booking_id: int, payload: BookingUpdate) -> Booking:
         booking = await self.bookings.get_by_id(booking_id)
@@ -123,31 +648,14 @@ class BookingService:
         end_at = booking.end_at
 
         if "start_at" in data:
-            start_at = round_to_step(data["start_at"], 15)
+            start_at = data["start_at"]
         if "end_at" in data:
-            end_at = round_to_step(data["end_at"], 15)
-
-        if end_at <= start_at:
-            raise _bad_request("INVALID_TIME_SLOT", "end_at must be after start_at.")
-
-        minutes = minutes_between(start_at, end_at)
-        if minutes < 30:
-            raise _bad_request("DURATION_TOO_SHORT", "Minimum duration is 30 minutes.")
-        if minutes > 8 * 60:
-            raise _bad_request("DURATION_TOO_LONG", "Maximum duration is 8 hours.")
+            end_at = data["end_at"]
 
-        if current.role != "admin" and start_at < now_utc():
-            raise _bad_request("PAST_BOOKING_NOT_ALLOWED", "Booking in the past is not allowed.")
+        start_at, end_at = _validate_slot(current, start_at, end_at)
 
-        # Re-check conflicts if slot changed
+        # Slot changes are re-checked by the exclusion constraint on commit
         if ("start_at" in data) or ("end_at" in data):
-            if await self.bookings.has_conflict(
-                resource_id=booking.resource_id,
-                start_at=start_at,
-                end_at=end_at,
-                exclude_booking_id=booking.id,
-            ):
-                raise _conflict("This resource is already booked for this time slot.")
             booking.start_at = to_utc(start_at)
             booking.end_at = to_utc(end_at)
 
@@ -158,15 +666,125 @@ class BookingService:
         if "notes" in data:
             booking.notes = data["notes"]
 
-        return await self.bookings.save(booking)
+        try:
+            return await self.bookings.save(booking)
+        except BookingConflictError:
+            raise _conflict("This resource is already booked for this time slot.")
 
     async def cancel_booking(self, current: CurrentUser, booking_id: int) -> Booking:
-        booking = await self.bookings.get_by_id(booking_id)
-        if not booking:
+        # Conditional UPDATE; the extra SELECT only runs to explain a refusal
+        booking = await self.bookings.cancel(booking_id, user_id=current.user_id, is_admin=current.role == "admin")
+        if booking:
+            # The next waiter is booked in the background, the response does not wait for it
+            waitlist_worker.slot_freed(booking.resource_id, booking.start_at, booking.end_at)
+            return booking
+        if not await self.bookings.get_by_id(booking_id):
             raise _not_found("booking", booking_id)
-
-        if current.role != "admin" and current.user_id != booking.user_id:
+        raise _forbidden()
+
+    async def join_waitlist(self, current: CurrentUser, payload: WaitlistCreate) -> WaitlistEntry:
+        user = await cached_user(self.users, payload.user_id)
+        resource = await cached_resource(self.resources, payload.resource_id)
+        start_at, end_at = _validate_new_booking(current, payload, user, resource)
+        if not await self.bookings.has_conflict(resource_id=resource.id, start_at=start_at, end_at=end_at):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={"error_code": "SLOT_AVAILABLE", "message": "This slot is free, book it directly."},
+            )
+        entry = WaitlistEntry(
+            resource_id=resource.id,
+            user_id=user.id,
+            start_at=to_utc(start_at),
+            end_at=to_utc(end_at),
+            title=payload.title,
+            participants=payload.participants,
+            notes=payload.notes,
+            created_at=datetime.now(timezone.utc),
+        )
+        try:
+            return await self.bookings.add_waitlist_entry(entry)
+        except WaitlistDuplicateError:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={"error_code": "ALREADY_WAITLISTED", "message": "You are already waiting for this slot."},
+            )
+
+    async def list_waitlist(self, current: CurrentUser, user_id: int | None) -> list[WaitlistEntry]:
+        if user_id is None:
+            user_id = current.user_id
+        if current.role == "employee" and user_id != current.user_id:
             raise _forbidden()
+        return await self.bookings.list_waitlist_for_user(user_id)
+
+    async def leave_waitlist(self, current: CurrentUser, entry_id: int) -> WaitlistEntry:
+        entry = await self.bookings.leave_waitlist(entry_id, user_id=current.user_id, is_admin=current.role == "admin")
+        if entry:
+            return entry
+        existing = await self.bookings.get_waitlist_entry(entry_id)
+        if not existing:
+            raise _not_found("waitlist_entry", entry_id)
+        if current.role != "admin" and existing.user_id != current.user_id:
+            raise _forbidden()
+        raise _bad_request("WAITLIST_ENTRY_CLOSED", f"This entry is already {existing.status.value}.")
+
+    async def list_approvals(
+        self, current: CurrentUser, *, department: str | None, limit: int, cursor: str | None
+    ) -> tuple[list[Booking], str | None]:
+        department = await self._approval_scope(current, department)
+        after = None
+        if cursor:
+            start_at, booking_id = decode_cursor(cursor, "approval", (datetime.fromisoformat, int))
+            after = (start_at, booking_id)
+        rows = await self.bookings.list_pending_approvals(
+            now=now_utc(), department=department, limit=limit, after=after
+        )
+        return keyset_page(rows, limit, "approval", lambda b: [b.start_at.isoformat(), b.id])
+
+    async def approve_bookings(self, current: CurrentUser, payload: BookingDecisionRequest) -> BookingDecisionResponse:
+        return await self._decide(current, payload, approving=True)
+
+    async def reject_bookings(self, current: CurrentUser, payload: BookingDecisionRequest) -> BookingDecisionResponse:
+        return await self._decide(current, payload, approving=False)
+
+    async def _decide(
+        self, current: CurrentUser, payload: BookingDecisionRequest, *, approving: bool
+    ) -> BookingDecisionResponse:
+        # One UPDATE for the whole batch; the extra SELECT only runs to explain the ids it skipped
+        department = await self._approval_scope(current, None)
+        ids = list(dict.fromkeys(payload.ids))
+        now = now_utc()
+        decide = self.bookings.approve_pending if approving else self.bookings.reject_pending
+        updated = await decide(ids, now=now, department=department)
+
+        if not approving:
+            for booking in updated:
+                waitlist_worker.slot_freed(booking.resource_id, booking.start_at, booking.end_at)
+
+        done = {b.id for b in updated}
+        skipped = [i for i in ids if i not in done]
+        failures: list[BookingDecisionFailure] = []
+        if skipped:
+            states = {row.id: row for row in await self.bookings.list_decision_states(skipped)}
+            failures = [
+                _decision_failure(i, states.get(i), department=department, now=now, approving=approving)
+                for i in skipped
+            ]
+        return BookingDecisionResponse(
+            updated=len(updated),
+            failed=len(failures),
+            bookings=[BookingResponse.model_validate(b) for b in updated],
+            failures=failures,
+        )
 
-        booking.status = BookingStatus.cancelled
-        return await self.bookings.save(booking)
+    async def _approval_scope(self, current: CurrentUser, department: str | None) -> str | None:
+        """Department whose pending bookings the caller decides on; None means every department (admin only)."""
+        if current.role == "admin":
+            return department
+        if current.role != "manager":
+            raise _forbidden()
+        manager = await cached_user(self.users, current.user_id)
+        if not manager or not manager.is_active:
+            raise _forbidden()
+        if department is not None and department != manager.department:
+            raise _forbidden()
+        return manager.department
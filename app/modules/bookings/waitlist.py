@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime
+
+from app.core.db import AsyncSessionLocal
+from app.core.metrics import Counter, registry
+from app.modules.bookings.repository import BookingRepository
+from app.utils.time_slots import now_utc
+
+"""Promotes waitlisted requests into freed slots, off the request path."""
+
+logger = logging.getLogger(__name__)
+
+# Waiters tried per freed slot; several fit when the freed slot is longer than their requests
+MAX_PROMOTIONS_PER_SLOT = 20
+
+PROMOTIONS_TOTAL = registry.register(Counter("waitlist_promotions_total", "Waitlist entries turned into bookings."))
+
+Slot = tuple[int, datetime, datetime]
+
+
+class WaitlistWorker:
+    """Per-worker queue of freed slots; concurrent promotions across workers are safe (SKIP LOCKED + exclusion)."""
+
+    def __init__(self) -> None:
+        self.promoted = 0
+        self.attempts = 0
+        self.failures = 0
+        self._queue: asyncio.Queue[Slot] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="waitlist-worker")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def slot_freed(self, resource_id: int, start_at: datetime, end_at: datetime) -> None:
+        # Called once the freeing transaction committed; never blocks the caller. Slots dropped
+        # while the worker is stopped are found again by the lifecycle sweep
+        if self.running and end_at > now_utc():
+            self._queue.put_nowait((resource_id, start_at, end_at))
+
+    async def promote(self, resource_id: int, start_at: datetime, end_at: datetime) -> int:
+        async with AsyncSessionLocal() as session:
+            promoted = await BookingRepository(session).promote_waitlist(
+                resource_id, start_at, end_at, now=now_utc(), limit=MAX_PROMOTIONS_PER_SLOT
+            )
+        self.attempts += 1
+        if promoted:
+            self.promoted += len(promoted)
+            PROMOTIONS_TOTAL.inc(amount=len(promoted))
+            logger.info("Waitlist: %s booking(s) created on resource %s", len(promoted), resource_id)
+        return len(promoted)
+
+    def snapshot(self) -> dict:
+        return {
+            "running": self.running,
+            "queued": self._queue.qsize(),
+            "attempts": self.attempts,
+            "promoted": self.promoted,
+            "failures": self.failures,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            slot = await self._queue.get()
+            try:
+                await self.promote(*slot)
+            except Exception:
+                self.failures += 1
+                logger.exception("Waitlist promotion failed")
+
+
+waitlist_worker = WaitlistWorker()
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+import asyncpg
+
+from app.core.config import settings
+from app.core.db import build_asyncpg_dsn, pool_wait_stats
+from app.utils.time_slots import now_utc
+
+"""Background DB health sampling, so probes read cached state instead of hitting Postgres."""
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HealthSample:
+    db_ok: bool
+    latency_ms: float
+    checked_at: datetime
+    # Average checkout wait over the last interval and pool timeouts seen in it
+    pool_wait_ms: float
+    pool_timeouts: int
+
+
+class HealthMonitor:
+    def __init__(self, *, interval_seconds: float, timeout_seconds: float) -> None:
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self.last: HealthSample | None = None
+        self.consecutive_failures = 0
+        self._task: asyncio.Task | None = None
+        # Outside the pool: a saturated pool shows up as checkout wait (degraded), not as a failed ping
+        self._conn: asyncpg.Connection | None = None
+        self._prev_wait = (pool_wait_stats.checkouts, pool_wait_stats.total_wait, pool_wait_stats.timeouts)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if not self.running:
+            # First sample inline so readiness is known as soon as the app serves
+            await self.sample()
+            self._task = asyncio.create_task(self._run(), name="health-monitor")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._close()
+
+    async def sample(self) -> HealthSample:
+        started = time.perf_counter()
+        try:
+            db_ok = await asyncio.wait_for(self._ping(), timeout=self.timeout_seconds)
+        except asyncio.TimeoutError:
+            # The connection may be stuck mid-query, start over on the next sample
+            self._drop()
+            db_ok = False
+        latency_ms = (time.perf_counter() - started) * 1000
+        self.consecutive_failures = 0 if db_ok else self.consecutive_failures + 1
+
+        checkouts, total_wait, timeouts = pool_wait_stats.checkouts, pool_wait_stats.total_wait, pool_wait_stats.timeouts
+        prev_checkouts, prev_total_wait, prev_timeouts = self._prev_wait
+        self._prev_wait = (checkouts, total_wait, timeouts)
+        waited = checkouts - prev_checkouts
+        self.last = HealthSample(
+            db_ok=db_ok,
+            latency_ms=round(latency_ms, 3),
+            checked_at=now_utc(),
+            pool_wait_ms=round((total_wait - prev_total_wait) / waited * 1000, 3) if waited else 0.0,
+            pool_timeouts=timeouts - prev_timeouts,
+        )
+        return self.last
+
+    async def _ping(self) -> bool:
+        try:
+            if self._conn is None or self._conn.is_closed():
+                self._conn = await asyncpg.connect(build_asyncpg_dsn())
+            await self._conn.fetchval("SELECT 1")
+            return True
+        except Exception:
+            await self._close()
+            return False
+
+    def _drop(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None and not conn.is_closed():
+            conn.terminate()
+
+    async def _close(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None and not conn.is_closed():
+            try:
+                await conn.close(timeout=self.timeout_seconds)
+            except Exception:
+                conn.terminate()
+
+    def is_stale(self) -> bool:
+        # Missing a few samples means the loop itself is stuck, do not trust old state
+        if self.last is None:
+            return True
+        age = (now_utc() - self.last.checked_at).total_seconds()
+        return age > self.interval_seconds * 3 + self.timeout_seconds
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.sample()
+            except Exception:
+                logger.exception("Health sample failed")
+
+
+health_monitor = HealthMonitor(
+    interval_seconds=settings.health_interval_seconds,
+    timeout_seconds=settings.health_timeout_seconds,
+)
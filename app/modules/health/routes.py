@@ -1,5 +1,6 @@
 from fastapi import APIRouter
-from app.modules.health.service import get_health
+from fastapi.responses import JSONResponse
+from app.modules.health.service import get_cache_stats, get_health, get_lifecycle_stats, get_liveness, get_pool_stats, get_readiness
 
 """Health check routes"""
 
@@ -10,3 +11,39 @@ router = APIRouter(prefix="/health", tags=["Health"])
 @router.get("")
 async def healthcheck():
     return await get_health()
+
+
+"""Liveness probe, no I/O"""
+
+@router.get("/live")
+async def liveness():
+    return get_liveness()
+
+
+"""Readiness probe from the cached DB sample and pool saturation (503 when down)"""
+
+@router.get("/ready")
+async def readiness():
+    ready = get_readiness()
+    return JSONResponse(ready, status_code=503 if ready["status"] == "down" else 200)
+
+
+"""In-process cache counters"""
+
+@router.get("/caches")
+async def cache_stats():
+    return get_cache_stats()
+
+
+"""Connection pool usage and checkout waits"""
+
+@router.get("/pool")
+async def pool_stats():
+    return get_pool_stats()
+
+
+"""Booking lifecycle scheduler state (only the leader worker reports runs)"""
+
+@router.get("/lifecycle")
+async def lifecycle_stats():
+    return get_lifecycle_stats()
@@ -1,5 +1,14 @@
 from datetime import datetime, timezone
-from app.core.db import db_ping
+from app.core.config import settings
+from app.core.db import pool_status
+from app.core.notifications import listener
+from app.modules.bookings.cache import booking_index
+from app.modules.bookings.lifecycle import lifecycle_scheduler
+from app.modules.bookings.waitlist import waitlist_worker
+from app.modules.health.monitor import health_monitor
+from app.modules.resources.cache import resource_cache
+from app.modules.resources.catalog import catalog_cache
+from app.modules.users.cache import user_cache
 
 """Health check service"""
 
@@ -7,11 +16,75 @@ from app.core.db import db_ping
 
 async def get_health() -> dict:
 
-    """Get health status of the service."""
-    db_ok = await db_ping()
+    """Get health status of the service (last background sample, no query per probe)."""
+    sample = health_monitor.last
+    db_ok = sample is not None and sample.db_ok and not health_monitor.is_stale()
     return {
         "status": "ok" if db_ok else "degraded",
         "service": "project-reservation",
         "db": "up" if db_ok else "down",
+        "db_latency_ms": sample.latency_ms if sample else None,
+        "checked_at": sample.checked_at.isoformat() if sample else None,
         "timestamp": datetime.now(timezone.utc).isoformat(),
     }
+
+
+
+def get_liveness() -> dict:
+    """The process answers, nothing else is checked."""
+    return {"status": "ok"}
+
+
+
+def get_readiness() -> dict:
+    """ok / degraded (slow pool checkouts) / down (DB unreachable or sampling stalled)."""
+    sample = health_monitor.last
+    pool = pool_status()
+    capacity = pool["size"] + pool["max_overflow"]
+    saturation = round(pool["checked_out"] / capacity, 3) if capacity else 0.0
+
+    if sample is None or not sample.db_ok or health_monitor.is_stale():
+        state = "down"
+    elif sample.pool_timeouts or sample.pool_wait_ms > settings.health_pool_wait_degraded_ms:
+        state = "degraded"
+    else:
+        state = "ok"
+    return {
+        "status": state,
+        "db": {
+            "up": bool(sample and sample.db_ok),
+            "latency_ms": sample.latency_ms if sample else None,
+            "checked_at": sample.checked_at.isoformat() if sample else None,
+            "consecutive_failures": health_monitor.consecutive_failures,
+        },
+        "pool": {
+            "saturation": saturation,
+            "checked_out": pool["checked_out"],
+            "wait_ms": sample.pool_wait_ms if sample else None,
+            "timeouts": sample.pool_timeouts if sample else None,
+        },
+    }
+
+
+
+def get_cache_stats() -> dict:
+    """Hit/miss and staleness counters of the per-worker caches."""
+    return {
+        "booking_index": booking_index.snapshot(),
+        "users": user_cache.snapshot(),
+        "resources": resource_cache.snapshot(),
+        "resource_catalog": catalog_cache.snapshot(),
+        "listener": {"running": listener.running, "listening": listener.listening, "reconnects": listener.reconnects},
+    }
+
+
+
+def get_pool_stats() -> dict:
+    """Pool occupancy and how long requests waited for a connection."""
+    return pool_status()
+
+
+
+def get_lifecycle_stats() -> dict:
+    """Leadership and last run of the booking lifecycle scheduler, waitlist promotions of this worker."""
+    return {**lifecycle_scheduler.snapshot(), "waitlist": waitlist_worker.snapshot()}
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from app.core.config import settings
+from app.core.notifications import NotificationListener
+from app.core.ttl_cache import TTLCache
+from app.core.uow import UnitOfWork
+from app.modules.resources.models import Resource
+from app.modules.resources.repository import ResourceRepository
+
+"""Per-worker cache of resource rows read on the booking path (status, type, capacity, hours)."""
+
+RESOURCE_CHANNEL = "resource_changes"
+
+resource_cache = TTLCache(
+    "resources",
+    enabled=settings.reference_cache_enabled,
+    ttl_seconds=settings.reference_cache_ttl_seconds,
+    max_entries=settings.reference_cache_max_entries,
+)
+
+
+async def cached_resource(repo: ResourceRepository, resource_id: int) -> Resource | None:
+    async def load() -> Resource | None:
+        resource = await repo.get_by_id(resource_id)
+        if resource is not None:
+            # Shared across requests, so it must not stay bound to this session
+            repo.session.expunge(resource)
+        return resource
+
+    return await resource_cache.get_or_load(resource_id, load)
+
+
+def announce_resource_change(uow: UnitOfWork, resource_id: int) -> None:
+    # Queued before the write: the NOTIFY goes out in its transaction, never for a rolled-back change
+    uow.notify(RESOURCE_CHANNEL, str(resource_id))
+
+
+def invalidate_resource(resource_id: int) -> None:
+    # This worker drops its entry right after the commit instead of waiting for its own notification
+    resource_cache.invalidate(resource_id)
+
+
+def register_resource_cache(listener: NotificationListener) -> None:
+    if resource_cache.enabled:
+        listener.subscribe(
+            RESOURCE_CHANNEL, lambda payload: resource_cache.invalidate(int(payload)), on_reset=resource_cache.clear
+        )
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from urllib.parse import urlencode
+
+from app.core.notifications import NotificationListener, listener
+
+"""Versioned cache of serialized catalog responses (GET /resources, GET /resources/{id})."""
+
+# Fed by trg_resources_catalog_version, payload is the new version number
+CATALOG_CHANNEL = "resource_catalog"
+
+MAX_CACHED_BODIES = 512
+
+
+@dataclass
+class CatalogStats:
+    hits: int = 0
+    misses: int = 0
+    not_modified: int = 0
+    version_reads: int = 0
+    resets: int = 0
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    version: int
+    etag: str
+    body: bytes
+    next_cursor: str | None = None
+
+
+def catalog_key(kind: str, **params) -> str:
+    # Normalized query parameters, so equivalent requests share one body and one ETag
+    items = sorted((k, str(getattr(v, "value", v))) for k, v in params.items() if v is not None)
+    return f"{kind}?{urlencode(items)}"
+
+
+def catalog_etag(version: int, key: str) -> str:
+    digest = hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+    return f'"rc{version}-{digest}"'
+
+
+class CatalogCache:
+    def __init__(self, listener: NotificationListener, max_entries: int = MAX_CACHED_BODIES) -> None:
+        self._listener = listener
+        self.max_entries = max_entries
+        self.stats = CatalogStats()
+        self._version: int | None = None
+        self._bodies: OrderedDict[str, CachedBody] = OrderedDict()
+
+    def known_version(self) -> int | None:
+        """Current version without a query, only while notifications keep it up to date."""
+        return self._version if self._listener.listening else None
+
+    def remember_version(self, version: int) -> None:
+        if self._listener.listening and (self._version is None or version > self._version):
+            self._version = version
+
+    def get(self, key: str, version: int) -> CachedBody | None:
+        cached = self._bodies.get(key)
+        if cached is None or cached.version != version:
+            return None
+        self._bodies.move_to_end(key)
+        self.stats.hits += 1
+        return cached
+
+    def put(self, key: str, cached: CachedBody) -> None:
+        self.stats.misses += 1
+        self._bodies[key] = cached
+        self._bodies.move_to_end(key)
+        while len(self._bodies) > self.max_entries:
+            self._bodies.popitem(last=False)
+
+    def on_notification(self, payload: str) -> None:
+        version = int(payload)
+        if self._version is None or version > self._version:
+            self._version = version
+            # Every body is keyed to an older version now
+            self._bodies.clear()
+
+    def reset(self) -> None:
+        self._version = None
+        self._bodies.clear()
+        self.stats.resets += 1
+
+    def snapshot(self) -> dict:
+        return {"version": self._version, "bodies": len(self._bodies), **vars(self.stats)}
+
+
+catalog_cache = CatalogCache(listener)
+
+
+def register_catalog_cache(listener: NotificationListener) -> None:
+    listener.subscribe(CATALOG_CHANNEL, catalog_cache.on_notification, on_reset=catalog_cache.reset)
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import time
 from enum import Enum
 
-from sqlalchemy import Boolean, Enum as SAEnum, Integer, String, Time, UniqueConstraint
+from sqlalchemy import BigInteger, Boolean, CheckConstraint, Enum as SAEnum, Integer, String, Time, UniqueConstraint
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -26,7 +26,7 @@ class Resource(Base):
     __tablename__ = "resources"
     __table_args__ = (UniqueConstraint("name", "site", name="uq_resources_name_site"),)
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
     name: Mapped[str] = mapped_column(String(120), nullable=False)
     type: Mapped[ResourceType] = mapped_column(SAEnum(ResourceType, name="resource_type"), nullable=False)
@@ -55,3 +55,13 @@ class Resource(Base):
     hourly_rate_internal: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
     is_deleted: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
+
+class ResourceCatalogVersion(Base):
+    """Single row bumped by a statement trigger on every resources write."""
+
+    __tablename__ = "resource_catalog_version"
+    __table_args__ = (CheckConstraint("id = 1", name="ck_resource_catalog_version_single_row"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False)
@@ -1,20 +1,104 @@
-from sqlalchemy import and_, select
-from sqlalchemy.exc import IntegrityError
+from datetime import datetime
+
+from sqlalchemy import and_, exists, false, func, literal, or_, select, true, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.core.uow import UnitOfWork
+from app.modules.bookings.models import ACTIVE_STATUSES, MAX_BOOKING_SPAN, Booking
+from app.modules.resources.models import Resource, ResourceCatalogVersion, ResourceStatus, ResourceType
+
+
+def _slot_taken(start_at: datetime, end_at: datetime):
+    # Correlated overlap test, written as a range overlap so the GiST exclusion index applies;
+    # the start_at bounds only prune partitions
+    return exists().where(
+        and_(
+            Booking.resource_id == Resource.id,
+            Booking.status.in_(ACTIVE_STATUSES),
+            Booking.start_at < end_at,
+            Booking.start_at > start_at - MAX_BOOKING_SPAN,
+            func.tstzrange(Booking.start_at, Booking.end_at, literal("[)")).op("&&")(
+                func.tstzrange(start_at, end_at, literal("[)"))
+            ),
+        )
+    )
+
+
+# NULL capacities sort last; a sentinel keeps the keyset a plain row comparison
+CAPACITY_NULLS_LAST = 2_147_483_647
+
+def resource_sort_columns(sort: str, resource=Resource) -> tuple:
+    # resource may be an alias (a page subquery)
+    if sort == "capacity":
+        return (func.coalesce(resource.capacity_max, CAPACITY_NULLS_LAST), resource.id)
+    if sort == "type":
+        return (resource.type, resource.id)
+    return (resource.name, resource.id)
+
+# How cursor key parts are decoded, per sort
+RESOURCE_CURSOR_TYPES = {
+    "name": (str, int),
+    "capacity": (int, int),
+    "type": (ResourceType, int),
+}
+
 
-from app.modules.resources.models import Resource, ResourceStatus, ResourceType
+def resource_sort_key(resource: Resource, sort: str) -> list:
+    if sort == "capacity":
+        capacity = resource.capacity_max
+        return [CAPACITY_NULLS_LAST if capacity is None else capacity, resource.id]
+    if sort == "type":
+        return [resource.type.value, resource.id]
+    return [resource.name, resource.id]
+
+
+def _apply_filters(
+    q,
+    *,
+    type_: ResourceType | None,
+    site: str | None,
+    status: ResourceStatus | None,
+    min_capacity: int | None,
+    features: list[str],
+):
+    # Catalog filters shared by the listing and the availability search
+    q = q.where(Resource.is_deleted == false())
+    if type_ is not None:
+        q = q.where(Resource.type == type_)
+    if site is not None:
+        q = q.where(Resource.site.ilike(site))
+    if status is not None:
+        q = q.where(Resource.status == status)
+    if min_capacity is not None:
+        q = q.where(Resource.capacity_max >= min_capacity)
+    if features:
+        q = q.where(Resource.features.contains(features))
+    return q
 
 
 class ResourceRepository:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
+        self.uow = UnitOfWork(session)
+
+    async def catalog_version(self) -> int:
+        return (await self.session.execute(select(ResourceCatalogVersion.version))).scalar_one()
 
     async def get_by_id(self, resource_id: int) -> Resource | None:
         res = await self.session.execute(
-            select(Resource).where(and_(Resource.id == resource_id, Resource.is_deleted.is_(False)))
+            select(Resource).where(and_(Resource.id == resource_id, Resource.is_deleted == false()))
         )
         return res.scalar_one_or_none()
 
+    async def get_many(self, resource_ids: set[int]) -> dict[int, Resource]:
+        if not resource_ids:
+            return {}
+        res = await self.session.execute(
+            select(Resource).where(and_(Resource.id.in_(resource_ids), Resource.is_deleted == false()))
+        )
+        return {r.id: r for r in res.scalars().all()}
+
     async def list_resources(
         self,
         *,
@@ -26,46 +110,107 @@ class ResourceRepository:
         min_capacity: int | None,
         feature: str | None,
         sort: str,
+        after: list | None = None,
+    ) -> tuple[int, list[Resource]]:
+        """(catalog version, up to limit + 1 rows); `after` is the decoded keyset of the previous page."""
+        q = _apply_filters(
+            select(Resource),
+            type_=type_,
+            site=site,
+            status=status,
+            min_capacity=min_capacity,
+            features=[feature] if feature is not None else [],
+        )
+
+        # id is the unique tiebreaker, so pages never drift
+        columns = resource_sort_columns(sort)
+        q = q.order_by(*columns)
+        if after is not None:
+            q = q.where(tuple_(*columns) > tuple(after))
+        else:
+            q = q.offset(offset)
+        q = q.limit(limit + 1)
+
+        # The catalog version comes with the page: one statement, one snapshot. Its single row is the
+        # outer side of the join, so an empty page still carries it
+        page = aliased(Resource, q.subquery("page"))
+        stmt = (
+            select(ResourceCatalogVersion.version, page)
+            .select_from(ResourceCatalogVersion)
+            .outerjoin(page, true())
+            .order_by(*resource_sort_columns(sort, page))
+        )
+        rows = (await self.session.execute(stmt)).all()
+        return rows[0][0], [resource for _, resource in rows if resource is not None]
+
+    async def list_available(
+        self,
+        *,
+        start_at: datetime,
+        end_at: datetime,
+        limit: int,
+        type_: ResourceType | None,
+        site: str | None,
+        min_capacity: int | None,
+        features: list[str],
+    ) -> list[Resource]:
+        # One statement: catalog filters + NOT EXISTS on overlapping active bookings, best fit first
+        q = _apply_filters(
+            select(Resource),
+            type_=type_,
+            site=site,
+            status=ResourceStatus.active,
+            min_capacity=min_capacity,
+            features=features,
+        )
+        q = (
+            q.where(~_slot_taken(start_at, end_at))
+            .order_by(Resource.capacity_max.asc().nulls_last(), Resource.id)
+            .limit(limit)
+        )
+        res = await self.session.execute(q)
+        return list(res.scalars().all())
+
+    async def list_free_alternatives(
+        self,
+        *,
+        exclude_id: int,
+        type_: ResourceType,
+        site: str,
+        features: list[str],
+        start_at: datetime,
+        end_at: datetime,
+        participants: int,
+        limit: int,
     ) -> list[Resource]:
-        q = select(Resource).where(Resource.is_deleted.is_(False))
-
-        if type_ is not None:
-            q = q.where(Resource.type == type_)
-        if site is not None:
-            q = q.where(Resource.site.ilike(site))
-        if status is not None:
-            q = q.where(Resource.status == status)
-        if min_capacity is not None:
-            q = q.where(Resource.capacity_max >= min_capacity)
-        if feature is not None:
-            q = q.where(Resource.features.contains([feature]))
-
-        if sort == "name":
-            q = q.order_by(Resource.name.asc())
-        elif sort == "capacity":
-            q = q.order_by(Resource.capacity_max.asc().nulls_last())
-        elif sort == "type":
-            q = q.order_by(Resource.type.asc())
-
-        q = q.limit(limit).offset(offset)
+        # Same type and site, enough capacity, superset of features, free for the whole slot
+        q = (
+            select(Resource)
+            .where(
+                Resource.is_deleted == false(),
+                Resource.status == ResourceStatus.active,
+                Resource.id != exclude_id,
+                Resource.type == type_,
+                Resource.site == site,
+                or_(Resource.capacity_max.is_(None), Resource.capacity_max >= participants),
+                Resource.features.contains(features),
+                ~_slot_taken(start_at, end_at),
+            )
+            .order_by(Resource.capacity_max.asc().nulls_last(), Resource.id)
+            .limit(limit)
+        )
         res = await self.session.execute(q)
         return list(res.scalars().all())
 
     async def create(self, resource: Resource) -> Resource:
-        self.session.add(resource)
-        try:
-            await self.session.commit()
-        except IntegrityError:
-            await self.session.rollback()
-            raise
-        await self.session.refresh(resource)
-        return resource
+        return await self.uow.add(resource)
 
     async def save(self, resource: Resource) -> Resource:
-        try:
-            await self.session.commit()
-        except IntegrityError:
-            await self.session.rollback()
-            raise
-        await self.session.refresh(resource)
+        await self.uow.commit()
         return resource
+
+    async def update_fields(self, resource_id: int, **values) -> Resource | None:
+        # Single UPDATE ... RETURNING on a live (not soft-deleted) resource
+        return await self.uow.update_returning(
+            Resource, Resource.id == resource_id, Resource.is_deleted == false(), **values
+        )
@@ -1,7 +1,18 @@
-from fastapi import APIRouter, Depends, Query
+from collections.abc import Awaitable, Callable
+from datetime import datetime
 
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+
+from app.core.conditional import cache_headers, is_not_modified, not_modified
 from app.core.db import AsyncSessionLocal
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.query_budget import route_budget
+from app.core.read_routing import get_read_session, read_session_maker
 from app.core.security import CurrentUser, get_current_user
+from app.modules.bookings.schemas import AvailabilityResponse
+from app.modules.bookings.service import BookingService, stream_calendar
+from app.modules.resources.catalog import CachedBody, catalog_cache, catalog_etag, catalog_key
 from app.modules.resources.models import ResourceStatus, ResourceType
 from app.modules.resources.schemas import ResourceCreate, ResourceResponse, ResourceUpdate
 from app.modules.resources.service import ResourceService
@@ -14,10 +25,29 @@ async def get_session():
         yield session
 
 
+async def _catalog_response(request: Request, key: str, load: Callable[[], Awaitable[CachedBody]]) -> Response:
+    # Revalidation against a version known from notifications needs no query at all
+    version = catalog_cache.known_version()
+    if version is not None and is_not_modified(request, catalog_etag(version, key)):
+        catalog_cache.stats.not_modified += 1
+        return not_modified(catalog_etag(version, key))
+
+    cached = await load()
+    if is_not_modified(request, cached.etag):
+        catalog_cache.stats.not_modified += 1
+        return not_modified(cached.etag)
+    headers = cache_headers(cached.etag)
+    if cached.next_cursor:
+        headers[NEXT_CURSOR_HEADER] = cached.next_cursor
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
 @router.get("", response_model=list[ResourceResponse])
+@route_budget(max_statements=1)
 async def list_resources(
+    request: Request,
     current: CurrentUser = Depends(get_current_user),
-    session=Depends(get_session),
+    session=Depends(get_read_session),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
     type: ResourceType | None = Query(default=None),
@@ -26,11 +56,12 @@ async def list_resources(
     min_capacity: int | None = Query(default=None, ge=1, le=500),
     feature: str | None = Query(default=None),
     sort: str = Query(default="name", pattern="^(name|capacity|type)$"),
+    cursor: str | None = Query(default=None),
 ):
-    return await ResourceService(session).list_resources(
-        current,
+    params = dict(
         limit=limit,
         offset=offset,
+        cursor=cursor,
         type_=type,
         site=site,
         status=status,
@@ -38,9 +69,37 @@ async def list_resources(
         feature=feature.strip().lower() if feature else None,
         sort=sort,
     )
+    key = catalog_key("list", **params)
+    return await _catalog_response(request, key, lambda: ResourceService(session).catalog_page(current, key, **params))
+
+
+@router.get("/available", response_model=list[ResourceResponse])
+@route_budget(max_statements=1)
+async def list_available_resources(
+    start: datetime,
+    end: datetime,
+    current: CurrentUser = Depends(get_current_user),
+    session=Depends(get_read_session),
+    limit: int = Query(20, ge=1, le=200),
+    type: ResourceType | None = Query(default=None),
+    site: str | None = Query(default=None),
+    min_capacity: int | None = Query(default=None, ge=1, le=500),
+    features: str | None = Query(default=None, description="Comma-separated, all required"),
+):
+    return await ResourceService(session).list_available(
+        current,
+        start_at=start,
+        end_at=end,
+        limit=limit,
+        type_=type,
+        site=site,
+        min_capacity=min_capacity,
+        features=[f.strip().lower() for f in features.split(",") if f.strip()] if features else [],
+    )
 
 
 @router.post("", response_model=ResourceResponse, status_code=201)
+@route_budget(max_statements=1)
 async def create_resource(
     payload: ResourceCreate,
     current: CurrentUser = Depends(get_current_user),
@@ -50,15 +109,51 @@ async def create_resource(
 
 
 @router.get("/{resource_id}", response_model=ResourceResponse)
+@route_budget(max_statements=2)
 async def get_resource(
     resource_id: int,
+    request: Request,
     current: CurrentUser = Depends(get_current_user),
-    session=Depends(get_session),
+    session=Depends(get_read_session),
+):
+    key = catalog_key("resource", id=resource_id)
+    return await _catalog_response(
+        request, key, lambda: ResourceService(session).catalog_resource(current, key, resource_id)
+    )
+
+
+@router.get("/{resource_id}/availability", response_model=AvailabilityResponse)
+@route_budget(max_statements=2)
+async def get_availability(
+    resource_id: int,
+    from_at: datetime = Query(..., alias="from"),
+    to_at: datetime = Query(..., alias="to"),
+    step: int = Query(15, ge=5, le=120),
+    current: CurrentUser = Depends(get_current_user),
+    session=Depends(get_read_session),
+):
+    return await BookingService(session).get_availability(current, resource_id, from_at, to_at, step)
+
+
+@router.get("/{resource_id}/calendar.ics", response_class=StreamingResponse)
+async def resource_calendar(
+    resource_id: int,
+    request: Request,
+    current: CurrentUser = Depends(get_current_user),
+    session=Depends(get_read_session),
 ):
-    return await ResourceService(session).get_resource(current, resource_id)
+    feed = await BookingService(session).resource_calendar(current, resource_id)
+    if is_not_modified(request, feed.etag, feed.last_modified):
+        return not_modified(feed.etag, feed.last_modified)
+    return StreamingResponse(
+        stream_calendar(feed, read_session_maker(request)),
+        media_type="text/calendar; charset=utf-8",
+        headers=cache_headers(feed.etag, feed.last_modified),
+    )
 
 
 @router.patch("/{resource_id}", response_model=ResourceResponse)
+@route_budget(max_statements=3)
 async def update_resource(
     resource_id: int,
     payload: ResourceUpdate,
@@ -69,6 +164,7 @@ async def update_resource(
 
 
 @router.delete("/{resource_id}", response_model=ResourceResponse)
+@route_budget(max_statements=2)
 async def delete_resource(
     resource_id: int,
     current: CurrentUser = Depends(get_current_user),
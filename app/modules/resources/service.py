@@ -1,11 +1,19 @@
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+
 from fastapi import HTTPException, status
+from pydantic import TypeAdapter
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import CurrentUser
+from app.modules.resources.cache import announce_resource_change, invalidate_resource
+from app.modules.resources.catalog import CachedBody, catalog_cache, catalog_etag
 from app.modules.resources.models import Resource, ResourceStatus, ResourceType
-from app.modules.resources.repository import ResourceRepository
-from app.modules.resources.schemas import FEATURES_BY_TYPE, ResourceCreate, ResourceUpdate
+from app.core.pagination import decode_cursor, keyset_page
+from app.modules.resources.repository import RESOURCE_CURSOR_TYPES, ResourceRepository, resource_sort_key
+from app.modules.resources.schemas import FEATURES_BY_TYPE, ResourceCreate, ResourceResponse, ResourceUpdate
+from app.utils.time_slots import to_utc
 
 
 def _forbidden() -> HTTPException:
@@ -36,13 +44,70 @@ def _bad_request(msg: str, code: str) -> HTTPException:
     return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail={"error_code": code, "message": msg})
 
 
+_RESOURCE_LIST = TypeAdapter(list[ResourceResponse])
+
+
 class ResourceService:
     def __init__(self, session: AsyncSession) -> None:
         self.repo = ResourceRepository(session)
 
-    async def list_resources(self, current: CurrentUser, **kwargs) -> list[Resource]:
+    async def list_resources(
+        self, current: CurrentUser, *, limit: int, sort: str, cursor: str | None = None, **kwargs
+    ) -> tuple[int, list[Resource], str | None]:
+        """(catalog version, page, next cursor)."""
         # Listing is readable by everyone (subject expects visibility)
-        return await self.repo.list_resources(**kwargs)
+        after = decode_cursor(cursor, sort, RESOURCE_CURSOR_TYPES[sort]) if cursor else None
+        version, rows = await self.repo.list_resources(limit=limit, sort=sort, after=after, **kwargs)
+        page, next_cursor = keyset_page(rows, limit, sort, lambda r: resource_sort_key(r, sort))
+        return version, page, next_cursor
+
+    async def catalog_page(self, current: CurrentUser, key: str, **params) -> CachedBody:
+        version = catalog_cache.known_version()
+        if version is not None and (cached := catalog_cache.get(key, version)):
+            return cached
+        # A miss costs one statement: the page query also returns the version it was read at
+        version, rows, next_cursor = await self.list_resources(current, **params)
+        catalog_cache.stats.version_reads += 1
+        catalog_cache.remember_version(version)
+        if cached := catalog_cache.get(key, version):
+            return cached
+        body = _RESOURCE_LIST.dump_json(_RESOURCE_LIST.validate_python(rows, from_attributes=True))
+        return self._store_body(key, version, body, next_cursor)
+
+    async def catalog_resource(self, current: CurrentUser, key: str, resource_id: int) -> CachedBody:
+        async def build() -> tuple[bytes, str | None]:
+            resource = await self.get_resource(current, resource_id)
+            return ResourceResponse.model_validate(resource).model_dump_json().encode(), None
+
+        return await self._catalog_body(key, build)
+
+    async def _catalog_body(
+        self, key: str, build: Callable[[], Awaitable[tuple[bytes, str | None]]]
+    ) -> CachedBody:
+        version = catalog_cache.known_version()
+        if version is not None and (cached := catalog_cache.get(key, version)):
+            return cached
+        # Version is read before the rows in the same session, so the body is at least that recent
+        version = await self.repo.catalog_version()
+        catalog_cache.stats.version_reads += 1
+        catalog_cache.remember_version(version)
+        if cached := catalog_cache.get(key, version):
+            return cached
+        body, next_cursor = await build()
+        return self._store_body(key, version, body, next_cursor)
+
+    def _store_body(self, key: str, version: int, body: bytes, next_cursor: str | None) -> CachedBody:
+        cached = CachedBody(version=version, etag=catalog_etag(version, key), body=body, next_cursor=next_cursor)
+        catalog_cache.put(key, cached)
+        return cached
+
+    async def list_available(
+        self, current: CurrentUser, *, start_at: datetime, end_at: datetime, **filters
+    ) -> list[Resource]:
+        start_at, end_at = to_utc(start_at), to_utc(end_at)
+        if end_at <= start_at:
+            raise _bad_request("end must be after start.", "INVALID_TIME_SLOT")
+        return await self.repo.list_available(start_at=start_at, end_at=end_at, **filters)
 
     async def get_resource(self, current: CurrentUser, resource_id: int) -> Resource:
         resource = await self.repo.get_by_id(resource_id)
@@ -114,19 +179,22 @@ class ResourceService:
             if unknown:
                 raise _bad_request(f"Invalid features for {resource.type}: {unknown}", "INVALID_FEATURES")
 
+        announce_resource_change(self.repo.uow, resource_id)
         try:
-            return await self.repo.save(resource)
+            resource = await self.repo.save(resource)
         except IntegrityError:
             raise _conflict_name_site()
+        invalidate_resource(resource_id)
+        return resource
 
     async def soft_delete(self, current: CurrentUser, resource_id: int) -> Resource:
         # Admin only deletion (recommended logical delete)
         if current.role != "admin":
             raise _forbidden()
 
-        resource = await self.repo.get_by_id(resource_id)
+        announce_resource_change(self.repo.uow, resource_id)
+        resource = await self.repo.update_fields(resource_id, is_deleted=True)
         if not resource:
             raise _not_found(resource_id)
-
-        resource.is_deleted = True
-        return await self.repo.save(resource)
+        invalidate_resource(resource_id)
+        return resource
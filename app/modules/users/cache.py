@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from app.core.config import settings
+from app.core.notifications import NotificationListener
+from app.core.ttl_cache import TTLCache
+from app.core.uow import UnitOfWork
+from app.modules.users.models import User
+from app.modules.users.repository import UserRepository
+
+"""Per-worker cache of user rows read on the booking path (role, allowed types, is_active)."""
+
+USER_CHANNEL = "user_changes"
+
+user_cache = TTLCache(
+    "users",
+    enabled=settings.reference_cache_enabled,
+    ttl_seconds=settings.reference_cache_ttl_seconds,
+    max_entries=settings.reference_cache_max_entries,
+)
+
+
+async def cached_user(repo: UserRepository, user_id: int) -> User | None:
+    async def load() -> User | None:
+        user = await repo.get_by_id(user_id)
+        if user is not None:
+            # Shared across requests, so it must not stay bound to this session
+            repo.session.expunge(user)
+        return user
+
+    return await user_cache.get_or_load(user_id, load)
+
+
+def announce_user_change(uow: UnitOfWork, user_id: int) -> None:
+    # Queued before the write: the NOTIFY goes out in its transaction, never for a rolled-back change
+    uow.notify(USER_CHANNEL, str(user_id))
+
+
+def invalidate_user(user_id: int) -> None:
+    # This worker drops its entry right after the commit instead of waiting for its own notification
+    user_cache.invalidate(user_id)
+
+
+def register_user_cache(listener: NotificationListener) -> None:
+    if user_cache.enabled:
+        listener.subscribe(USER_CHANNEL, lambda payload: user_cache.invalidate(int(payload)), on_reset=user_cache.clear)
@@ -24,13 +24,13 @@ class User(Base):
         UniqueConstraint("email", name="uq_users_email"),
     )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     username: Mapped[str] = mapped_column(String(50), nullable=False)
     email: Mapped[str] = mapped_column(String(255), nullable=False)
     full_name: Mapped[str] = mapped_column(String(120), nullable=False)
 
     role: Mapped[UserRole] = mapped_column(SAEnum(UserRole, name="user_role"), nullable=False)
-    department: Mapped[str] = mapped_column(String(120), nullable=False)
+    department: Mapped[str] = mapped_column(String(120), nullable=False, index=True)
     main_site: Mapped[str] = mapped_column(String(120), nullable=False)
 
     allowed_resource_types: Mapped[list[str]] = mapped_column(
@@ -1,15 +1,21 @@
 from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.uow import UnitOfWork
 from app.modules.users.models import User
 
 class UserRepository:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
+        self.uow = UnitOfWork(session)
 
-    async def list_users(self, limit: int, offset: int) -> list[User]:
-        q = select(User).order_by(User.id).limit(limit).offset(offset)
+    async def list_users(self, limit: int, offset: int, after_id: int | None = None) -> list[User]:
+        # Returns up to limit + 1 rows so the caller knows whether a next page exists
+        q = select(User).order_by(User.id).limit(limit + 1)
+        if after_id is not None:
+            q = q.where(User.id > after_id)
+        else:
+            q = q.offset(offset)
         res = await self.session.execute(q)
         return list(res.scalars().all())
 
@@ -17,21 +23,19 @@ class UserRepository:
         res = await self.session.execute(select(User).where(User.id == user_id))
         return res.scalar_one_or_none()
 
+    async def get_many(self, user_ids: set[int]) -> dict[int, User]:
+        if not user_ids:
+            return {}
+        res = await self.session.execute(select(User).where(User.id.in_(user_ids)))
+        return {u.id: u for u in res.scalars().all()}
+
     async def create(self, user: User) -> User:
-        self.session.add(user)
-        try:
-            await self.session.commit()
-        except IntegrityError:
-            await self.session.rollback()
-            raise
-        await self.session.refresh(user)
-        return user
+        return await self.uow.add(user)
 
     async def save(self, user: User) -> User:
-        try:
-            await self.session.commit()
-        except IntegrityError:
-            await self.session.rollback()
-            raise
-        await self.session.refresh(user)
+        await self.uow.commit()
         return user
+
+    async def update_fields(self, user_id: int, **values) -> User | None:
+        # Single UPDATE ... RETURNING, no SELECT before or after
+        return await self.uow.update_returning(User, User.id == user_id, **values)
@@ -1,5 +1,10 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from app.core.conditional import cache_headers, is_not_modified, not_modified
 from app.core.db import AsyncSessionLocal
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.query_budget import route_budget
+from app.core.read_routing import get_read_session, read_session_maker
 from app.core.security import CurrentUser, get_current_user
 from app.modules.users.schemas import (
     UserCreate,
@@ -8,6 +13,7 @@ from app.modules.users.schemas import (
     UserResponse,
     UserUpdate,
 )
+from app.modules.bookings.service import BookingService, stream_calendar
 from app.modules.users.service import UserService
 
 router = APIRouter(prefix="/users", tags=["Users"])
@@ -17,15 +23,22 @@ async def get_session():
         yield session
 
 @router.get("", response_model=list[UserResponse])
+@route_budget(max_statements=1)
 async def list_users(
+    response: Response,
     current: CurrentUser = Depends(get_current_user),
-    session=Depends(get_session),
+    session=Depends(get_read_session),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(default=None),
 ):
-    return await UserService(session).list_users(current, limit, offset)
+    users, next_cursor = await UserService(session).list_users(current, limit, offset, cursor)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return users
 
 @router.post("", response_model=UserResponse, status_code=201)
+@route_budget(max_statements=1)
 async def create_user(
     payload: UserCreate,
     current: CurrentUser = Depends(get_current_user),
@@ -34,14 +47,32 @@ async def create_user(
     return await UserService(session).create_user(current, payload)
 
 @router.get("/{user_id}", response_model=UserResponse)
+@route_budget(max_statements=1)
 async def get_user(
     user_id: int,
     current: CurrentUser = Depends(get_current_user),
-    session=Depends(get_session),
+    session=Depends(get_read_session),
 ):
     return await UserService(session).get_user(current, user_id)
 
+@router.get("/{user_id}/calendar.ics", response_class=StreamingResponse)
+async def user_calendar(
+    user_id: int,
+    request: Request,
+    current: CurrentUser = Depends(get_current_user),
+    session=Depends(get_read_session),
+):
+    feed = await BookingService(session).user_calendar(current, user_id)
+    if is_not_modified(request, feed.etag, feed.last_modified):
+        return not_modified(feed.etag, feed.last_modified)
+    return StreamingResponse(
+        stream_calendar(feed, read_session_maker(request)),
+        media_type="text/calendar; charset=utf-8",
+        headers=cache_headers(feed.etag, feed.last_modified),
+    )
+
 @router.patch("/{user_id}", response_model=UserResponse)
+@route_budget(max_statements=2)
 async def update_user(
     user_id: int,
     payload: UserUpdate,
@@ -51,10 +82,11 @@ async def update_user(
     return await UserService(session).update_user(current, user_id, payload)
 
 @router.get("/{user_id}/permissions", response_model=UserPermissionsResponse)
+@route_budget(max_statements=1)
 async def get_permissions(
     user_id: int,
     current: CurrentUser = Depends(get_current_user),
-    session=Depends(get_session),
+    session=Depends(get_read_session),
 ):
     u = await UserService(session).get_user(current, user_id)
     return UserPermissionsResponse(
@@ -66,6 +98,7 @@ async def get_permissions(
     )
 
 @router.patch("/{user_id}/permissions", response_model=UserResponse)
+@route_budget(max_statements=2)
 async def update_permissions(
     user_id: int,
     payload: UserPermissionsUpdate,
@@ -75,6 +108,7 @@ async def update_permissions(
     return await UserService(session).update_permissions(current, user_id, payload)
 
 @router.post("/{user_id}/deactivate", response_model=UserResponse)
+@route_budget(max_statements=2)
 async def deactivate_user(
     user_id: int,
     current: CurrentUser = Depends(get_current_user),
@@ -83,6 +117,7 @@ async def deactivate_user(
     return await UserService(session).deactivate(current, user_id)
 
 @router.post("/{user_id}/reactivate", response_model=UserResponse)
+@route_budget(max_statements=2)
 async def reactivate_user(
     user_id: int,
     current: CurrentUser = Depends(get_current_user),
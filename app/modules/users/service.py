@@ -2,7 +2,9 @@ from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagination import decode_cursor, keyset_page
 from app.core.security import CurrentUser
+from app.modules.users.cache import announce_user_change, invalidate_user
 from app.modules.users.models import User, UserPriority, UserRole
 from app.modules.users.repository import UserRepository
 from app.modules.users.schemas import UserCreate, UserPermissionsUpdate, UserUpdate
@@ -32,10 +34,15 @@ class UserService:
     def __init__(self, session: AsyncSession) -> None:
         self.repo = UserRepository(session)
 
-    async def list_users(self, current: CurrentUser, limit: int, offset: int) -> list[User]:
+    async def list_users(
+        self, current: CurrentUser, limit: int, offset: int, cursor: str | None = None
+    ) -> tuple[list[User], str | None]:
         if current.role not in {"admin", "manager"}:
             raise _forbidden()
-        return await self.repo.list_users(limit=limit, offset=offset)
+        # The cursor wins over offset; offset stays as a fallback for old clients
+        after_id = decode_cursor(cursor, "id", (int,))[0] if cursor else None
+        rows = await self.repo.list_users(limit=limit, offset=offset, after_id=after_id)
+        return keyset_page(rows, limit, "id", lambda u: [u.id])
 
     async def get_user(self, current: CurrentUser, user_id: int) -> User:
         user = await self.repo.get_by_id(user_id)
@@ -70,25 +77,23 @@ class UserService:
             raise _integrity_error_to_http()
 
     async def update_user(self, current: CurrentUser, user_id: int, payload: UserUpdate) -> User:
-        user = await self.repo.get_by_id(user_id)
-        if not user:
-            raise _not_found(user_id)
-
         # admin can edit anyone; employee can edit self but only profile fields (here: same payload)
         if current.role == "employee" and current.user_id != user_id:
             raise _forbidden()
 
-        if payload.full_name is not None:
-            user.full_name = payload.full_name
-        if payload.department is not None:
-            user.department = payload.department
-        if payload.main_site is not None:
-            user.main_site = payload.main_site
+        values = {k: v for k, v in payload.model_dump(exclude_unset=True).items() if v is not None}
+        if not values:
+            return await self.get_user(current, user_id)
 
+        announce_user_change(self.repo.uow, user_id)
         try:
-            return await self.repo.save(user)
+            user = await self.repo.update_fields(user_id, **values)
         except IntegrityError:
             raise _integrity_error_to_http()
+        if not user:
+            raise _not_found(user_id)
+        invalidate_user(user_id)
+        return user
 
     async def update_permissions(
         self, current: CurrentUser, user_id: int, payload: UserPermissionsUpdate
@@ -96,38 +101,40 @@ class UserService:
         if current.role != "admin":
             raise _forbidden()
 
-        user = await self.repo.get_by_id(user_id)
-        if not user:
-            raise _not_found(user_id)
-
+        values: dict = {}
         if payload.role is not None:
-            user.role = UserRole(payload.role.value)
+            values["role"] = UserRole(payload.role.value)
         if payload.allowed_resource_types is not None:
-            user.allowed_resource_types = payload.allowed_resource_types
+            values["allowed_resource_types"] = payload.allowed_resource_types
         if payload.priority is not None:
-            user.priority = UserPriority(payload.priority.value)
+            values["priority"] = UserPriority(payload.priority.value)
         if payload.is_active is not None:
-            user.is_active = payload.is_active
+            values["is_active"] = payload.is_active
+        if not values:
+            return await self.get_user(current, user_id)
 
+        announce_user_change(self.repo.uow, user_id)
         try:
-            return await self.repo.save(user)
+            user = await self.repo.update_fields(user_id, **values)
         except IntegrityError:
             raise _integrity_error_to_http()
-
-    async def deactivate(self, current: CurrentUser, user_id: int) -> User:
-        if current.role != "admin":
-            raise _forbidden()
-        user = await self.repo.get_by_id(user_id)
         if not user:
             raise _not_found(user_id)
-        user.is_active = False
-        return await self.repo.save(user)
+        invalidate_user(user_id)
+        return user
+
+    async def deactivate(self, current: CurrentUser, user_id: int) -> User:
+        return await self._set_active(current, user_id, False)
 
     async def reactivate(self, current: CurrentUser, user_id: int) -> User:
+        return await self._set_active(current, user_id, True)
+
+    async def _set_active(self, current: CurrentUser, user_id: int, is_active: bool) -> User:
         if current.role != "admin":
             raise _forbidden()
-        user = await self.repo.get_by_id(user_id)
+        announce_user_change(self.repo.uow, user_id)
+        user = await self.repo.update_fields(user_id, is_active=is_active)
         if not user:
             raise _not_found(user_id)
-        user.is_active = True
-        return await self.repo.save(user)
+        invalidate_user(user_id)
+        return user
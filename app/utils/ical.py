@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from app.utils.time_slots import to_utc
+
+"""Minimal iCalendar (RFC 5545) writer for booking feeds."""
+
+CRLF = "\r\n"
+
+# pending bookings are shown as tentative, released slots as cancelled
+ICAL_STATUS = {
+    "pending": "TENTATIVE",
+    "confirmed": "CONFIRMED",
+    "completed": "CONFIRMED",
+    "cancelled": "CANCELLED",
+    "no-show": "CANCELLED",
+}
+
+def ical_datetime(dt: datetime) -> str:
+    return to_utc(dt).strftime("%Y%m%dT%H%M%SZ")
+
+def ical_escape(text: str) -> str:
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+def fold(line: str) -> str:
+    # Content lines are limited to 75 octets, continuation lines start with a space
+    data = line.encode()
+    if len(data) <= 75:
+        return line + CRLF
+    parts, chunk = [], b""
+    for char in line:
+        encoded = char.encode()
+        if len(chunk) + len(encoded) > (75 if not parts else 74):
+            parts.append(chunk.decode())
+            chunk = b""
+        chunk += encoded
+    parts.append(chunk.decode())
+    return (CRLF + " ").join(parts) + CRLF
+
+def calendar_header(name: str) -> str:
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//project-reservation//bookings//EN",
+        "CALSCALE:GREGORIAN",
+        f"X-WR-CALNAME:{ical_escape(name)}",
+    ]
+    return "".join(fold(line) for line in lines)
+
+def calendar_footer() -> str:
+    return "END:VCALENDAR" + CRLF
+
+def vevent(
+    *,
+    uid: str,
+    start_at: datetime,
+    end_at: datetime,
+    summary: str,
+    description: str,
+    status: str,
+    last_modified: datetime,
+) -> str:
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{ical_datetime(last_modified)}",
+        f"LAST-MODIFIED:{ical_datetime(last_modified)}",
+        f"DTSTART:{ical_datetime(start_at)}",
+        f"DTEND:{ical_datetime(end_at)}",
+        f"SUMMARY:{ical_escape(summary)}",
+        f"DESCRIPTION:{ical_escape(description)}",
+        f"STATUS:{ICAL_STATUS.get(status, 'CONFIRMED')}",
+        "END:VEVENT",
+    ]
+    return "".join(fold(line) for line in lines)
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from collections.abc import Container, Iterator
+from datetime import date, datetime, timedelta
+
+from app.utils.time_slots import to_utc
+
+FREQUENCY_STEPS = {
+    "daily": timedelta(days=1),
+    "weekly": timedelta(weeks=1),
+}
+
+def recurrence_step(frequency: str, interval: int) -> timedelta:
+    return FREQUENCY_STEPS[frequency] * interval
+
+def iter_occurrences(
+    start_at: datetime,
+    end_at: datetime,
+    *,
+    step: timedelta,
+    until: date | None = None,
+    count: int | None = None,
+    exceptions: Container[date] = (),
+    window_start: datetime | None = None,
+    window_end: datetime | None = None,
+) -> Iterator[tuple[datetime, datetime]]:
+    """Lazily yield the (start, end) occurrences overlapping the optional window.
+
+    Skipped (exception) occurrences still count towards `count`, like RFC 5545 EXDATE.
+    """
+    start_at, end_at = to_utc(start_at), to_utc(end_at)
+    duration = end_at - start_at
+    k = 0
+    if window_start is not None and to_utc(window_start) > start_at:
+        # Jump straight to the first occurrence that can touch the window
+        k = max(0, (to_utc(window_start) - duration - start_at) // step)
+    while count is None or k < count:
+        occ_start = start_at + k * step
+        if until is not None and occ_start.date() > until:
+            return
+        if window_end is not None and occ_start >= to_utc(window_end):
+            return
+        occ_end = occ_start + duration
+        if (window_start is None or occ_end > to_utc(window_start)) and occ_start.date() not in exceptions:
+            yield occ_start, occ_end
+        k += 1
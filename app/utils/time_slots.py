@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+from collections.abc import Iterable, Iterator
+from datetime import datetime, time, timedelta, timezone
 
 ROUND_MINUTES = 15
 
@@ -17,8 +18,101 @@ def round_to_step(dt: datetime, step_minutes: int = ROUND_MINUTES) -> datetime:
     ts = int(dt.timestamp())
     return datetime.fromtimestamp(ts - (ts % step), tz=timezone.utc)
 
+def ceil_to_step(dt: datetime, step_minutes: int = ROUND_MINUTES) -> datetime:
+    # Round up to the next step, keep dt if already aligned
+    floored = round_to_step(dt, step_minutes)
+    if floored == to_utc(dt):
+        return floored
+    return floored + timedelta(minutes=step_minutes)
+
 def minutes_between(start: datetime, end: datetime) -> int:
     return int((to_utc(end) - to_utc(start)).total_seconds() // 60)
 
 def now_utc() -> datetime:
     return datetime.now(timezone.utc)
+
+Interval = tuple[datetime, datetime]
+
+def merge_intervals(intervals: Iterable[Interval]) -> list[Interval]:
+    # Intervals must be sorted by start; touching intervals are merged
+    merged: list[Interval] = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+def opening_windows(
+    start: datetime, end: datetime, open_time: time | None, close_time: time | None
+) -> Iterator[Interval]:
+    # Daily opening hours are stored without timezone and read as UTC
+    start, end = to_utc(start), to_utc(end)
+    if open_time is None and close_time is None:
+        yield start, end
+        return
+    day = start.date()
+    while day <= end.date():
+        opens = datetime.combine(day, open_time or time.min, tzinfo=timezone.utc)
+        if close_time is not None:
+            closes = datetime.combine(day, close_time, tzinfo=timezone.utc)
+        else:
+            closes = datetime.combine(day + timedelta(days=1), time.min, tzinfo=timezone.utc)
+        lo, hi = max(opens, start), min(closes, end)
+        if lo < hi:
+            yield lo, hi
+        day += timedelta(days=1)
+
+def free_intervals(
+    start: datetime,
+    end: datetime,
+    busy: Iterable[Interval],
+    *,
+    open_time: time | None = None,
+    close_time: time | None = None,
+    step_minutes: int = ROUND_MINUTES,
+) -> list[Interval]:
+    """Free intervals of [start, end) outside busy slots, snapped to the step grid."""
+    merged = merge_intervals(busy)
+    free: list[Interval] = []
+    i = 0
+    # Single pass: windows and merged busy intervals are both sorted
+    for lo, hi in opening_windows(start, end, open_time, close_time):
+        while i < len(merged) and merged[i][1] <= lo:
+            i += 1
+        cursor = lo
+        j = i
+        while j < len(merged) and merged[j][0] < hi:
+            if merged[j][0] > cursor:
+                free.append((cursor, merged[j][0]))
+            cursor = max(cursor, merged[j][1])
+            j += 1
+        if cursor < hi:
+            free.append((cursor, hi))
+
+    snapped = [(ceil_to_step(s, step_minutes), round_to_step(e, step_minutes)) for s, e in free]
+    return [(s, e) for s, e in snapped if e > s]
+
+def nearest_slots(
+    free: Iterable[Interval],
+    duration: timedelta,
+    target: datetime,
+    *,
+    limit: int,
+    min_gap: timedelta,
+    step_minutes: int = ROUND_MINUTES,
+) -> list[Interval]:
+    """Closest slots of `duration` to `target` that do not leave a micro-gap (< min_gap)."""
+    target = to_utc(target)
+    step = timedelta(minutes=step_minutes)
+    candidates: list[Interval] = []
+    for lo, hi in free:
+        start = lo
+        while start + duration <= hi:
+            before, after = start - lo, hi - (start + duration)
+            if (not before or before >= min_gap) and (not after or after >= min_gap):
+                candidates.append((start, start + duration))
+            start += step
+    candidates.sort(key=lambda slot: (abs(slot[0] - target), slot[0]))
+    return candidates[:limit]
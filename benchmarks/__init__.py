@@ -0,0 +1 @@
+"""Benchmark suite for the booking hot paths (run against a local, disposable Postgres)."""
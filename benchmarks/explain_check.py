@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+
+import asyncpg
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import AsyncSessionLocal, build_asyncpg_dsn, engine
+from app.modules.bookings.repository import BookingRepository
+from app.modules.resources.models import ResourceType
+from app.modules.resources.repository import ResourceRepository
+from app.utils.time_slots import now_utc
+from benchmarks.seed import Dataset, describe
+
+"""Query-plan regression check: EXPLAIN the statements the repositories run on the seeded dataset, fail on sequential scans."""
+
+# A sequential scan is the right plan for a relation this small (an empty future partition, the default one)
+SMALL_RELATION_PAGES = 8
+
+# Resource list filters left unset
+NO_FILTERS = dict(offset=0, type_=None, site=None, status=None, min_capacity=None, feature=None, sort="name")
+
+
+@dataclass(frozen=True)
+class PlanCheck:
+    name: str
+    # Calls the repository method whose statements are checked, with the parameters of check_params
+    run: Callable[[AsyncSession, dict], Awaitable[object]]
+    # Tables (partitioned or not) that must be reached through an index
+    no_seq_scan: tuple[str, ...]
+
+
+CHECKS = (
+    PlanCheck(
+        "active intervals of a resource",
+        lambda s, p: BookingRepository(s).list_active_intervals(
+            resource_id=p["resource_id"], start_at=p["window_start"], end_at=p["window_end"]
+        ),
+        ("bookings",),
+    ),
+    PlanCheck(
+        "user bookings page",
+        lambda s, p: BookingRepository(s).list_for_user(p["user_id"], limit=50, offset=0),
+        ("bookings",),
+    ),
+    PlanCheck(
+        "bookings of a site this week",
+        lambda s, p: BookingRepository(s).search(
+            limit=50, site=p["site"], start_at=p["window_start"], end_at=p["window_end"]
+        ),
+        ("bookings",),
+    ),
+    PlanCheck(
+        "pending approvals of a department",
+        lambda s, p: BookingRepository(s).list_pending_approvals(
+            now=p["window_start"], department=p["department"], limit=50
+        ),
+        ("bookings",),
+    ),
+    PlanCheck(
+        "resources with a feature",
+        lambda s, p: ResourceRepository(s).list_resources(limit=50, **{**NO_FILTERS, "feature": "visio"}),
+        ("resources",),
+    ),
+    PlanCheck(
+        "resources of a site",
+        lambda s, p: ResourceRepository(s).list_resources(limit=50, **{**NO_FILTERS, "site": p["site"]}),
+        ("resources",),
+    ),
+    PlanCheck(
+        "free rooms of a site",
+        lambda s, p: ResourceRepository(s).list_available(
+            start_at=p["window_start"],
+            end_at=p["window_start"] + timedelta(hours=1),
+            limit=20,
+            type_=ResourceType.room,
+            site=p["site"],
+            min_capacity=None,
+            features=[],
+        ),
+        ("bookings", "resources"),
+    ),
+)
+
+
+async def check_params(session: AsyncSession, dataset: Dataset) -> dict:
+    user_id = dataset.employee_ids[0]
+    res = await session.execute(text("SELECT department FROM users WHERE id = :id"), {"id": user_id})
+    department = res.scalar_one()
+    start = now_utc().replace(hour=0, minute=0, second=0, microsecond=0)
+    return {
+        "resource_id": dataset.room_ids[0],
+        "window_start": start,
+        "window_end": start + timedelta(days=7),
+        "user_id": user_id,
+        "site": dataset.sites[0],
+        "department": department,
+    }
+
+
+@contextmanager
+def captured_statements() -> Iterator[list[tuple[str, object]]]:
+    """(statement, parameters) as sent to the driver, for every statement run inside the block."""
+    found: list[tuple[str, object]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany) -> None:
+        found.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        yield found
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+
+async def relation_sizes(session: AsyncSession) -> dict[str, tuple[str, int]]:
+    # Plans name partitions, the checks name tables: relation -> (its partitioned parent or itself, pages)
+    rows = await session.execute(
+        text(
+            """
+            SELECT c.relname, coalesce(p.relname, c.relname) AS parent, c.relpages
+            FROM pg_class c
+            LEFT JOIN pg_inherits i ON i.inhrelid = c.oid
+            LEFT JOIN pg_class p ON p.oid = i.inhparent
+            WHERE c.relkind IN ('r', 'p') AND c.relnamespace = 'public'::regnamespace
+            """
+        )
+    )
+    return {row.relname: (row.parent, row.relpages) for row in rows}
+
+
+def seq_scans(plan: dict) -> list[str]:
+    found = [plan["Relation Name"]] if plan.get("Node Type") == "Seq Scan" else []
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+async def explain(session: AsyncSession, check: PlanCheck, params: dict) -> list[dict]:
+    """Plans of the statements the check's repository call runs, EXPLAINed with the same parameters."""
+    with captured_statements() as statements:
+        await check.run(session, params)
+    conn = await session.connection()
+    plans = []
+    for statement, parameters in statements:
+        res = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", tuple(parameters or ()))
+        raw = res.scalar_one()
+        plans.append((json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"])
+    return plans
+
+
+def offending_scans(plans: list[dict], check: PlanCheck, sizes: dict[str, tuple[str, int]]) -> list[str]:
+    offending = set()
+    for plan in plans:
+        for relation in seq_scans(plan):
+            parent, pages = sizes.get(relation, (relation, SMALL_RELATION_PAGES + 1))
+            if parent in check.no_seq_scan and pages > SMALL_RELATION_PAGES:
+                offending.add(relation)
+    return sorted(offending)
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args()
+
+    conn = await asyncpg.connect(build_asyncpg_dsn())
+    try:
+        dataset = await describe(conn)
+    finally:
+        await conn.close()
+
+    failures = 0
+    async with AsyncSessionLocal() as session:
+        params = await check_params(session, dataset)
+        sizes = await relation_sizes(session)
+        for check in CHECKS:
+            plans = await explain(session, check, params)
+            offending = offending_scans(plans, check, sizes)
+            status = "FAIL" if offending else "ok"
+            print(f"{status:<4} {check.name}" + (f"  (seq scan on {', '.join(offending)})" if offending else ""))
+            if offending or args.verbose:
+                for plan in plans:
+                    print(json.dumps(plan, indent=2))
+            failures += bool(offending)
+    await engine.dispose()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
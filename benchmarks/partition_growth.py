@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import timedelta
+
+import asyncpg
+
+from app.core.config import settings
+from app.core.db import build_asyncpg_dsn
+from app.modules.bookings.models import MAX_BOOKING_SPAN
+from app.modules.bookings.partitions import add_months, ensure_partitions
+from app.utils.time_slots import now_utc
+from benchmarks.run import percentile
+from benchmarks.seed import describe
+
+"""Conflict-check latency as booking history grows: adds a year of past bookings per step, re-measures."""
+
+# Same shape as BookingRepository.has_conflict (see _overlapping there)
+CONFLICT_SQL = """
+    SELECT id FROM bookings
+    WHERE resource_id = $1 AND status IN ('pending', 'confirmed')
+      AND start_at < $3::timestamptz AND start_at > $2::timestamptz - $4::interval AND end_at > $2::timestamptz
+    LIMIT 1
+"""
+
+
+async def add_history_year(conn: asyncpg.Connection, *, rows: int, resources: int) -> int:
+    """One more year of completed bookings before the oldest row, evenly spaced per resource (no overlap)."""
+    oldest = await conn.fetchval("SELECT min(start_at) FROM bookings") or now_utc()
+    year_start = oldest - timedelta(days=365)
+    await ensure_partitions(conn, year_start.date(), add_months(oldest.date(), 1))
+    per_resource = max(rows // resources, 1)
+    step_minutes = 365 * 24 * 60 // per_resource
+    await conn.execute("ALTER TABLE bookings DISABLE TRIGGER trg_bookings_notify")
+    try:
+        await conn.execute(
+            """
+            INSERT INTO bookings (resource_id, user_id, start_at, end_at, status, title, participants,
+                                  notes, created_at, updated_at)
+            SELECT r.id, u.id, s.start_at, s.start_at + interval '1 hour', 'completed', 'Bench history', 1, '',
+                   s.start_at, s.start_at
+            FROM (SELECT id FROM resources ORDER BY id LIMIT $4) AS r
+            CROSS JOIN generate_series(0, $2 - 1) AS k
+            CROSS JOIN LATERAL (SELECT $1::timestamptz + make_interval(mins => $3 * k) AS start_at) AS s
+            CROSS JOIN LATERAL (SELECT id FROM users ORDER BY id LIMIT 1) AS u
+            """,
+            year_start,
+            per_resource,
+            step_minutes,
+            resources,
+        )
+    finally:
+        await conn.execute("ALTER TABLE bookings ENABLE TRIGGER trg_bookings_notify")
+    await conn.execute("ANALYZE bookings")
+    return per_resource * resources
+
+
+async def partitions_scanned(conn: asyncpg.Connection, args: tuple) -> int:
+    raw = await conn.fetchval(f"EXPLAIN (FORMAT JSON) {CONFLICT_SQL}", *args)
+    plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+
+    def relations(node: dict) -> set[str]:
+        found = {node["Relation Name"]} if "Relation Name" in node else set()
+        for child in node.get("Plans", []):
+            found |= relations(child)
+        return found
+
+    return len(relations(plan))
+
+
+async def measure(conn: asyncpg.Connection, room_ids: list[int], samples: int, rng: random.Random) -> dict:
+    statement = await conn.prepare(CONFLICT_SQL)
+    base = now_utc().replace(minute=0, second=0, microsecond=0)
+    latencies: list[float] = []
+    for _ in range(samples):
+        start_at = base + timedelta(minutes=15 * rng.randrange(0, 14 * 24 * 4))
+        args = (rng.choice(room_ids), start_at, start_at + timedelta(hours=1), MAX_BOOKING_SPAN)
+        started = time.perf_counter()
+        await statement.fetchval(*args)
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return {
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "partitions_scanned": await partitions_scanned(conn, args),
+    }
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--years", type=int, default=3, help="years of history added, one step each")
+    parser.add_argument("--rows-per-year", type=int, default=2_000_000)
+    parser.add_argument("--resources", type=int, default=3000, help="resources receiving history")
+    parser.add_argument("--samples", type=int, default=2000, help="conflict checks per step")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed p95 growth over the first step")
+    args = parser.parse_args()
+
+    if settings.env == "prod":
+        raise SystemExit("Refusing to add benchmark history with ENV=prod.")
+
+    conn = await asyncpg.connect(build_asyncpg_dsn())
+    try:
+        dataset = await describe(conn)
+        rng = random.Random(args.seed)
+        steps = []
+        for year in range(args.years + 1):
+            if year:
+                await add_history_year(conn, rows=args.rows_per_year, resources=args.resources)
+            total = await conn.fetchval("SELECT count(*) FROM bookings")
+            result = {"history_years": year, "bookings": total, **await measure(conn, dataset.room_ids, args.samples, rng)}
+            steps.append(result)
+            print(
+                f"+{year}y history  {total:>10} rows  p50 {result['p50_ms']:>7} ms  p95 {result['p95_ms']:>7} ms  "
+                f"p99 {result['p99_ms']:>7} ms  {result['partitions_scanned']} partition(s) scanned"
+            )
+    finally:
+        await conn.close()
+
+    first, last = steps[0]["p95_ms"], steps[-1]["p95_ms"]
+    growth = (last - first) / first if first else 0.0
+    print(f"\np95 change with {args.years} more years of history: {growth:+.1%}")
+    # Re-seed afterwards, the added history stays in the tables
+    return 1 if growth > args.threshold else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import time
+from collections import Counter
+from contextlib import AsyncExitStack
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+import asyncpg
+import httpx
+
+from app.core.db import build_asyncpg_dsn
+from benchmarks.scenarios import BENCH_TITLE, SCENARIOS
+from benchmarks.seed import describe
+
+"""Runs the scenarios, reports throughput / latency percentiles / queries per request, stores JSON baselines."""
+
+# Metrics where a higher value is a regression
+LOWER_IS_BETTER = ("p50_ms", "p95_ms", "p99_ms", "queries_per_request")
+
+
+@dataclass
+class ScenarioResult:
+    requests: int
+    failures: int
+    throughput_rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    queries_per_request: float
+    statuses: dict[str, int] = field(default_factory=dict)
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    # Nearest rank, good enough for thousands of samples
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run_scenario(
+    name: str, client: httpx.AsyncClient, dataset, *, concurrency: int, duration: float, seed: int
+) -> ScenarioResult:
+    latencies: list[float] = []
+    queries: list[int] = []
+    statuses: Counter[str] = Counter()
+    failures = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker(index: int) -> None:
+        nonlocal failures
+        op = SCENARIOS[name](client, dataset, random.Random(seed * 1000 + index))
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                response = await op()
+            except httpx.HTTPError:
+                failures += 1
+                statuses["error"] += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+            statuses[str(response.status_code)] += 1
+            if response.status_code >= 500:
+                failures += 1
+            if "x-db-statements" in response.headers:
+                queries.append(int(response.headers["x-db-statements"]))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return ScenarioResult(
+        requests=len(latencies),
+        failures=failures,
+        throughput_rps=round(len(latencies) / elapsed, 1),
+        p50_ms=round(percentile(latencies, 0.50) * 1000, 2),
+        p95_ms=round(percentile(latencies, 0.95) * 1000, 2),
+        p99_ms=round(percentile(latencies, 0.99) * 1000, 2),
+        queries_per_request=round(sum(queries) / len(queries), 2) if queries else 0.0,
+        statuses=dict(sorted(statuses.items())),
+    )
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    print(f"\nCompared with {baseline.get('label') or 'baseline'} ({baseline.get('git_rev', '?')}):")
+    for name, result in current["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            continue
+        for metric in ("throughput_rps", *LOWER_IS_BETTER):
+            old, new = before[metric], result[metric]
+            if not old:
+                continue
+            change = (new - old) / old
+            worse = change < -threshold if metric == "throughput_rps" else change > threshold
+            flag = "  REGRESSION" if worse else ""
+            print(f"  {name:<18} {metric:<20} {old:>10} -> {new:<10} {change:+.1%}{flag}")
+            if worse:
+                regressions.append(f"{name}.{metric}")
+    return regressions
+
+
+def git_rev() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def remove_bench_bookings() -> int:
+    # Scenario bookings all start after today, the bound keeps the past partitions out of the scan
+    conn = await asyncpg.connect(build_asyncpg_dsn())
+    try:
+        status = await conn.execute(
+            "DELETE FROM bookings WHERE title = $1 AND start_at >= date_trunc('day', now())", BENCH_TITLE
+        )
+    finally:
+        await conn.close()
+    return int(status.split()[-1])
+
+
+async def run_all(args: argparse.Namespace, dataset) -> dict:
+    async with AsyncExitStack() as stack:
+        if args.url:
+            transport = httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=args.concurrency))
+            base_url = args.url
+        else:
+            # In-process: no network, but the real lifespan (pool warm-up, listener, caches)
+            from app.main import app
+
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            transport = httpx.ASGITransport(app=app)
+            base_url = "http://bench"
+        client = await stack.enter_async_context(
+            httpx.AsyncClient(transport=transport, base_url=base_url, timeout=30.0)
+        )
+
+        results = {}
+        for name in args.scenario or list(SCENARIOS):
+            result = await run_scenario(
+                name, client, dataset, concurrency=args.concurrency, duration=args.duration, seed=args.seed
+            )
+            results[name] = asdict(result)
+            print(
+                f"{name:<18} {result.requests:>7} req {result.throughput_rps:>8} req/s  "
+                f"p50 {result.p50_ms:>8} ms  p95 {result.p95_ms:>8} ms  p99 {result.p99_ms:>8} ms  "
+                f"{result.queries_per_request:>5} q/req  {result.statuses}"
+            )
+    return results
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="repeatable, default all")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per scenario")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--url", help="target a running server instead of the in-process app")
+    parser.add_argument("--label", default="")
+    parser.add_argument("--save", type=Path, help="write the results as a JSON baseline")
+    parser.add_argument("--compare", type=Path, help="JSON baseline to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change reported as regression")
+    args = parser.parse_args()
+
+    conn = await asyncpg.connect(build_asyncpg_dsn())
+    try:
+        dataset = await describe(conn)
+    finally:
+        await conn.close()
+
+    # Leftovers of an interrupted run would make the slots of this one conflict
+    await remove_bench_bookings()
+    try:
+        results = await run_all(args, dataset)
+    finally:
+        removed = await remove_bench_bookings()
+        print(f"Removed {removed} benchmark bookings")
+
+    report = {
+        "label": args.label,
+        "git_rev": git_rev(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "seed": args.seed,
+            "target": args.url or "in-process",
+        },
+        "scenarios": results,
+    }
+    if args.save:
+        args.save.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nSaved {args.save}")
+    if args.compare:
+        regressions = compare(report, json.loads(args.compare.read_text()), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import random
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from benchmarks.seed import Dataset
+
+"""Benchmark scenarios: each one builds a per-worker operation issuing a single HTTP request."""
+
+Operation = Callable[[], Awaitable[httpx.Response]]
+Scenario = Callable[[httpx.AsyncClient, Dataset, random.Random], Operation]
+
+# New bookings go past the seeded data, so conflicts only come from the benchmark itself
+FUTURE_OFFSET_DAYS = 400
+FUTURE_SPAN_DAYS = 400
+MAX_PAGES = 50
+# Title of every booking a scenario creates, run.py deletes them by it after the run
+BENCH_TITLE = "Benchmark run"
+
+
+def _as(user_id: int, role: str) -> dict[str, str]:
+    return {"X-User-Id": str(user_id), "X-Role": role}
+
+
+def _slot(start: datetime, minutes: int) -> tuple[str, str]:
+    return start.isoformat(), (start + timedelta(minutes=minutes)).isoformat()
+
+
+def _day_start() -> datetime:
+    return datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _booking(rng: random.Random, resource_id: int, user_id: int, start: datetime) -> dict:
+    start_at, end_at = _slot(start, 30 * rng.randint(1, 4))
+    return {
+        "resource_id": resource_id,
+        "user_id": user_id,
+        "start_at": start_at,
+        "end_at": end_at,
+        "title": BENCH_TITLE,
+        "participants": 1,
+    }
+
+
+def hot_room(client: httpx.AsyncClient, data: Dataset, rng: random.Random) -> Operation:
+    """Every worker books the same room over the next two days: mostly 409s on the exclusion constraint."""
+    room = data.room_ids[0]
+    base = _day_start() + timedelta(days=1)
+
+    async def op() -> httpx.Response:
+        user = rng.choice(data.employee_ids)
+        start = base + timedelta(minutes=15 * rng.randrange(0, 2 * 24 * 4))
+        return await client.post("/bookings", json=_booking(rng, room, user, start), headers=_as(user, "employee"))
+
+    return op
+
+
+def spread_create(client: httpx.AsyncClient, data: Dataset, rng: random.Random) -> Operation:
+    """Bookings on random rooms and days, contention is rare."""
+    base = _day_start() + timedelta(days=FUTURE_OFFSET_DAYS)
+
+    async def op() -> httpx.Response:
+        user = rng.choice(data.employee_ids)
+        start = base + timedelta(minutes=15 * rng.randrange(0, FUTURE_SPAN_DAYS * 24 * 4))
+        payload = _booking(rng, rng.choice(data.room_ids), user, start)
+        return await client.post("/bookings", json=payload, headers=_as(user, "employee"))
+
+    return op
+
+
+def deep_pagination(client: httpx.AsyncClient, data: Dataset, rng: random.Random) -> Operation:
+    """Follows X-Next-Cursor through a resource's booking history, one page per operation."""
+    state: dict = {"resource": rng.choice(data.resource_ids), "cursor": None, "pages": 0}
+
+    async def op() -> httpx.Response:
+        params = {"resource_id": state["resource"], "limit": 50}
+        if state["cursor"]:
+            params["cursor"] = state["cursor"]
+        response = await client.get("/bookings", params=params, headers=_as(data.manager_id, "manager"))
+        state["pages"] += 1
+        state["cursor"] = response.headers.get("x-next-cursor")
+        if not state["cursor"] or state["pages"] >= MAX_PAGES:
+            state.update(resource=rng.choice(data.resource_ids), cursor=None, pages=0)
+        return response
+
+    return op
+
+
+def availability(client: httpx.AsyncClient, data: Dataset, rng: random.Random) -> Operation:
+    """Free slots of one room over one to three days, alternating with the free-room search."""
+    base = _day_start()
+
+    async def op() -> httpx.Response:
+        user = rng.choice(data.employee_ids)
+        start = base + timedelta(days=rng.randrange(0, 60))
+        if rng.random() < 0.5:
+            from_at, to_at = _slot(start, 24 * 60 * rng.randint(1, 3))
+            return await client.get(
+                f"/resources/{rng.choice(data.room_ids)}/availability",
+                params={"from": from_at, "to": to_at},
+                headers=_as(user, "employee"),
+            )
+        from_at, to_at = _slot(start + timedelta(hours=rng.randrange(8, 18)), 60)
+        return await client.get(
+            "/resources/available",
+            params={"start": from_at, "end": to_at, "site": rng.choice(data.sites)},
+            headers=_as(user, "employee"),
+        )
+
+    return op
+
+
+def permission_churn(client: httpx.AsyncClient, data: Dataset, rng: random.Random) -> Operation:
+    """Admins flip vehicle access on a small group of users while those users keep booking."""
+    group = rng.sample(data.employee_ids, k=min(20, len(data.employee_ids)))
+    base = _day_start() + timedelta(days=FUTURE_OFFSET_DAYS + FUTURE_SPAN_DAYS)
+
+    async def op() -> httpx.Response:
+        user = rng.choice(group)
+        if rng.random() < 0.1:
+            types = ["room", "equipment"] + (["vehicle"] if rng.random() < 0.5 else [])
+            return await client.patch(
+                f"/users/{user}/permissions",
+                json={"allowed_resource_types": types},
+                headers=_as(data.admin_id, "admin"),
+            )
+        start = base + timedelta(minutes=15 * rng.randrange(0, 365 * 24 * 4))
+        payload = _booking(rng, rng.choice(data.room_ids), user, start)
+        return await client.post("/bookings", json=payload, headers=_as(user, "employee"))
+
+    return op
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "hot_room": hot_room,
+    "spread_create": spread_create,
+    "deep_pagination": deep_pagination,
+    "availability": availability,
+    "permission_churn": permission_churn,
+}
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+
+import asyncpg
+
+from app.core.config import settings
+from app.core.db import build_asyncpg_dsn
+from app.modules.bookings.partitions import add_months, ensure_partitions
+from app.utils.time_slots import now_utc
+
+"""Deterministic data generator: sites, users, resources and non-overlapping bookings, all built server-side."""
+
+RESOURCE_TYPES = ("room", "equipment", "vehicle")
+ROOM_FEATURES = ("projector", "whiteboard", "visio", "screen")
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """Ids the scenarios pick from, read back from the database."""
+
+    admin_id: int
+    manager_id: int
+    employee_ids: list[int]
+    room_ids: list[int]
+    resource_ids: list[int]
+    sites: list[str]
+
+
+async def reset(conn: asyncpg.Connection) -> None:
+    await conn.execute("TRUNCATE bookings, booking_series, resources, users RESTART IDENTITY CASCADE")
+
+
+async def seed(
+    conn: asyncpg.Connection, *, sites: int, resources: int, users: int, bookings: int, seed_value: float
+) -> None:
+    # setseed makes random() reproducible for the rest of the session
+    await conn.execute("SELECT setseed($1)", seed_value)
+
+    await conn.execute(
+        """
+        INSERT INTO users (username, email, full_name, role, department, main_site,
+                           allowed_resource_types, priority, is_active, created_at)
+        SELECT 'bench' || g, 'bench' || g || '@example.test', 'Bench User ' || g,
+               (CASE WHEN g = 1 THEN 'admin' WHEN g <= 1 + $1 / 50 THEN 'manager' ELSE 'employee' END)::user_role,
+               'dept-' || (g % 12), 'site-' || lpad((g % $2 + 1)::text, 2, '0'),
+               ARRAY['room', 'equipment'] || CASE WHEN random() < 0.05 THEN ARRAY['vehicle'] ELSE ARRAY[]::text[] END,
+               (CASE WHEN random() < 0.1 THEN 'priority' ELSE 'standard' END)::user_priority,
+               true, now()
+        FROM generate_series(1, $1) AS g
+        """,
+        users,
+        sites,
+    )
+
+    await conn.execute(
+        """
+        INSERT INTO resources (name, type, capacity_max, description, features, site, building, floor,
+                               room_number, status, open_time, close_time, image_url,
+                               hourly_rate_internal, is_deleted)
+        SELECT 'Resource ' || g, t.type::resource_type,
+               CASE WHEN t.type = 'room' THEN 4 + (random() * 36)::int END,
+               '', CASE WHEN t.type = 'room' THEN ARRAY(
+                   SELECT f FROM unnest($3::text[]) AS f WHERE random() < 0.2 + g * 0  -- correlated, drawn per row
+               ) ELSE ARRAY[]::text[] END,
+               'site-' || lpad((g % $2 + 1)::text, 2, '0'), 'B' || (g % 5), (g % 8)::text, g::text,
+               (CASE WHEN random() < 0.03 THEN 'maintenance' ELSE 'active' END)::resource_status,
+               NULL, NULL, NULL, NULL, false
+        FROM generate_series(1, $1) AS g
+        CROSS JOIN LATERAL (
+            SELECT CASE WHEN g % 10 < 7 THEN 'room' WHEN g % 10 < 9 THEN 'equipment' ELSE 'vehicle' END AS type
+        ) AS t
+        """,
+        resources,
+        sites,
+        list(ROOM_FEATURES),
+    )
+
+    # Per resource, consecutive 3h cells from one year back, one booking per cell: a 0-30 min offset plus
+    # at most 150 min keeps every booking inside its cell, so nothing overlaps.
+    # The change trigger would send one NOTIFY per row, it is not wanted for a bulk load.
+    per_resource = max(bookings // resources, 1)
+    # Monthly partitions for the whole span, otherwise everything would land in bookings_default
+    today = now_utc().date()
+    last_start = today - timedelta(days=365) + timedelta(hours=3 * per_resource)
+    await ensure_partitions(conn, today - timedelta(days=366), add_months(max(today, last_start), 1))
+    await conn.execute("ALTER TABLE bookings DISABLE TRIGGER trg_bookings_notify")
+    try:
+        await conn.execute(
+            """
+            INSERT INTO bookings (resource_id, user_id, start_at, end_at, status, title, participants,
+                                  notes, created_at, updated_at)
+            SELECT r, 2 + (random() * ($3 - 2))::int, s.start_at,
+                   s.start_at + make_interval(mins => 30 * (1 + floor(random() * 5)::int)),
+                   (CASE WHEN random() < 0.85 THEN 'confirmed'
+                         WHEN random() < 0.5 THEN 'cancelled' ELSE 'pending' END)::booking_status,
+                   'Bench booking', 1 + (random() * 3)::int, '', now(), now()
+            FROM generate_series(1, $1) AS r
+            CROSS JOIN generate_series(0, $2 - 1) AS k
+            CROSS JOIN LATERAL (
+                SELECT date_trunc('hour', now()) - interval '365 days'
+                       + make_interval(hours => 3 * k) + make_interval(mins => 15 * floor(random() * 3)::int) AS start_at
+            ) AS s
+            """,
+            resources,
+            per_resource,
+            users,
+        )
+    finally:
+        await conn.execute("ALTER TABLE bookings ENABLE TRIGGER trg_bookings_notify")
+    await conn.execute("ANALYZE users, resources, bookings")
+
+
+async def describe(conn: asyncpg.Connection) -> Dataset:
+    rows = await conn.fetch("SELECT id, role::text AS role FROM users WHERE is_active ORDER BY id")
+    by_role: dict[str, list[int]] = {}
+    for row in rows:
+        by_role.setdefault(row["role"], []).append(row["id"])
+    resources = await conn.fetch(
+        "SELECT id, type::text AS type FROM resources WHERE NOT is_deleted AND status = 'active' ORDER BY id"
+    )
+    sites = await conn.fetch("SELECT DISTINCT site FROM resources ORDER BY site")
+    if not by_role.get("admin") or not by_role.get("manager") or not by_role.get("employee"):
+        raise SystemExit("No benchmark data found, run `python -m benchmarks.seed` first.")
+    return Dataset(
+        admin_id=by_role["admin"][0],
+        manager_id=by_role["manager"][0],
+        employee_ids=by_role["employee"],
+        room_ids=[r["id"] for r in resources if r["type"] == "room"],
+        resource_ids=[r["id"] for r in resources],
+        sites=[r["site"] for r in sites],
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sites", type=int, default=12)
+    parser.add_argument("--resources", type=int, default=3000)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--bookings", type=int, default=2_000_000)
+    parser.add_argument("--seed", type=float, default=0.42, help="setseed() value, between -1 and 1")
+    args = parser.parse_args()
+
+    if settings.env == "prod":
+        raise SystemExit("Refusing to seed benchmark data with ENV=prod (the tables are truncated).")
+
+    conn = await asyncpg.connect(build_asyncpg_dsn())
+    try:
+        started = time.perf_counter()
+        async with conn.transaction():
+            # Generated ids are assumed to start at 1
+            await reset(conn)
+            await seed(
+                conn,
+                sites=args.sites,
+                resources=args.resources,
+                users=args.users,
+                bookings=args.bookings,
+                seed_value=args.seed,
+            )
+        count = await conn.fetchval("SELECT count(*) FROM bookings")
+        print(f"Seeded in {time.perf_counter() - started:.1f}s, {count} bookings in the table.")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
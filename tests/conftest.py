@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import asyncio
+
+import asyncpg
+import httpx
+import pytest
+import pytest_asyncio
+
+from app.core.db import build_asyncpg_dsn, engine, read_engine
+from app.main import app
+from benchmarks.seed import Dataset, describe
+
+"""Integration fixtures: the tests run against the seeded benchmark database and skip without one."""
+
+
+@pytest_asyncio.fixture
+async def dataset() -> Dataset:
+    try:
+        conn = await asyncpg.connect(build_asyncpg_dsn(), timeout=3)
+    except (OSError, asyncio.TimeoutError, asyncpg.PostgresError) as exc:
+        pytest.skip(f"No database available ({exc})")
+    try:
+        return await describe(conn)
+    except (SystemExit, asyncpg.PostgresError):
+        pytest.skip("Database not migrated or not seeded, see the Benchmarks section of the README")
+    finally:
+        await conn.close()
+
+
+@pytest_asyncio.fixture
+async def client(dataset: Dataset):
+    # No lifespan, so no notification listener: catalog and reference caches always read the database
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    # Pooled connections are bound to this test's event loop
+    await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
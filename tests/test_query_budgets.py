@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import random
+from datetime import timedelta
+
+import pytest
+
+from app.core.query_budget import BUDGET_ATTRIBUTE, QueryBudget, QueryBudgetExceeded, query_budget
+from app.main import app
+from app.utils.time_slots import now_utc
+
+pytestmark = pytest.mark.asyncio
+
+
+def _as(user_id: int, role: str) -> dict[str, str]:
+    return {"X-User-Id": str(user_id), "X-Role": role}
+
+
+def _declared(method: str, path: str) -> QueryBudget:
+    for route in app.routes:
+        if getattr(route, "path", None) == path and method in getattr(route, "methods", ()):
+            return getattr(route.endpoint, BUDGET_ATTRIBUTE)
+    raise LookupError(f"No route {method} {path}")
+
+
+def _declared_budget(method: str, path: str):
+    budget = _declared(method, path)
+    return query_budget(max_statements=budget.max_statements, exact=budget.exact, label=f"{method} {path}")
+
+
+def _booking_payload(dataset, user_id: int) -> dict:
+    # Past the seeded history, at a random hour so reruns do not collide
+    start = now_utc().replace(minute=0, second=0, microsecond=0)
+    start += timedelta(days=400 + random.randrange(300), hours=random.randrange(24))
+    return {
+        "resource_id": random.choice(dataset.room_ids),
+        "user_id": user_id,
+        "start_at": start.isoformat(),
+        "end_at": (start + timedelta(hours=1)).isoformat(),
+        "title": "Budget test",
+        "participants": 1,
+    }
+
+
+async def test_list_resources_is_one_statement(client, dataset):
+    # Catalog version and page come from the same statement
+    with query_budget(exact=1, label="GET /resources"):
+        response = await client.get("/resources", params={"limit": 20}, headers=_as(dataset.employee_ids[0], "employee"))
+    assert response.status_code == 200
+    assert response.json()
+
+
+async def test_empty_resource_page_is_one_statement(client, dataset):
+    with query_budget(exact=1, label="GET /resources (empty page)"):
+        response = await client.get(
+            "/resources", params={"site": "no-such-site"}, headers=_as(dataset.employee_ids[0], "employee")
+        )
+    assert response.status_code == 200
+    assert response.json() == []
+    assert response.headers["etag"]
+
+
+async def test_create_booking_within_declared_budget(client, dataset):
+    employee = dataset.employee_ids[0]
+    with _declared_budget("POST", "/bookings"):
+        response = await client.post("/bookings", json=_booking_payload(dataset, employee), headers=_as(employee, "employee"))
+    assert response.status_code == 201, response.text
+    await client.post(f"/bookings/{response.json()['id']}/cancel", headers=_as(employee, "employee"))
+
+
+async def test_booking_conflict_within_declared_budget(client, dataset):
+    first, second = dataset.employee_ids[:2]
+    payload = _booking_payload(dataset, first)
+    created = await client.post("/bookings", json=payload, headers=_as(first, "employee"))
+    assert created.status_code == 201, created.text
+    try:
+        with _declared_budget("POST", "/bookings") as stats:
+            response = await client.post(
+                "/bookings", json={**payload, "user_id": second}, headers=_as(second, "employee")
+            )
+        assert response.status_code == 409
+        # The INSERT rejected by the exclusion constraint is counted too
+        assert any(statement.lstrip().startswith("INSERT INTO bookings") for statement, _ in stats.captured)
+    finally:
+        await client.post(f"/bookings/{created.json()['id']}/cancel", headers=_as(first, "employee"))
+
+
+async def test_violation_lists_the_statements(client, dataset):
+    with pytest.raises(QueryBudgetExceeded) as excinfo:
+        with query_budget(exact=0, label="GET /resources"):
+            await client.get("/resources", headers=_as(dataset.employee_ids[0], "employee"))
+    assert "GET /resources: expected exactly 0 SQL statements, got 1" in str(excinfo.value)
+    assert "resource_catalog_version" in str(excinfo.value)
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import pytest
+
+from app.core.db import AsyncSessionLocal, engine
+from benchmarks.explain_check import CHECKS, check_params, explain, offending_scans, relation_sizes
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.mark.parametrize("check", CHECKS, ids=lambda check: check.name)
+async def test_hot_query_avoids_sequential_scans(check, dataset):
+    try:
+        async with AsyncSessionLocal() as session:
+            params = await check_params(session, dataset)
+            plans = await explain(session, check, params)
+            offending = offending_scans(plans, check, await relation_sizes(session))
+    finally:
+        await engine.dispose()
+    assert plans, f"{check.name}: the repository call ran no statement"
+    assert not offending, f"{check.name}: sequential scan on {', '.join(offending)}"